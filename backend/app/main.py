@@ -1,8 +1,44 @@
-from fastapi import FastAPI
+import logging
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from .routers import config, trading
+from .trading.bot_manager import bot_manager
+from .trading.metrics import CONTENT_TYPE, REGISTRY
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+async def start_notifier():
+    """텔레그램 설정이 있으면 알림을 시작하고 일일 리포트 콜백으로 등록"""
+    if not (os.getenv("TELEGRAM_BOT_TOKEN") and os.getenv("TELEGRAM_MY_ID")):
+        return None
+    try:
+        from notifications import TelegramNotifier
+    except ImportError as e:  # 알림 모듈은 선택 사항
+        logger.warning(f"Telegram notifications disabled: {e}")
+        return None
+    notifier = TelegramNotifier()
+    try:
+        await notifier.initialize()
+    except Exception as e:
+        logger.error(f"Failed to start Telegram notifier: {e}")
+        return None
+    bot_manager.on_daily_report = notifier.notify_daily_report
+    return notifier
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 수명주기 (시작 시 알림 연결, 종료 시 봇 중지 및 KIS 세션 정리)"""
+    notifier = await start_notifier()
+    yield
+    await bot_manager.close()
+    await config.flush_config()
+    if notifier is not None:
+        bot_manager.on_daily_report = None
+        await notifier.shutdown()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -11,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # 거래 내역 다음 페이지 커서
 )
 
 # 라우터 등록
@@ -21,3 +58,9 @@ app.include_router(trading.router, tags=["trading"])
 async def health_check():
     """헬스 체크 엔드포인트"""
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 형식 지표"""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
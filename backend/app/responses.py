@@ -0,0 +1,83 @@
+"""빠른 JSON 응답 모듈
+
+응답 본문을 pydantic 모델 검증 없이 orjson으로 바로 직렬화한다.
+클라이언트가 허용하면 일정 크기 이상의 본문을 br(brotli 설치 시) 또는 gzip으로 압축하고,
+ETag가 If-None-Match와 같으면 본문 없이 304를 돌려준다. 내용 대신 데이터 버전으로
+ETag를 만들 수 있는 응답은 not_modified()로 조회와 직렬화 전에 먼저 확인한다.
+"""
+import gzip
+import hashlib
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # br 압축은 선택 사항
+    brotli = None
+
+MIN_COMPRESS_SIZE = 1024  # 이보다 작은 본문은 압축하지 않는다
+GZIP_LEVEL = 5
+MEDIA_TYPE = "application/json"
+
+
+def make_etag(*parts: Any) -> str:
+    """값 목록의 약한 ETag"""
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _matches(request: Request, etag: str) -> bool:
+    """If-None-Match 헤더에 etag가 있는지"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip() for tag in header.split(",")}
+    # 약한 비교: W/ 접두어는 무시
+    return "*" in tags or etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in tags}
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """클라이언트 캐시가 최신이면 304 응답, 아니면 None"""
+    if _matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+    return None
+
+
+def _encoding(request: Request) -> Optional[str]:
+    """사용할 압축 방식 (br 우선)"""
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.partition(";")
+        try:
+            quality = float(params.strip().removeprefix("q=")) if params.strip().startswith("q=") else 1.0
+        except ValueError:
+            quality = 1.0
+        if quality > 0:
+            accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def json_response(request: Request, content: Any, etag: Optional[str] = None,
+                  headers: Optional[Dict[str, str]] = None, compress: bool = True) -> Response:
+    """orjson 직렬화 + 선택적 압축 + ETag 응답 (etag가 없으면 본문 해시 사용)"""
+    body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    etag = etag or make_etag(hashlib.blake2b(body, digest_size=12).hexdigest())
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    headers = {**(headers or {}), "ETag": etag, "Vary": "Accept-Encoding"}
+    encoding = _encoding(request) if compress and len(body) >= MIN_COMPRESS_SIZE else None
+    if encoding == "br":
+        body = brotli.compress(body, quality=4)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type=MEDIA_TYPE, headers=headers)
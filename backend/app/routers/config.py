@@ -5,14 +5,15 @@ from ..schemas.config import BotConfig as SchemaBotConfig
 from ..schemas.config import TradingConfig as SchemaTradingConfig
 from ..trading.config import BotConfig, TradingConfig
 from ..trading.bot_manager import bot_manager
+from ..trading.config_store import ConfigStore
 import os
-import json
 from pathlib import Path
 
 router = APIRouter(prefix="/config")
 
 CONFIG_FILE = Path("data/config.json")
-CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
+# 설정 기록은 백그라운드 스레드에서 debounce 후 원자적으로 수행
+_store = ConfigStore(CONFIG_FILE)
 
 # 전역 설정 변수
 _bot_config: BotConfig = None
@@ -47,61 +48,56 @@ def load_config():
     """설정 파일 로드"""
     global _bot_config, _trading_config
     
-    if not CONFIG_FILE.exists():
-        create_default_config()
-        return
-    
     try:
-        with open(CONFIG_FILE, "r") as f:
-            data = json.load(f)
-            if data:
-                bot_data = data.get("bot_config", {})
-                trading_data = data.get("trading_config", {})
-                
-                _bot_config = BotConfig(
-                    is_running=bot_data.get("is_running", False),
-                    log_dir="logs",  # 기본값 사용
-                    app_key=os.getenv("KIS_APPKEY"),
-                    app_secret=os.getenv("KIS_SECRETKEY"),
-                    account_number=os.getenv("ACCOUNT"),
-                    account_code="01"  # 기본값 사용
-                )
-                
-                _trading_config = TradingConfig(
-                    symbol=trading_data.get("symbol", ""),
-                    total_divisions=trading_data.get("total_divisions", 40),
-                    first_buy_amount=trading_data.get("first_buy_amount", 1),
-                    pre_turn_threshold=trading_data.get("pre_turn_threshold", 20),
-                    quarter_loss_start=trading_data.get("quarter_loss_start", 39),
-                    trading_interval=1.0  # 기본값 사용
-                )
-            else:
-                create_default_config()
+        data = _store.load()
+        if data:
+            bot_data = data.get("bot_config", {})
+            trading_data = data.get("trading_config", {})
+            
+            _bot_config = BotConfig(
+                is_running=bot_data.get("is_running", False),
+                log_dir="logs",  # 기본값 사용
+                app_key=os.getenv("KIS_APPKEY"),
+                app_secret=os.getenv("KIS_SECRETKEY"),
+                account_number=os.getenv("ACCOUNT"),
+                account_code="01"  # 기본값 사용
+            )
+            
+            _trading_config = TradingConfig(
+                symbol=trading_data.get("symbol", ""),
+                total_divisions=trading_data.get("total_divisions", 40),
+                first_buy_amount=trading_data.get("first_buy_amount", 1),
+                pre_turn_threshold=trading_data.get("pre_turn_threshold", 20),
+                quarter_loss_start=trading_data.get("quarter_loss_start", 39),
+                trading_interval=1.0  # 기본값 사용
+            )
+        else:
+            create_default_config()
     except Exception as e:
         print(f"Failed to load config: {e}")
         create_default_config()
 
 def save_config():
-    """설정 파일 저장"""
+    """설정 저장 예약 (같은 내용이면 파일을 다시 쓰지 않음)"""
     if _bot_config is None or _trading_config is None:
         return
     
-    try:
-        with open(CONFIG_FILE, "w") as f:
-            json.dump({
-                "bot_config": {
-                    "is_running": _bot_config.is_running,
-                },
-                "trading_config": {
-                    "symbol": _trading_config.symbol,
-                    "total_divisions": _trading_config.total_divisions,
-                    "first_buy_amount": _trading_config.first_buy_amount,
-                    "pre_turn_threshold": _trading_config.pre_turn_threshold,
-                    "quarter_loss_start": _trading_config.quarter_loss_start,
-                }
-            }, f, indent=2)
-    except Exception as e:
-        print(f"Failed to save config: {e}")
+    _store.save({
+        "bot_config": {
+            "is_running": _bot_config.is_running,
+        },
+        "trading_config": {
+            "symbol": _trading_config.symbol,
+            "total_divisions": _trading_config.total_divisions,
+            "first_buy_amount": _trading_config.first_buy_amount,
+            "pre_turn_threshold": _trading_config.pre_turn_threshold,
+            "quarter_loss_start": _trading_config.quarter_loss_start,
+        }
+    })
+
+async def flush_config():
+    """대기 중인 설정 기록 완료 (앱 종료 시)"""
+    await _store.flush()
 
 # 시작할 때 설정 로드
 load_config()
@@ -155,15 +151,18 @@ async def update_config(config: SchemaConfigUpdate):
     """설정 업데이트"""
     global _bot_config, _trading_config
     
-    _bot_config = convert_schema_to_bot_config(config.bot_config)
-    _trading_config = convert_schema_to_trading_config(config.trading_config)
+    bot_config = convert_schema_to_bot_config(config.bot_config)
+    trading_config = convert_schema_to_trading_config(config.trading_config)
+    
+    # 봇 매니저에 설정 전달 (실행 중인 봇에는 변경분만 적용, 거부되면 아무것도 바꾸지 않음)
+    diff = await bot_manager.update_config(bot_config, trading_config)
+    if not diff.ok:
+        raise HTTPException(status_code=409, detail=diff.to_dict())
     
     # 설정 파일에 저장
+    _bot_config, _trading_config = bot_config, trading_config
     save_config()
-    
-    # 봇 매니저에 설정 전달
-    bot_manager.update_config(_bot_config, _trading_config)
-    return {"status": "success"}
+    return {"status": "success", **diff.to_dict()}
 
 @router.post("/start")
 async def start_bot():
@@ -175,7 +174,10 @@ async def start_bot():
         create_default_config()
     
     try:
-        bot_manager.start()
+        # 설정된 종목 봇이 없으면 현재 설정으로 초기화
+        if not bot_manager.has_bot(_trading_config.symbol):
+            await bot_manager.initialize_bot(_bot_config, _trading_config)
+        await bot_manager.start(_trading_config.symbol)
         
         # 봇 상태 업데이트 및 저장
         _bot_config.is_running = True
@@ -189,7 +191,7 @@ async def start_bot():
 async def stop_bot():
     """봇 중지"""
     try:
-        bot_manager.stop()
+        await bot_manager.stop()
         
         # 봇 상태 업데이트 및 저장
         if _bot_config:
@@ -204,18 +206,14 @@ async def stop_bot():
 async def reset_bot():
     """봇 초기화"""
     try:
-        bot_manager.reset()
+        await bot_manager.reset()
         
         # 설정 초기화
         global _bot_config, _trading_config
         _bot_config = None
         _trading_config = None
         
-        # 설정 파일 삭제
-        if CONFIG_FILE.exists():
-            CONFIG_FILE.unlink()
-        
-        # 기본 설정 생성
+        # 기본 설정으로 덮어쓰기 (이전 설정은 버전 사본으로 남는다)
         create_default_config()
         
         return {"status": "success"}
@@ -1,65 +1,135 @@
 """거래 관련 라우터"""
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
-from ..schemas.trading import TradingStatus, TradeHistory, TradingStatusResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, List, Optional
+from ..responses import json_response, make_etag, not_modified
+from ..schemas.trading import TradeHistory, TradingStatusResponse
 from ..trading.bot_manager import bot_manager
 from datetime import datetime
 
 router = APIRouter(prefix="/trading")
 
+HISTORY_FIELDS = tuple(TradeHistory.model_fields)
+TRADE_DEFAULTS = {"symbol": "", "action": "", "price": 0, "quantity": 0, "division": 0, "total_amount": 0}
+
+def _empty_status() -> Dict[str, Any]:
+    """기본 거래 상태"""
+    return {
+        "current_price": 0,
+        "position_count": 0,
+        "average_price": 0,
+        "total_investment": 0,
+        "unrealized_pnl": 0,
+        "current_division": 0,
+        "last_updated": datetime.now(),
+        "realized_pnl": 0,
+        "cycle_return": 0,
+        "exposure": 0,
+        "drawdown": 0,
+        "max_drawdown": 0,
+    }
+
+def _live_status(symbol: Optional[str]) -> Dict[str, Any]:
+    """손익 엔진 값으로 채운 거래 상태 (종목 미지정 시 실행 중인 봇이 하나면 그 봇, 아니면 포트폴리오 합계)"""
+    status = _empty_status()
+    if symbol is None:
+        running = [sym for sym in bot_manager.symbols if bot_manager.is_running(sym)]
+        if len(running) != 1:
+            pnl = bot_manager.analytics.summary()
+            status.update({key: pnl[key] for key in ("realized_pnl", "unrealized_pnl", "exposure", "drawdown",
+                                                     "max_drawdown")})
+            status["total_investment"] = sum(position.cost for position in bot_manager.analytics.positions)
+            return status
+        symbol = running[0]
+
+    bot = bot_manager.get_status(symbol)
+    pnl = bot_manager.analytics.snapshot(symbol)
+    status.update({
+        "current_price": pnl["current_price"],
+        "position_count": pnl["quantity"],
+        "average_price": pnl["average_price"],
+        "total_investment": bot["total_investment"],
+        "unrealized_pnl": pnl["unrealized_pnl"],
+        "current_division": bot["current_division"],
+        "realized_pnl": pnl["realized_pnl"],
+        "cycle_return": pnl["cycle_return"],
+        "exposure": pnl["total_value"],
+        "drawdown": pnl["drawdown"],
+        "max_drawdown": pnl["max_drawdown"],
+    })
+    return status
+
+def _trade_row(trade: Dict[str, Any]) -> Dict[str, Any]:
+    """저장된 거래를 TradeHistory 형식 딕셔너리로 변환 (모델 검증 없이)"""
+    row = {key: trade.get(key, TRADE_DEFAULTS.get(key)) for key in HISTORY_FIELDS}
+    if row["timestamp"] is None:
+        row["timestamp"] = datetime.now()
+    return row
+
 @router.get("/status", response_model=TradingStatusResponse)
-async def get_trading_status():
-    """거래 상태 조회"""
-    if not bot_manager.is_running():
-        trading_status = TradingStatus(
-            current_price=0,
-            position_count=0,
-            average_price=0,
-            total_investment=0,
-            unrealized_pnl=0,
-            current_division=0,
-            last_updated=datetime.now()
-        )
-        return TradingStatusResponse(status=trading_status, recent_trades=[])
-    
-    # 기본 상태 정보 생성
-    trading_status = TradingStatus(
-        current_price=0,
-        position_count=0,
-        average_price=0,
-        total_investment=0,
-        unrealized_pnl=0,
-        current_division=0,
-        last_updated=datetime.now()
-    )
-    
-    # 거래 내역을 TradeHistory 형식으로 변환
-    recent_trades = []
-    for trade in bot_manager.get_trade_history()[-10:]:
-        recent_trades.append(TradeHistory(
-            timestamp=trade.get("timestamp", datetime.now()),
-            symbol=trade.get("symbol", ""),
-            action=trade.get("action", ""),
-            price=trade.get("price", 0),
-            quantity=trade.get("quantity", 0),
-            division=trade.get("division", 0),
-            total_amount=trade.get("total_amount", 0)
-        ))
-    
-    return TradingStatusResponse(status=trading_status, recent_trades=recent_trades)
+async def get_trading_status(request: Request, symbol: Optional[str] = None):
+    """거래 상태 조회 (orjson 직렬화)
+
+    ETag는 매번 바뀌는 last_updated를 뺀 상태 값과 거래 내역 버전으로 만들므로
+    상태가 그대로면 최근 거래 변환과 직렬화 없이 304를 돌려준다.
+    """
+    running = bot_manager.is_running(symbol)
+    # 체결/시세 이벤트로 갱신된 손익 지표 사용
+    trading_status = _live_status(symbol) if running else _empty_status()
+    etag = make_etag(bot_manager.history_version() if running else "stopped", symbol,
+                     *(value for key, value in trading_status.items() if key != "last_updated"))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    # 저널 거래 딕셔너리를 모델로 바꾸지 않고 바로 직렬화
+    recent_trades = [_trade_row(trade) for trade in bot_manager.get_recent_trades(symbol)] if running else []
+    return json_response(request, {"status": trading_status, "recent_trades": recent_trades}, etag=etag)
+
+@router.get("/stream")
+async def stream_status():
+    """봇 상태 푸시 (SSE, 첫 이벤트는 전체 스냅샷, 이후 변경분만 전송)"""
+    subscriber = bot_manager.broadcaster.subscribe()
+
+    async def events():
+        try:
+            async for frame in bot_manager.broadcaster.frames(subscriber):
+                yield frame
+        finally:
+            bot_manager.broadcaster.unsubscribe(subscriber)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @router.get("/history", response_model=List[TradeHistory])
-async def get_trade_history(limit: int = 100, offset: int = 0):
-    """거래 내역 조회"""
-    history = []
-    for trade in bot_manager.get_trade_history()[offset:offset + limit]:
-        history.append(TradeHistory(
-            timestamp=trade.get("timestamp", datetime.now()),
-            symbol=trade.get("symbol", ""),
-            action=trade.get("action", ""),
-            price=trade.get("price", 0),
-            quantity=trade.get("quantity", 0),
-            division=trade.get("division", 0),
-            total_amount=trade.get("total_amount", 0)
-        ))
-    return history
+async def get_trade_history(request: Request, limit: int = Query(100, ge=1, le=1000), after: Optional[int] = None,
+                            symbol: Optional[str] = None, start: Optional[datetime] = None,
+                            end: Optional[datetime] = None):
+    """거래 내역 조회 (키셋 페이지네이션, 다음 페이지 커서는 X-Next-Cursor 헤더)
+
+    ETag는 거래 내역 버전과 조회 조건으로 만들므로 내역이 그대로면 조회와 직렬화 없이 304를 돌려준다.
+    """
+    etag = make_etag(bot_manager.history_version(), request.url.query)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    rows = await bot_manager.get_trade_history(symbol, limit, after, start, end)
+    headers = {}
+    if len(rows) == limit:
+        headers["X-Next-Cursor"] = str(rows[-1]["id"])
+    # 저장소 행이 이미 응답 형식이므로 행마다 모델을 만들지 않고 바로 직렬화
+    return json_response(request, [{key: row[key] for key in HISTORY_FIELDS} for row in rows],
+                         etag=etag, headers=headers)
+
+@router.get("/cycles")
+async def get_cycle_pnl(symbol: str):
+    """사이클별 손익 조회"""
+    return await bot_manager.get_cycle_pnl(symbol)
+
+@router.get("/ladder")
+async def get_ladder(symbol: str):
+    """회차별 LOC 주문 사다리 조회"""
+    if not bot_manager.has_bot(symbol):
+        raise HTTPException(status_code=404, detail=f"Bot for {symbol} is not initialized")
+    return bot_manager.get_ladder(symbol)
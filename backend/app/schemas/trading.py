@@ -10,6 +10,11 @@ class TradingStatus(BaseModel):
     unrealized_pnl: float
     current_division: int
     last_updated: datetime
+    realized_pnl: float = 0
+    cycle_return: float = 0  # 사이클 수익률 (%)
+    exposure: float = 0
+    drawdown: float = 0
+    max_drawdown: float = 0
 
 class TradeHistory(BaseModel):
     timestamp: datetime
@@ -0,0 +1,206 @@
+"""증분 손익/위험 지표 모듈
+
+체결과 시세 이벤트를 받을 때마다 종목별 이동평균 단가, 실현/평가 손익, 사이클 수익률,
+낙폭, 노출 금액을 이전 값에서 바로 갱신한다 (이벤트당 O(1), 거래 내역을 다시 읽지 않는다).
+포트폴리오 합계도 종목 값의 변화량만 더해 유지한다.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass(slots=True)
+class PositionAnalytics:
+    """종목별 손익 지표"""
+    symbol: str
+    quantity: int = 0
+    cost: float = 0.0  # 보유분 원가 (이동평균 단가 × 수량)
+    last_price: Optional[float] = None
+    realized_pnl: float = 0.0  # 누적 실현 손익
+    cycle_number: int = 0
+    cycle_invested: float = 0.0  # 사이클 누적 매수 금액
+    cycle_realized: float = 0.0  # 사이클 실현 손익
+    peak_pnl: float = 0.0  # 총 손익 최고치
+    max_drawdown: float = 0.0  # 총 손익 최고치 대비 최대 하락 금액
+    fills: int = 0
+
+    @property
+    def average_price(self) -> float:
+        """이동평균 단가"""
+        return self.cost / self.quantity if self.quantity else 0.0
+
+    @property
+    def market_price(self) -> float:
+        """평가 가격 (시세를 받기 전이면 평균 단가)"""
+        return self.average_price if self.last_price is None else self.last_price
+
+    @property
+    def exposure(self) -> float:
+        """노출 금액 (보유 수량 × 평가 가격)"""
+        return self.quantity * self.market_price
+
+    @property
+    def unrealized_pnl(self) -> float:
+        """평가 손익"""
+        return self.exposure - self.cost if self.quantity else 0.0
+
+    @property
+    def total_pnl(self) -> float:
+        """총 손익 (실현 + 평가)"""
+        return self.realized_pnl + self.unrealized_pnl
+
+    @property
+    def drawdown(self) -> float:
+        """현재 낙폭 (총 손익 최고치 - 현재 총 손익)"""
+        return self.peak_pnl - self.total_pnl
+
+    @property
+    def profit_rate(self) -> float:
+        """보유분 수익률 (%)"""
+        return self.unrealized_pnl / self.cost * 100 if self.cost else 0.0
+
+    @property
+    def cycle_return(self) -> float:
+        """사이클 수익률 (%, 사이클 실현 + 평가 손익 / 사이클 매수 금액)"""
+        return (self.cycle_realized + self.unrealized_pnl) / self.cycle_invested * 100 if self.cycle_invested else 0.0
+
+    def on_fill(self, action: str, quantity: int, price: float, cycle_number: Optional[int] = None):
+        """체결 반영 (매도 원가는 이동평균 단가 기준)"""
+        if action == "BUY":
+            if self.quantity == 0:
+                # 새 사이클
+                self.cycle_number = cycle_number if cycle_number is not None else self.cycle_number + 1
+                self.cycle_invested = 0.0
+                self.cycle_realized = 0.0
+            self.quantity += quantity
+            self.cost += price * quantity
+            self.cycle_invested += price * quantity
+        elif self.quantity > 0:
+            quantity = min(quantity, self.quantity)
+            sold_cost = self.cost * quantity / self.quantity
+            self.realized_pnl += price * quantity - sold_cost
+            self.cycle_realized += price * quantity - sold_cost
+            self.quantity -= quantity
+            self.cost = self.cost - sold_cost if self.quantity else 0.0
+        self.fills += 1
+        self.last_price = price
+        self._mark()
+
+    def on_price(self, price: float):
+        """시세 반영"""
+        self.last_price = price
+        self._mark()
+
+    def restore(self, quantity: int, cost: float, realized_pnl: float, cycle_number: int,
+                cycle_invested: float, cycle_realized: float):
+        """저장된 포지션으로 초기화"""
+        self.quantity = quantity
+        self.cost = cost if quantity else 0.0
+        self.realized_pnl = realized_pnl
+        self.cycle_number = cycle_number
+        self.cycle_invested = cycle_invested
+        self.cycle_realized = cycle_realized
+        self.peak_pnl = max(self.peak_pnl, self.total_pnl)
+
+    def _mark(self):
+        """최고치와 최대 낙폭 갱신"""
+        total = self.total_pnl
+        if total > self.peak_pnl:
+            self.peak_pnl = total
+        elif self.peak_pnl - total > self.max_drawdown:
+            self.max_drawdown = self.peak_pnl - total
+
+    def to_dict(self) -> Dict[str, Any]:
+        """상태 응답/리포트용 딕셔너리"""
+        return {
+            "symbol": self.symbol,
+            "quantity": self.quantity,
+            "average_price": self.average_price,
+            "current_price": self.market_price,
+            "total_value": self.exposure,
+            "profit_rate": self.profit_rate,
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": self.unrealized_pnl,
+            "cycle_number": self.cycle_number,
+            "cycle_return": self.cycle_return,
+            "drawdown": self.drawdown,
+            "max_drawdown": self.max_drawdown,
+        }
+
+
+class AnalyticsEngine:
+    """체결/시세 이벤트 구독 손익 엔진 (종목별 지표와 포트폴리오 합계)"""
+
+    def __init__(self):
+        self._positions: Dict[str, PositionAnalytics] = {}
+        # 포트폴리오 합계 (종목 값의 변화량만 반영)
+        self.realized_pnl = 0.0
+        self.unrealized_pnl = 0.0
+        self.exposure = 0.0
+        self.peak_pnl = 0.0
+        self.max_drawdown = 0.0
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._positions
+
+    def position(self, symbol: str) -> PositionAnalytics:
+        """종목 지표 (없으면 생성)"""
+        position = self._positions.get(symbol)
+        if position is None:
+            position = self._positions[symbol] = PositionAnalytics(symbol)
+        return position
+
+    @property
+    def positions(self) -> List[PositionAnalytics]:
+        """종목 지표 목록"""
+        return list(self._positions.values())
+
+    def seed(self, symbol: str, quantity: int, cost: float, realized_pnl: float = 0.0, cycle_number: int = 0,
+             cycle_invested: float = 0.0, cycle_realized: float = 0.0):
+        """저장된 포지션으로 종목 지표 초기화 (재시작 후 복원)"""
+        self._update(self.position(symbol), PositionAnalytics.restore, quantity, cost, realized_pnl, cycle_number,
+                     cycle_invested, cycle_realized)
+
+    def on_trade(self, trade: Dict[str, Any]):
+        """거래 딕셔너리 반영 (BotManager.add_trade_history와 같은 형식)"""
+        self._update(self.position(trade["symbol"]), PositionAnalytics.on_fill, trade["action"],
+                     int(trade["quantity"]), float(trade["price"]), trade.get("cycle_number"))
+
+    def on_price(self, symbol: str, price: float):
+        """시세 반영"""
+        self._update(self.position(symbol), PositionAnalytics.on_price, price)
+
+    def _update(self, position: PositionAnalytics, apply, *args):
+        """종목 지표를 갱신하고 변화량을 합계에 더한다"""
+        realized, unrealized, exposure = position.realized_pnl, position.unrealized_pnl, position.exposure
+        apply(position, *args)
+        self.realized_pnl += position.realized_pnl - realized
+        self.unrealized_pnl += position.unrealized_pnl - unrealized
+        self.exposure += position.exposure - exposure
+        total = self.total_pnl
+        if total > self.peak_pnl:
+            self.peak_pnl = total
+        elif self.peak_pnl - total > self.max_drawdown:
+            self.max_drawdown = self.peak_pnl - total
+
+    @property
+    def total_pnl(self) -> float:
+        """포트폴리오 총 손익"""
+        return self.realized_pnl + self.unrealized_pnl
+
+    def summary(self) -> Dict[str, float]:
+        """포트폴리오 합계"""
+        return {
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": self.unrealized_pnl,
+            "total_pnl": self.total_pnl,
+            "exposure": self.exposure,
+            "drawdown": self.peak_pnl - self.total_pnl,
+            "max_drawdown": self.max_drawdown,
+        }
+
+    def snapshot(self, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """종목 지표 (종목 미지정 시 포트폴리오 합계)"""
+        if symbol is None:
+            return self.summary()
+        return (self._positions.get(symbol) or PositionAnalytics(symbol)).to_dict()
+
@@ -0,0 +1,287 @@
+"""무한매수 백테스트 엔진
+
+일봉 OHLC 배열 전체에 대해 회차, 체결, 평균단가, 사이클 리셋을 한 번에 계산한다.
+매수/매도 판단은 라이브 봇과 같은 `strategy` 함수를 사용하고, 상태가 바뀌지 않는 구간은
+NumPy로 다음 이벤트 봉을 찾아 건너뛴 뒤 상태 배열을 구간 단위로 채운다.
+
+일봉 한 개의 처리 순서:
+    1. 보유 중이면 쿼터손절(MOC, 종가) 또는 LOC 목표가 매도(종가)를 판단한다.
+    2. 매도로 사이클이 끝나지 않았으면 라이브 봇과 같은 순서로 첫 매수, 추가 매수를 판단한다.
+"""
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .config import TradingConfig
+from . import strategy
+from .ladder import build_ladder
+
+# 체결 종류
+BUY = 1
+SELL = -1
+
+# 체결 사유
+REASON_FIRST_BUY = 0
+REASON_ADDITIONAL_BUY = 1
+REASON_TAKE_PROFIT = 2
+REASON_QUARTER_LOSS = 3
+
+FILL_DTYPE = np.dtype([
+    ("bar", np.int64),        # 봉 인덱스
+    ("side", np.int8),        # BUY / SELL
+    ("reason", np.int8),      # 체결 사유
+    ("quantity", np.int64),   # 체결 수량
+    ("price", np.float64),    # 체결 가격
+    ("division", np.int64),   # 체결 후 회차
+    ("cycle", np.int64),      # 사이클 번호
+])
+
+OHLC_COLUMNS = ("open", "high", "low", "close")
+
+# 다음 이벤트 탐색 시 처음 검사할 봉 개수 (찾지 못하면 두 배씩 늘린다)
+_SEARCH_WINDOW = 32
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+@dataclass
+class BacktestResult:
+    """백테스트 결과"""
+    close: np.ndarray             # 종가
+    position_count: np.ndarray    # 봉 마감 기준 보유 수량
+    current_division: np.ndarray  # 봉 마감 기준 회차
+    average_price: np.ndarray     # 봉 마감 기준 평균단가
+    total_investment: np.ndarray  # 봉 마감 기준 매수 원가
+    realized_pnl: np.ndarray      # 누적 실현손익
+    cycle_number: np.ndarray      # 봉 마감 기준 사이클 번호
+    fills: np.ndarray             # 체결 내역 (FILL_DTYPE)
+    cycles_completed: int         # 목표가 매도로 끝난 사이클 수
+    index: Optional[pd.Index] = None
+
+    @property
+    def unrealized_pnl(self) -> np.ndarray:
+        """평가손익"""
+        return self.position_count * self.close - self.total_investment
+
+    @property
+    def pnl(self) -> np.ndarray:
+        """누적 손익 (실현 + 평가)"""
+        return self.realized_pnl + self.unrealized_pnl
+
+    @property
+    def peak_investment(self) -> float:
+        """최대 투입 원금"""
+        return float(self.total_investment.max()) if len(self.total_investment) else 0.0
+
+    def equity(self, initial_capital: Optional[float] = None) -> np.ndarray:
+        """평가금액 곡선 (기본 자본금은 최대 투입 원금)"""
+        capital = self.peak_investment if initial_capital is None else initial_capital
+        return capital + self.pnl
+
+    def max_drawdown(self, initial_capital: Optional[float] = None) -> float:
+        """최대 낙폭 (0 ~ 1)"""
+        equity = self.equity(initial_capital)
+        if len(equity) == 0:
+            return 0.0
+        peak = np.maximum.accumulate(equity)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.where(peak > 0, 1 - equity / peak, 0.0)
+        return float(drawdown.max())
+
+    def cagr(self, initial_capital: Optional[float] = None,
+             periods_per_year: int = TRADING_DAYS_PER_YEAR) -> float:
+        """연평균 수익률"""
+        equity = self.equity(initial_capital)
+        if len(equity) < 2 or equity[0] <= 0 or equity[-1] <= 0:
+            return 0.0
+        years = (len(equity) - 1) / periods_per_year
+        return float((equity[-1] / equity[0]) ** (1 / years) - 1)
+
+    def to_frame(self) -> pd.DataFrame:
+        """봉 단위 상태를 DataFrame으로 변환"""
+        return pd.DataFrame({
+            "close": self.close,
+            "position_count": self.position_count,
+            "current_division": self.current_division,
+            "average_price": self.average_price,
+            "total_investment": self.total_investment,
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": self.unrealized_pnl,
+            "cycle_number": self.cycle_number,
+        }, index=self.index)
+
+    def fills_frame(self) -> pd.DataFrame:
+        """체결 내역을 DataFrame으로 변환"""
+        frame = pd.DataFrame(self.fills)
+        if self.index is not None and len(frame):
+            frame.insert(0, "timestamp", self.index[frame["bar"].to_numpy()])
+        return frame
+
+
+def _close_prices(bars: Union[np.ndarray, pd.DataFrame]) -> np.ndarray:
+    """OHLC 입력에서 종가 배열 추출"""
+    if isinstance(bars, pd.DataFrame):
+        columns = {str(c).lower(): c for c in bars.columns}
+        if "close" not in columns:
+            raise ValueError("bars must have a 'close' column")
+        return bars[columns["close"]].to_numpy(dtype=np.float64)
+
+    array = np.asarray(bars, dtype=np.float64)
+    if array.ndim == 1:
+        return array
+    if array.ndim == 2 and array.shape[1] == len(OHLC_COLUMNS):
+        return array[:, OHLC_COLUMNS.index("close")]
+    raise ValueError("bars must be a 1-D close array or an (n, 4) OHLC array")
+
+
+def _next_candidate(close: np.ndarray, start: int, below: float, at_or_above: float) -> int:
+    """start 이후 종가가 below 미만이거나 at_or_above 이상인 첫 봉 (없으면 len)"""
+    n = len(close)
+    window = _SEARCH_WINDOW
+    while start < n:
+        end = min(n, start + window)
+        segment = close[start:end]
+        hits = np.flatnonzero((segment < below) | (segment >= at_or_above))
+        if len(hits):
+            return start + int(hits[0])
+        start = end
+        window *= 2
+    return n
+
+
+def run_backtest(
+    bars: Union[np.ndarray, pd.DataFrame],
+    trading_config: TradingConfig,
+    exits: bool = True,
+) -> BacktestResult:
+    """백테스트 실행
+
+    Args:
+        bars: 종가 1차원 배열, (n, 4) OHLC 배열 또는 close 컬럼이 있는 DataFrame
+        trading_config: 거래 설정
+        exits: False면 매도 없이 매수 판단만 재생한다 (TradingConfig.exits=False인 라이브 봇과 같다)
+    """
+    close = _close_prices(bars)
+    index = bars.index if isinstance(bars, pd.DataFrame) else None
+    n = len(close)
+
+    position_arr = np.zeros(n, dtype=np.int64)
+    division_arr = np.zeros(n, dtype=np.int64)
+    average_arr = np.zeros(n, dtype=np.float64)
+    investment_arr = np.zeros(n, dtype=np.float64)
+    realized_arr = np.zeros(n, dtype=np.float64)
+    cycle_arr = np.ones(n, dtype=np.int64)
+    fills = []
+
+    position_count = 0
+    current_division = 0
+    average_price = 0.0
+    total_investment = 0.0
+    realized_pnl = 0.0
+    cycle_number = 1
+    cycles_completed = 0
+
+    # 회차별 매도 목표 배수와 쿼터손절 여부는 사다리에서 조회
+    ladder = build_ladder(trading_config)
+
+    # 첫 매수 후보 필터 (부동소수 오차를 감안해 약간 넓게 잡고 실제 판단은 strategy 함수로 한다)
+    first_buy_limit = trading_config.first_buy_amount * (1 + 1e-9)
+
+    i = 0
+    while i < n:
+        # 상태가 바뀔 수 있는 다음 봉 탐색
+        if position_count == 0:
+            next_i = _next_candidate(close, i, np.nextafter(first_buy_limit, np.inf), np.inf)
+        else:
+            if exits and ladder.is_quarter_loss(current_division):
+                target = -np.inf
+            elif exits:
+                target = ladder.sell_price(current_division, average_price)
+            else:
+                target = np.inf
+            below = average_price if current_division < trading_config.total_divisions else -np.inf
+            next_i = _next_candidate(close, i, below, target)
+
+        # 이벤트가 없는 구간은 현재 상태로 채운다
+        if next_i > i:
+            position_arr[i:next_i] = position_count
+            division_arr[i:next_i] = current_division
+            average_arr[i:next_i] = average_price
+            investment_arr[i:next_i] = total_investment
+            realized_arr[i:next_i] = realized_pnl
+            cycle_arr[i:next_i] = cycle_number
+            i = next_i
+            if i >= n:
+                break
+
+        price = float(close[i])
+        cycle_closed = False
+
+        # 매도 판단
+        if exits and position_count > 0:
+            if ladder.is_quarter_loss(current_division):
+                quantity = strategy.quarter_loss_quantity(position_count)
+                if quantity > 0:
+                    cost = average_price * quantity
+                    realized_pnl += price * quantity - cost
+                    position_count -= quantity
+                    total_investment -= cost
+                current_division = strategy.turn_after_quarter_loss(current_division)
+                if quantity > 0:
+                    fills.append((i, SELL, REASON_QUARTER_LOSS, quantity, price, current_division, cycle_number))
+            elif price >= ladder.sell_price(current_division, average_price):
+                realized_pnl += price * position_count - total_investment
+                fills.append((i, SELL, REASON_TAKE_PROFIT, position_count, price, 0, cycle_number))
+                position_count = 0
+                current_division = 0
+                average_price = 0.0
+                total_investment = 0.0
+                cycles_completed += 1
+                cycle_closed = True
+
+        # 매수 판단 (라이브 봇과 같은 순서)
+        if not cycle_closed:
+            if position_count == 0:
+                quantity = strategy.first_buy_quantity(trading_config, price)
+                if quantity > 0:
+                    position_count = quantity
+                    current_division = 1
+                    average_price = price
+                    total_investment = price * quantity
+                    fills.append((i, BUY, REASON_FIRST_BUY, quantity, price, current_division, cycle_number))
+
+            quantity = strategy.additional_buy_quantity(
+                trading_config, current_division, average_price, price
+            )
+            if quantity > 0:
+                position_count += quantity
+                current_division += 1
+                total_investment += price * quantity
+                average_price = total_investment / position_count
+                fills.append((i, BUY, REASON_ADDITIONAL_BUY, quantity, price, current_division, cycle_number))
+
+        position_arr[i] = position_count
+        division_arr[i] = current_division
+        average_arr[i] = average_price
+        investment_arr[i] = total_investment
+        realized_arr[i] = realized_pnl
+        cycle_arr[i] = cycle_number
+
+        if cycle_closed:
+            cycle_number += 1
+        i += 1
+
+    return BacktestResult(
+        close=close,
+        position_count=position_arr,
+        current_division=division_arr,
+        average_price=average_arr,
+        total_investment=investment_arr,
+        realized_pnl=realized_arr,
+        cycle_number=cycle_arr,
+        fills=np.array(fills, dtype=FILL_DTYPE),
+        cycles_completed=cycles_completed,
+        index=index,
+    )
@@ -1,12 +1,14 @@
 """봇 매니저 모듈"""
 import asyncio
+import inspect
 import json
 import logging
 import os
 import sys
 import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Optional, List, Type
+from typing import Any, Callable, Dict, Optional, List, Type
 
 import aiohttp
 import pandas as pd
@@ -14,14 +16,72 @@ from dotenv import load_dotenv
 
 from ..schemas.trading import TradeHistory
 from .config import BotConfig, TradingConfig
-from ..kis.api import KisApi
+from .analytics import AnalyticsEngine
+from .config_diff import ConfigDiff, diff_bot_config
+from .kis import KisAPI
 from .infinite_buying_bot import InfiniteBuyingBot
-from .mock_bot import MockInfiniteBuyingBot
+from .broadcaster import StatusBroadcaster
+from .journal import TradeJournal
+from .market_calendar import DAILY_REPORT, POST_CLOSE, WINDOW_CLOSE, WINDOW_OPEN, MarketScheduler
+from .metrics import REGISTRY, Sample
+from .orders import DEADLINE_ACTIONS, OPEN_STATUSES, OrderTracker, TrackedOrder
+from .price_feed import PriceFeed
+from .state_store import StateStore
+from .trade_store import TradeStore
 
 logger = logging.getLogger(__name__)
 
+# 거래 루프 계측
+LOOP_SECONDS = REGISTRY.histogram("bot_manager_loop_seconds", "Trading loop iteration duration in seconds",
+                                  ("symbol",))
+LOOP_ERRORS = REGISTRY.counter("bot_manager_loop_errors_total", "Trading loop iterations that raised", ("symbol",))
+
+# 내보낼 때 읽는 봇 상태 게이지 (지표 이름 접미사, 봇 속성, 설명)
+BOT_GAUGES = (
+    ("running", "is_running", "Whether the bot is running"),
+    ("position", "position_count", "Shares held"),
+    ("division", "current_division", "Current division (T)"),
+    ("average_price", "average_price", "Average purchase price"),
+    ("current_price", "current_price", "Last price seen by the bot"),
+    ("total_investment", "total_investment", "Total amount invested in the current cycle"),
+)
+
+# 내보낼 때 읽는 손익 지표 (지표 이름 접미사, PositionAnalytics 속성, 설명)
+PNL_GAUGES = (
+    ("realized_pnl", "realized_pnl", "Realized P&L"),
+    ("unrealized_pnl", "unrealized_pnl", "Unrealized P&L at the last price"),
+    ("exposure", "exposure", "Market value of the position"),
+    ("cycle_return", "cycle_return", "Return of the current cycle in percent"),
+    ("drawdown", "drawdown", "Drop of total P&L from its peak"),
+    ("max_drawdown", "max_drawdown", "Largest drop of total P&L from its peak"),
+)
+
+
+@dataclass
+class BotSlot:
+    """종목별 봇 슬롯"""
+    bot: InfiniteBuyingBot
+    trading_config: TradingConfig
+    task: Optional[asyncio.Task] = None
+    is_running: bool = False
+    latest_price: Optional[float] = None
+    price_received_at: Optional[float] = None
+    price_event: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def symbol(self) -> str:
+        """종목 코드"""
+        return self.trading_config.symbol
+
+
 class BotManager:
-    """봇 매니저 클래스"""
+    """봇 매니저 클래스
+
+    종목별로 봇 슬롯을 관리한다. 모든 봇은 하나의 KisAPI 세션을 공유하고,
+    시세는 공용 시세 피드(실시간 스트림 또는 폴링)가 각 봇 태스크에 전달한다.
+    거래 내역은 모든 종목이 공유하는 추가 전용 저널에, 매매 상태는 상태 저장소에 기록한다.
+    저널에 기록된 거래는 조회용 SQLite 저장소에도 반영한다.
+    """
     _instance = None
 
     def __new__(cls):
@@ -35,113 +95,460 @@ class BotManager:
         if not hasattr(self, '_initialized'):
             self._initialized = True
             self._bot_config: Optional[BotConfig] = None
-            self._trading_config: Optional[TradingConfig] = None
-            self._is_running = False
-            self._trade_history: List[Dict] = []
-            self._task: Optional[asyncio.Task] = None
-            
-            # 거래 상태
-            self._position_count = 0
-            self._current_division = 0
-            self._average_price = 0
-            self._total_investment = 0
-            self._current_price = 0
-            self._last_trade_time = None
-            self._api: Optional[KisApi] = None
-            self._bot: Optional[InfiniteBuyingBot] = None
+            self._bots: Dict[str, BotSlot] = {}
+            self._price_task: Optional[asyncio.Task] = None
+            self._api: Optional[KisAPI] = None
+            self._feed: Optional[PriceFeed] = None
+            self._journal: Optional[TradeJournal] = None
+            self._state_store: Optional[StateStore] = None
+            self._trade_store: Optional[TradeStore] = None
+            self._orders: Optional[OrderTracker] = None
+            self._order_task: Optional[asyncio.Task] = None
+            self._session_task: Optional[asyncio.Task] = None
+            self._scheduler = MarketScheduler()
+            # 일일 리포트 콜백 (코루틴 함수면 기다린다, 예: TelegramNotifier.notify_daily_report)
+            self.on_daily_report: Optional[Callable[[Dict], Any]] = None
+            self.analytics = AnalyticsEngine()  # 체결/시세 이벤트로 갱신하는 손익 지표
+            self.broadcaster = StatusBroadcaster(self._live_status)
             self._bot_class: Type = InfiniteBuyingBot
             self._test_mode = False
+            REGISTRY.register_collector("bot_manager", self._collect_metrics)
 
     def set_bot_class(self, bot_class: Type):
         """봇 클래스 설정"""
         self._bot_class = bot_class
-        self._test_mode = bot_class == MockInfiniteBuyingBot
+        self._test_mode = bot_class is not InfiniteBuyingBot
+
+    @property
+    def symbols(self) -> List[str]:
+        """등록된 종목 목록"""
+        return list(self._bots)
+
+    def has_bot(self, symbol: str) -> bool:
+        """종목 봇 등록 여부"""
+        return symbol in self._bots
+
+    def _get_slot(self, symbol: str) -> BotSlot:
+        """종목 슬롯 조회"""
+        slot = self._bots.get(symbol)
+        if slot is None:
+            raise RuntimeError(f"Bot for {symbol} is not initialized")
+        return slot
 
     def add_trade_history(self, trade: Dict):
-        """거래 내역 추가"""
-        self._trade_history.append(trade)
+        """거래 내역 추가 (저널 기록은 백그라운드에서 수행)"""
+        if trade.get("symbol", "") not in self._bots:
+            logger.warning(f"Trade for unknown symbol ignored: {trade.get('symbol')}")
+            return
+        seq = self._journal.append(trade)
+        self._trade_store.add_trade(trade, seq)
+        self.analytics.on_trade(trade)
+        self.broadcaster.notify()
 
     async def initialize_bot(self, bot_config: BotConfig, trading_config: TradingConfig):
-        """봇 초기화"""
+        """종목 봇 초기화 (같은 종목이 있으면 교체하고 거래 내역은 유지)"""
+        self._bot_config = bot_config
+
+        # 모든 봇이 공유하는 KIS API 세션
+        if self._api is None:
+            self._api = KisAPI(bot_config)
+        if self._feed is None:
+            self._feed = PriceFeed(self._api, self._on_price, streaming=bot_config.price_stream)
+        if self._journal is None:
+            self._journal = TradeJournal(os.path.join(bot_config.data_dir, "journal"))
+        if self._state_store is None:
+            self._state_store = StateStore(os.path.join(bot_config.data_dir, "state"))
+        if self._trade_store is None:
+            self._trade_store = TradeStore(os.path.join(bot_config.data_dir, "trades.db"))
+            self._sync_trade_store()
+        if bot_config.track_orders and self._orders is None:
+            self._orders = OrderTracker(self._api, bot_config.order_check_interval,
+                                        bot_config.order_deadline_action, on_change=self._on_order_change)
+            # 재시작 전 미체결 주문 복원
+            for status in OPEN_STATUSES:
+                self._orders.restore(await self._trade_store.orders(status=status))
+
+        symbol = trading_config.symbol
+        bot = self._bot_class(bot_config, trading_config, kis_api=self._api)
+        bot.on_trade = self.add_trade_history
+        bot.order_tracker = self._orders
+        # 재시작 전 회차/포지션 복원
+        state = self._state_store.get(symbol)
+        if state:
+            bot.restore_state(state)
+            logger.info(f"Restored state for {symbol}: {state}")
+        if symbol not in self.analytics:
+            self._seed_analytics(bot)
+        bot.on_state = lambda state: self._state_store.update(symbol, state)
+        bot.on_cycle = self._trade_store.save_cycle
+        if self._orders:
+            # 미체결 주문의 체결은 새 봇에 반영
+            self._orders.attach(symbol, bot._on_fill)
+
+        slot = self._bots.get(symbol)
+        if slot is None:
+            self._bots[symbol] = BotSlot(bot=bot, trading_config=trading_config)
+        else:
+            slot.bot = bot
+            slot.trading_config = trading_config
+            bot.is_running = slot.is_running
+
+        self.broadcaster.notify()
+        logger.info(f"Bot initialized for {symbol}")
+
+    def _seed_analytics(self, bot: InfiniteBuyingBot):
+        """복원한 포지션과 저널의 누적 실현 손익으로 손익 지표 초기화 (시작 시 한 번만 배열 연산으로 계산)"""
+        symbol = bot.trading_config.symbol
+        history = self._journal.batch(symbol)
+        realized = float(history.realized_pnl().sum()) if len(history) else 0.0
+        self.analytics.seed(symbol, bot.position_count, bot.total_investment, realized, bot.cycle_number,
+                            bot.cycle_investment, bot.realized_pnl)
+
+    def _on_order_change(self, order: TrackedOrder):
+        """주문 상태 저장"""
+        self._trade_store.save_order(order.to_dict())
+        self.broadcaster.notify()
+
+    def _sync_trade_store(self):
+        """저널에는 있지만 SQLite에 반영되지 않은 거래 복구"""
+        start = self._trade_store.last_journal_seq() + 1
+        missing = self._journal.read(offset=start)
+        for seq, trade in enumerate(missing, start):
+            self._trade_store.add_trade(trade, seq)
+        if missing:
+            logger.info(f"Recovered {len(missing)} trades from journal into trade store")
+
+    async def remove_bot(self, symbol: str):
+        """종목 봇 제거"""
+        slot = self._get_slot(symbol)
+        if slot.is_running:
+            await self.stop(symbol)
+        del self._bots[symbol]
+        if self._state_store:
+            self._state_store.remove(symbol)
+        self.broadcaster.notify()
+        logger.info(f"Bot removed for {symbol}")
+
+    async def update_config(self, bot_config: BotConfig, trading_config: TradingConfig) -> ConfigDiff:
+        """설정 업데이트 (등록된 종목은 봇을 다시 만들지 않고 변경분만 적용)
+
+        거부된 변경이 하나라도 있으면 아무것도 적용하지 않는다.
+        """
+        slot = self._bots.get(trading_config.symbol)
+        if slot is None or self._bot_config is None:
+            await self.initialize_bot(bot_config, trading_config)
+            return ConfigDiff(applied=list(TradingConfig.model_fields))
+
+        diff = diff_bot_config(self._bot_config, bot_config)
+        if bot_config.order_deadline_action not in DEADLINE_ACTIONS:
+            diff.rejected["order_deadline_action"] = f"unknown action {bot_config.order_deadline_action}"
+        trading = slot.bot.update_config(bot_config, trading_config) if diff.ok else ConfigDiff()
+        if not trading.ok:
+            diff.rejected.update(trading.rejected)
+        if not diff.ok:
+            logger.warning(f"Config update rejected for {slot.symbol}: {diff.rejected}")
+            return diff
+
+        self._apply_bot_config(bot_config, diff.applied)
+        for other in self._bots.values():
+            if other is not slot:
+                other.bot.update_config(bot_config, other.bot.trading_config)
+        slot.trading_config = trading_config
+        diff.applied.extend(trading.applied)
+        diff.staged.extend(trading.staged)
+        self.broadcaster.notify()
+        return diff
+
+    def _apply_bot_config(self, bot_config: BotConfig, fields: List[str]):
+        """공유 구성 요소에 봇 설정 반영"""
         self._bot_config = bot_config
-        self._trading_config = trading_config
-        
-        # KIS API 초기화
-        if bot_config.app_key and bot_config.app_secret:
-            self._api = KisApi(
-                app_key=bot_config.app_key,
-                app_secret=bot_config.app_secret,
-                account_number=bot_config.account_number,
-                account_code=bot_config.account_code,
-            )
-        
-        # 봇 인스턴스 생성
-        self._bot = self._bot_class(self._api, bot_config, trading_config)
-        
-        logger.info("Bot initialized")
-
-    def update_config(self, bot_config: BotConfig, trading_config: TradingConfig):
-        """설정 업데이트"""
-        asyncio.create_task(self.initialize_bot(bot_config, trading_config))
-
-    async def start(self):
-        """봇 시작"""
-        if self._is_running:
-            raise RuntimeError("Bot is already running")
-        
-        if not self._bot:
+        if self._api:
+            self._api.bot_config = bot_config
+            if "quote_ttl" in fields:
+                self._api.quote_cache.ttl = bot_config.quote_ttl
+            if "api_rate_limit" in fields or "api_burst" in fields:
+                self._api.scheduler.set_rate(bot_config.api_rate_limit, bot_config.api_burst)
+        if self._orders:
+            self._orders.interval = bot_config.order_check_interval
+            self._orders.deadline_action = bot_config.order_deadline_action
+
+    def _running_symbols(self) -> List[str]:
+        """실행 중인 종목 목록"""
+        return [symbol for symbol, slot in self._bots.items() if slot.is_running]
+
+    def is_running(self, symbol: Optional[str] = None) -> bool:
+        """실행 상태 조회 (종목 미지정 시 하나라도 실행 중이면 True)"""
+        if symbol is not None:
+            slot = self._bots.get(symbol)
+            return bool(slot and slot.is_running)
+        return any(slot.is_running for slot in self._bots.values())
+
+    async def start(self, symbol: Optional[str] = None):
+        """봇 시작 (종목 미지정 시 등록된 모든 봇)"""
+        if not self._bots:
             raise RuntimeError("Bot is not initialized")
-        
-        self._is_running = True
-        logger.info("Bot started")
-        
-        # 거래 루프 시작
-        self._task = asyncio.create_task(self._trading_loop())
-
-    async def stop(self):
-        """봇 중지"""
-        if not self._is_running:
-            raise RuntimeError("Bot is not running")
-        
-        self._is_running = False
-        
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-            self._task = None
-        
-        if self._bot:
-            await self._bot.stop()
-        
-        logger.info("Bot stopped")
-
-    def reset(self):
-        """봇 초기화"""
-        if self._is_running:
-            asyncio.create_task(self.stop())
-        
+
+        if symbol is not None:
+            slots = [self._get_slot(symbol)]
+            if slots[0].is_running:
+                raise RuntimeError(f"Bot for {symbol} is already running")
+        else:
+            slots = [slot for slot in self._bots.values() if not slot.is_running]
+            if not slots:
+                raise RuntimeError("Bot is already running")
+
+        for slot in slots:
+            slot.is_running = True
+            slot.bot.is_running = True
+            slot.price_event.clear()
+            slot.task = asyncio.create_task(self._bot_loop(slot))
+            logger.info(f"Bot started for {slot.symbol}")
+
+        self.broadcaster.notify()
+
+        # 공용 시세 피드 시작 (장 일정 사용 시 주문 구간에만)
+        self._feed.set_symbols(self._running_symbols())
+        if not self._bot_config.market_schedule:
+            self._start_feed()
+        elif self._session_task is None or self._session_task.done():
+            self._session_task = asyncio.create_task(self._session_loop())
+
+    def _start_feed(self):
+        """시세 피드 및 주문 추적 시작"""
+        if self._price_task is None or self._price_task.done():
+            self._price_task = asyncio.create_task(self._feed.run(self._polling_interval))
+        if self._orders and (self._order_task is None or self._order_task.done()):
+            self._order_task = asyncio.create_task(self._orders.run())
+
+    async def _stop_feed(self):
+        """시세 피드 및 주문 추적 중지"""
+        for task in (self._price_task, self._order_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._price_task = None
+        self._order_task = None
+
+    async def _session_loop(self):
+        """장 일정에 맞춰 시세 피드를 켜고 끄고, 마감 후 체결 확인과 일일 리포트 실행"""
+        try:
+            async for when, kind in self._scheduler.events():
+                logger.info(f"Market event {kind} at {when.isoformat()}")
+                try:
+                    if kind == WINDOW_OPEN:
+                        self._start_feed()
+                    elif kind == WINDOW_CLOSE:
+                        await self._stop_feed()
+                    elif kind == POST_CLOSE and self._orders:
+                        await self._orders.reconcile()
+                    elif kind == DAILY_REPORT:
+                        await self._daily_report()
+                except Exception as e:
+                    logger.error(f"Error handling market event {kind}: {e}")
+        except asyncio.CancelledError:
+            await self._stop_feed()
+
+    async def _daily_report(self):
+        """일일 리포트"""
+        status = self.get_status()
+        for symbol, bot in status["bots"].items():
+            logger.info(f"Daily report {symbol}: position={bot['position_count']} "
+                        f"division={bot['current_division']} average={bot['average_price']} "
+                        f"unrealized={bot['pnl']['unrealized_pnl']:.2f} realized={bot['pnl']['realized_pnl']:.2f}")
+        if self.on_daily_report:
+            result = self.on_daily_report(status)
+            if inspect.isawaitable(result):
+                await result
+
+    async def stop(self, symbol: Optional[str] = None):
+        """봇 중지 (종목 미지정 시 실행 중인 모든 봇)"""
+        if symbol is not None:
+            slots = [self._get_slot(symbol)]
+            if not slots[0].is_running:
+                raise RuntimeError(f"Bot for {symbol} is not running")
+        else:
+            slots = [slot for slot in self._bots.values() if slot.is_running]
+            if not slots:
+                raise RuntimeError("Bot is not running")
+
+        await self._stop_slots(slots)
+
+    async def _stop_slots(self, slots: List[BotSlot]):
+        """슬롯 태스크 중지"""
+        for slot in slots:
+            slot.is_running = False
+            if slot.task:
+                slot.task.cancel()
+                try:
+                    await slot.task
+                except asyncio.CancelledError:
+                    pass
+                slot.task = None
+            await slot.bot.stop()
+            logger.info(f"Bot stopped for {slot.symbol}")
+        self.broadcaster.notify()
+
+        # 실행 중인 봇이 없으면 시세 피드 중지
+        if self._feed:
+            self._feed.set_symbols(self._running_symbols())
+        if not self.is_running():
+            if self._session_task:
+                self._session_task.cancel()
+                try:
+                    await self._session_task
+                except asyncio.CancelledError:
+                    pass
+                self._session_task = None
+            await self._stop_feed()
+
+    async def reset(self):
+        """봇 초기화 (거래 내역은 보관 폴더로 옮기고 새로 시작)"""
+        running = [slot for slot in self._bots.values() if slot.is_running]
+        if running:
+            await self._stop_slots(running)
+
+        await self._archive_history()
+        if self._state_store:
+            # 이전 포지션/회차가 다음 초기화 때 복원되지 않도록 삭제
+            self._state_store.clear()
         self._bot_config = None
-        self._trading_config = None
-        self._trade_history.clear()
-        
-        # 거래 상태 초기화
-        self._position_count = 0
-        self._current_division = 0
-        self._average_price = 0
-        self._total_investment = 0
-        self._current_price = 0
-        self._last_trade_time = None
-        self._bot = None
-        
+        self._bots = {}
+        self.analytics = AnalyticsEngine()
+        self.broadcaster.notify()
+
         logger.info("Bot reset")
 
-    def get_status(self) -> Dict:
-        """현재 상태 조회"""
-        if not self._bot:
+    async def _archive_history(self):
+        """거래 저널과 SQLite 저장소를 data_dir/archive/<시각>/으로 옮긴다"""
+        if self._journal is None and self._trade_store is None:
+            return
+        data_dir = self._bot_config.data_dir if self._bot_config else BotConfig().data_dir
+        archive = os.path.join(data_dir, "archive", datetime.now().strftime("%Y%m%d-%H%M%S-%f"))
+        os.makedirs(archive, exist_ok=True)
+        if self._journal:
+            await self._journal.close()
+            os.replace(self._journal.directory, os.path.join(archive, "journal"))
+            self._journal = None
+        if self._trade_store:
+            await self._trade_store.close()
+            for suffix in ("", "-wal", "-shm"):
+                path = self._trade_store.path + suffix
+                if os.path.exists(path):
+                    os.replace(path, os.path.join(archive, os.path.basename(path)))
+            self._trade_store = None
+        logger.info(f"Trade history archived to {archive}")
+
+    async def close(self):
+        """공유 API 세션 및 거래 저널 종료"""
+        if self.is_running():
+            await self.stop()
+        if self._journal:
+            await self._journal.close()
+            self._journal = None
+        if self._trade_store:
+            await self._trade_store.close()
+            self._trade_store = None
+        if self._state_store:
+            self._state_store.snapshot()
+            await self._state_store.flush()
+            self._state_store.close()
+            self._state_store = None
+        if self._api:
+            await self._api.close()
+            self._api = None
+            self._feed = None
+            self._orders = None
+
+    def _collect_metrics(self) -> List[Sample]:
+        """봇 상태와 각 구성 요소의 metrics() 값을 지표로 변환 (내보낼 때만 호출)"""
+        samples: List[Sample] = []
+        for suffix, attribute, help in BOT_GAUGES:
+            values = []
+            for symbol, slot in self._bots.items():
+                value = slot.is_running if attribute == "is_running" else getattr(slot.bot, attribute)
+                values.append(({"symbol": symbol}, value or 0))
+            samples.append((f"infinite_bot_{suffix}", "gauge", help, values))
+        for suffix, attribute, help in PNL_GAUGES:
+            values = [({"symbol": position.symbol}, getattr(position, attribute))
+                      for position in self.analytics.positions]
+            samples.append((f"infinite_bot_{suffix}", "gauge", help, values))
+        for key, value in self.analytics.summary().items():
+            samples.append((f"bot_manager_portfolio_{key}", "gauge", f"Portfolio {key}", [({}, value)]))
+
+        components = {
+            "quotes": self._api.quote_metrics() if self._api else None,
+            "api": self._api.scheduler.metrics() if self._api else None,
+            "feed": self._feed.metrics() if self._feed else None,
+            "journal": self._journal.metrics() if self._journal else None,
+            "stream": self.broadcaster.metrics(),
+            "orders": self._orders.metrics() if self._orders else None,
+        }
+        for component, metrics in components.items():
+            for key, value in (metrics or {}).items():
+                # 모드 이름 같은 문자열 값은 제외
+                if isinstance(value, (int, float)):
+                    samples.append((f"bot_manager_{component}_{key}", "gauge", f"{component} {key}", [({}, value)]))
+        return samples
+
+    def _slot_status(self, slot: BotSlot) -> Dict:
+        """종목 봇 상태"""
+        bot = slot.bot
+        return {
+            "symbol": slot.symbol,
+            "is_running": slot.is_running,
+            "last_update": datetime.now().isoformat(),
+            "position_count": bot.position_count,
+            "current_division": bot.current_division,
+            "average_price": bot.average_price,
+            "total_investment": bot.total_investment,
+            "current_price": bot.current_price,
+            "decision_latency": bot.decision_latency.to_dict(),
+            "pnl": self.analytics.snapshot(slot.symbol),
+            "recent_trades": self.get_recent_trades(slot.symbol),  # 최근 10개 거래만
+            "error": None
+        }
+
+    def _live_status(self) -> Dict:
+        """푸시용 상태 (변경 여부 비교를 위해 시각 등 매번 바뀌는 값은 제외)"""
+        bots = {}
+        for symbol, slot in self._bots.items():
+            bot = slot.bot
+            recent = self.get_recent_trades(symbol, 1)
+            bots[symbol] = {
+                "is_running": slot.is_running,
+                "position_count": bot.position_count,
+                "current_division": bot.current_division,
+                "average_price": bot.average_price,
+                "total_investment": bot.total_investment,
+                "current_price": bot.current_price,
+                "last_trade": recent[0] if recent else None,
+            }
+        return {"is_running": self.is_running(), "bots": bots}
+
+    def get_status(self, symbol: Optional[str] = None) -> Dict:
+        """현재 상태 조회 (종목 미지정 시 전체 봇 상태)"""
+        if symbol is None:
             return {
+                "is_running": self.is_running(),
+                "last_update": datetime.now().isoformat(),
+                "bots": {sym: self._slot_status(slot) for sym, slot in self._bots.items()},
+                "pnl": self.analytics.summary(),
+                "quotes": self._api.quote_metrics() if self._api else None,
+                "api": self._api.scheduler.metrics() if self._api else None,
+                "feed": self._feed.metrics() if self._feed else None,
+                "journal": self._journal.metrics() if self._journal else None,
+                "stream": self.broadcaster.metrics(),
+                "orders": self._orders.metrics() if self._orders else None,
+                "feed_active": self._price_task is not None,
+            }
+
+        slot = self._bots.get(symbol)
+        if slot is None:
+            return {
+                "symbol": symbol,
                 "is_running": False,
                 "last_update": datetime.now().isoformat(),
                 "position_count": 0,
@@ -152,36 +559,72 @@ class BotManager:
                 "recent_trades": [],
                 "error": "Bot not initialized"
             }
-        
-        return {
-            "is_running": self._is_running,
-            "last_update": datetime.now().isoformat(),
-            "position_count": self._bot.position_count,
-            "current_division": self._bot.current_division,
-            "average_price": self._bot.average_price,
-            "total_investment": self._bot.total_investment,
-            "current_price": self._bot.current_price,
-            "recent_trades": self._trade_history[-10:],  # 최근 10개 거래만
-            "error": None
-        }
+        return self._slot_status(slot)
+
+    async def get_trade_history(self, symbol: Optional[str] = None, limit: int = 100,
+                                after: Optional[int] = None, start: Optional[datetime] = None,
+                                end: Optional[datetime] = None) -> List[Dict]:
+        """거래 내역 조회 (오래된 순, after: 이전 페이지 마지막 거래 id)"""
+        if self._trade_store is None:
+            return []
+        return await self._trade_store.trades(symbol, start, end, after, limit)
+
+    def history_version(self) -> str:
+        """거래 내역 버전 (거래가 추가되거나 저장소가 바뀌면 달라진다)"""
+        if self._trade_store is None:
+            return "empty"
+        return f"{self._trade_store.token}.{self._trade_store.trade_version}"
+
+    async def get_cycle_pnl(self, symbol: str) -> List[Dict]:
+        """사이클별 손익 조회"""
+        if self._trade_store is None:
+            return []
+        return await self._trade_store.cycle_pnl(symbol)
+
+    def get_ladder(self, symbol: str) -> Dict:
+        """종목의 현재 사이클 LOC 주문 사다리"""
+        return self._get_slot(symbol).bot.cycle_ladder().to_dict()
+
+    def get_recent_trades(self, symbol: Optional[str] = None, count: int = 10) -> List[Dict]:
+        """최근 거래 내역 조회 (링 버퍼에서 바로 반환)"""
+        if self._journal is None:
+            return []
+        return self._journal.tail(count, symbol)
+
+    def _polling_interval(self) -> float:
+        """시세 폴링 주기 (실행 중인 봇 중 가장 짧은 매매 주기)"""
+        intervals = [slot.trading_config.trading_interval for slot in self._bots.values() if slot.is_running]
+        return min(intervals) if intervals else 1.0
 
-    def get_trade_history(self) -> List[Dict]:
-        """거래 내역 조회"""
-        return self._trade_history
+    def _on_price(self, symbol: str, price: float, received_at: float):
+        """시세 피드 이벤트 처리"""
+        slot = self._bots.get(symbol)
+        if slot is None:
+            return
+        self.analytics.on_price(symbol, price)
+        if not slot.is_running:
+            return
+        slot.latest_price = price
+        slot.price_received_at = received_at
+        slot.price_event.set()
 
-    async def _trading_loop(self):
-        """거래 루프"""
+    async def _bot_loop(self, slot: BotSlot):
+        """종목별 거래 루프 (새 시세가 들어올 때마다 매매 판단)"""
+        seconds, errors = LOOP_SECONDS.labels(slot.symbol), LOOP_ERRORS.labels(slot.symbol)
         try:
-            while self._is_running:
-                if self._bot:
-                    await self._bot.run_once()
-                await asyncio.sleep(self._trading_config.trading_interval)
+            while slot.is_running:
+                await slot.price_event.wait()
+                slot.price_event.clear()
+                started = time.perf_counter()
+                try:
+                    await slot.bot.run_once(slot.latest_price, slot.price_received_at)
+                except Exception as e:
+                    errors.inc()
+                    logger.error(f"Error in trading loop for {slot.symbol}: {e}")
+                self.broadcaster.notify()
+                seconds.observe(time.perf_counter() - started)
         except asyncio.CancelledError:
-            logger.info("Trading loop cancelled")
-        except Exception as e:
-            logger.error(f"Error in trading loop: {e}")
-            self._is_running = False
-            raise
+            logger.info(f"Trading loop cancelled for {slot.symbol}")
 
 # 싱글톤 인스턴스
 bot_manager = BotManager()
@@ -0,0 +1,158 @@
+"""봇 상태 푸시 모듈
+
+봇 상태가 바뀌면 이전 상태와의 차이만 한 번 직렬화해 모든 구독자에게 나눠준다.
+느린 구독자의 큐가 가득 차면 밀린 차이를 버리고 다음에 전체 스냅샷을 보내 따라잡게 한다.
+구독자가 없으면 상태를 만들지도 않는다.
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+REMOVED_KEY = "$removed"  # 차이에서 삭제된 키 목록 (값이 None으로 바뀐 키와 구분)
+
+
+def diff_status(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """두 상태의 차이 (중첩 딕셔너리는 재귀 비교, 삭제된 키는 REMOVED_KEY 목록)"""
+    delta = {}
+    for key, value in new.items():
+        previous = old.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = diff_status(previous, value)
+            if nested:
+                delta[key] = nested
+        elif key not in old or previous != value:
+            delta[key] = value
+    removed = sorted(old.keys() - new.keys())
+    if removed:
+        delta[REMOVED_KEY] = removed
+    return delta
+
+
+def sse_frame(event: str, data: Dict[str, Any]) -> bytes:
+    """SSE 이벤트 프레임"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str, separators=(',', ':'))}\n\n".encode()
+
+
+class Subscriber:
+    """상태 구독자"""
+
+    def __init__(self, maxsize: int):
+        """초기화"""
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.needs_snapshot = True  # 다음 전송 시 전체 스냅샷 필요 여부
+        self.dropped = 0
+
+
+class StatusBroadcaster:
+    """상태 변경 푸시 방송기"""
+
+    def __init__(self, status_fn: Callable[[], Dict[str, Any]], min_interval: float = 0.1,
+                 queue_size: int = 16):
+        """초기화 (min_interval: 변경을 모아 보내는 최소 간격, 초)"""
+        self.status_fn = status_fn
+        self.min_interval = min_interval
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscriber] = set()
+        self._status: Dict[str, Any] = {}
+        self._snapshot_frame: Optional[bytes] = None
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.serializations = 0
+
+    def subscribe(self) -> Subscriber:
+        """구독 시작"""
+        subscriber = Subscriber(self.queue_size)
+        if not self._subscribers:
+            # 구독자가 없던 동안의 상태는 믿을 수 없으므로 새로 만든다
+            self._status = self.status_fn()
+            self._snapshot_frame = None
+        self._subscribers.add(subscriber)
+        self._deliver_snapshot(subscriber)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._publish_loop())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """구독 해지"""
+        self._subscribers.discard(subscriber)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def notify(self):
+        """상태 변경 알림 (구독자가 없으면 아무 일도 하지 않는다)"""
+        if self._subscribers:
+            self._changed.set()
+
+    def _snapshot(self) -> bytes:
+        """전체 스냅샷 프레임 (상태가 바뀔 때까지 재사용)"""
+        if self._snapshot_frame is None:
+            self._snapshot_frame = sse_frame("snapshot", self._status)
+            self.serializations += 1
+        return self._snapshot_frame
+
+    def _deliver_snapshot(self, subscriber: Subscriber):
+        """밀린 차이를 버리고 전체 스냅샷 전송"""
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+            subscriber.dropped += 1
+        subscriber.queue.put_nowait(self._snapshot())
+        subscriber.needs_snapshot = False
+
+    def publish(self):
+        """현재 상태와 직전 상태의 차이를 구독자에게 전송"""
+        status = self.status_fn()
+        delta = diff_status(self._status, status)
+        if not delta:
+            return
+        self._status = status
+        self._snapshot_frame = None
+        frame = sse_frame("delta", delta)  # 한 번만 직렬화
+        self.serializations += 1
+        self.published += 1
+        for subscriber in self._subscribers:
+            if subscriber.needs_snapshot:
+                self._deliver_snapshot(subscriber)
+                continue
+            try:
+                subscriber.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # 느린 구독자: 큐가 빌 때 한 번에 따라잡도록 스냅샷 예약
+                subscriber.needs_snapshot = True
+
+    async def _publish_loop(self):
+        """변경 알림을 모아 일정 간격 이상으로 전송"""
+        try:
+            while True:
+                await self._changed.wait()
+                self._changed.clear()
+                try:
+                    self.publish()
+                except Exception as e:
+                    logger.error(f"Failed to publish status: {e}")
+                await asyncio.sleep(self.min_interval)
+        except asyncio.CancelledError:
+            pass
+
+    async def frames(self, subscriber: Subscriber, keepalive: float = 15.0):
+        """구독자에게 보낼 프레임 (유휴 시 keep-alive 주석 전송)"""
+        while True:
+            if subscriber.needs_snapshot and subscriber.queue.empty():
+                self._deliver_snapshot(subscriber)
+            try:
+                yield await asyncio.wait_for(subscriber.queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+
+    def metrics(self) -> Dict[str, int]:
+        """방송 지표"""
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "serializations": self.serializations,
+            "dropped": sum(subscriber.dropped for subscriber in self._subscribers),
+        }
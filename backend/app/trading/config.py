@@ -1,15 +1,30 @@
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import BaseModel
 
 class BotConfig(BaseModel):
     """봇 설정"""
     is_running: bool = False
     log_dir: str = "logs"  # 로그 디렉토리
+    log_max_bytes: int = 10 * 1024 * 1024  # 로그 파일 교체 크기 (바이트)
+    log_backup_count: int = 5  # 보관할 이전 로그 파일 수
+    log_rotate_when: Optional[str] = None  # 시각 기준 교체 (예: "midnight", 지정 시 크기 기준 대신 사용)
+    data_dir: str = "data"  # 거래 저널 등 데이터 디렉토리
     app_key: Optional[str] = None  # 한국투자증권 앱키
     app_secret: Optional[str] = None  # 한국투자증권 시크릿
     account_number: Optional[str] = None  # 계좌번호
     account_code: str = "01"  # 계좌코드 (01: 주식)
+    virtual: bool = True  # 모의투자 여부
+    exchanges: Dict[str, str] = {}  # 종목별 거래소 코드 (NAS/NYS/AMS, 기본값 NAS)
+    price_stream: bool = False  # 실시간 체결가 스트림 사용 여부 (끊기면 폴링으로 대체)
+    quote_ttl: float = 0.5  # 시세 캐시 유효시간 (초, 0이면 캐시 미사용)
+    api_rate_limit: float = 15.0  # 초당 API 호출 한도
+    api_burst: float = 15.0  # 순간 최대 API 호출 수
+    market_schedule: bool = True  # 장 마감 전 주문 구간에만 매매 (False면 상시 매매)
+    track_orders: bool = False  # 주문 추적 사용 여부 (체결 확인 후 상태 반영)
+    order_check_interval: float = 1.0  # 체결 조회 주기 (초)
+    order_timeout: float = 0.0  # 주문 후 미체결 마감까지 시간 (초, 0이면 마감 없음)
+    order_deadline_action: str = "cancel"  # 마감 시 처리 (cancel: 취소, reprice: 현재가로 정정 후 미체결이면 취소)
 
 class TradingConfig(BaseModel):
     """거래 설정"""
@@ -19,6 +34,7 @@ class TradingConfig(BaseModel):
     pre_turn_threshold: int  # 선행 턴 임계값
     quarter_loss_start: float  # 1/4 손실 시작점
     trading_interval: float = 1.0  # 매매 주기 (초)
+    exits: bool = True  # 목표가 매도 및 쿼터손절 사용 여부 (False면 매수만)
 
 class ConfigUpdate(BaseModel):
     """설정 업데이트"""
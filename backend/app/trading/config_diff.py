@@ -0,0 +1,75 @@
+"""설정 변경 분류 모듈
+
+새 설정을 실행 중인 설정과 필드 단위로 비교해 바로 적용할 변경, 진행 중인 사이클이
+끝난 뒤 적용할 변경, 봇을 다시 만들어야 해서 거부할 변경으로 나눈다.
+봇을 다시 만들지 않으므로 포지션과 회차 같은 메모리 상태는 그대로 유지된다.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+
+from .config import BotConfig, TradingConfig
+
+# 거래 설정: 다음 매매 판단부터 적용
+LIVE_TRADING_FIELDS = frozenset({"trading_interval", "exits"})
+# 거래 설정: 사다리와 매수 금액이 바뀌므로 진행 중인 사이클이 있으면 다음 사이클부터 적용
+CYCLE_TRADING_FIELDS = frozenset({"total_divisions", "first_buy_amount", "pre_turn_threshold", "quarter_loss_start"})
+
+# 봇 설정: 공유 구성 요소에 바로 반영
+LIVE_BOT_FIELDS = frozenset({
+    "log_dir", "log_max_bytes", "log_backup_count", "log_rotate_when", "exchanges", "quote_ttl",
+    "api_rate_limit", "api_burst", "order_check_interval", "order_timeout", "order_deadline_action",
+})
+# 봇 설정: 실행 상태 표시용 (봇 매니저가 따로 관리)
+IGNORED_BOT_FIELDS = frozenset({"is_running"})
+# 나머지 봇 설정(계좌, 데이터 경로, 시세 스트림, 주문 추적, 장 일정)은 세션과 저장소를 다시 만들어야 한다
+
+
+@dataclass
+class ConfigDiff:
+    """설정 변경 분류 결과"""
+    applied: List[str] = field(default_factory=list)  # 적용한 필드
+    staged: List[str] = field(default_factory=list)  # 다음 사이클에 적용할 필드
+    rejected: Dict[str, str] = field(default_factory=dict)  # 거부한 필드 -> 사유
+
+    @property
+    def ok(self) -> bool:
+        """거부된 변경이 없는지"""
+        return not self.rejected
+
+    def to_dict(self) -> Dict[str, Any]:
+        """응답용 딕셔너리"""
+        return {"applied": self.applied, "staged": self.staged, "rejected": self.rejected}
+
+
+def changed_fields(old: BaseModel, new: BaseModel) -> Dict[str, Any]:
+    """값이 바뀐 필드 -> 새 값"""
+    return {name: getattr(new, name) for name in type(new).model_fields
+            if getattr(old, name) != getattr(new, name)}
+
+
+def diff_bot_config(old: BotConfig, new: BotConfig) -> ConfigDiff:
+    """봇 설정 변경 분류"""
+    diff = ConfigDiff()
+    for name in changed_fields(old, new):
+        if name in IGNORED_BOT_FIELDS:
+            continue
+        if name in LIVE_BOT_FIELDS:
+            diff.applied.append(name)
+        else:
+            diff.rejected[name] = "requires restart"
+    return diff
+
+
+def diff_trading_config(old: TradingConfig, new: TradingConfig, cycle_open: bool) -> ConfigDiff:
+    """거래 설정 변경 분류 (cycle_open: 진행 중인 사이클 여부)"""
+    diff = ConfigDiff()
+    for name in changed_fields(old, new):
+        if name == "symbol":
+            diff.rejected[name] = "symbol of a running bot cannot change"
+        elif name in CYCLE_TRADING_FIELDS and cycle_open:
+            diff.staged.append(name)
+        else:
+            diff.applied.append(name)
+    return diff
@@ -0,0 +1,132 @@
+"""설정 파일 저장소 모듈
+
+설정 저장 요청은 메모리에 최신 값만 남기고 debounce 초 뒤 한 번에 기록한다.
+기록은 전용 스레드에서 임시 파일 작성 → fsync → rename 순서로 수행하므로 이벤트 루프를
+막지 않고, 기록 중 중단되어도 설정 파일은 이전 내용 그대로 남는다.
+내용이 바뀔 때마다 버전 번호를 붙인 사본을 history 디렉터리에 보관한다.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+HISTORY_PATTERN = re.compile(r"^config\.(\d+)\.json$")
+
+
+class ConfigStore:
+    """debounce + 원자적 교체 기반 설정 저장소"""
+
+    def __init__(self, path: Union[str, Path], debounce: float = 0.2, history: int = 20):
+        """초기화 (debounce: 기록 지연 시간, 초 / history: 보관할 이전 버전 수)"""
+        self.path = Path(path)
+        self.debounce = debounce
+        self.history = history
+        self.history_dir = self.path.parent / "config_history"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.history_dir.mkdir(exist_ok=True)
+        versions = self.versions()
+        self.version = versions[-1] if versions else 0
+        self._written: Optional[str] = self.path.read_text() if self.path.exists() else None
+        self._pending: Optional[Dict[str, Any]] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # 파일 기록은 전용 스레드 하나에서만 수행 (기록 순서 보장)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="config-store")
+        self.requests = 0  # 저장 요청 수
+        self.writes = 0    # 실제 파일 기록 수
+
+    def versions(self) -> List[int]:
+        """보관 중인 버전 번호 (오름차순)"""
+        matches = (HISTORY_PATTERN.match(name) for name in os.listdir(self.history_dir))
+        return sorted(int(match.group(1)) for match in matches if match)
+
+    def history_path(self, version: int) -> Path:
+        """버전 사본 경로"""
+        return self.history_dir / f"config.{version:06d}.json"
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """설정 로드 (파일이 손상되었으면 가장 최근 버전 사본 사용)"""
+        for path in [self.path] + [self.history_path(v) for v in reversed(self.versions())]:
+            if not path.exists():
+                continue
+            try:
+                with open(path, "r") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Unreadable config file {path}: {e}")
+        return None
+
+    def save(self, data: Dict[str, Any]):
+        """저장 예약 (이벤트 루프 밖에서는 기록이 끝날 때까지 대기)"""
+        self.requests += 1
+        self._pending = data
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._submit().result()
+            return
+        if self._timer is None:
+            self._timer = loop.call_later(self.debounce, self._submit)
+
+    def _submit(self) -> Future:
+        """대기 중인 최신 설정 기록 예약"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        data, self._pending = self._pending, None
+        if data is None:
+            # 진행 중인 기록이 끝나면 완료되는 빈 작업
+            return self._executor.submit(lambda: None)
+        future = self._executor.submit(self._write, data)
+        future.add_done_callback(self._check_write)
+        return future
+
+    @staticmethod
+    def _check_write(future: Future):
+        """백그라운드 기록 오류 로그"""
+        if future.exception() is not None:
+            logger.error(f"Failed to write config: {future.exception()}")
+
+    def _write(self, data: Dict[str, Any]):
+        """임시 파일에 쓰고 rename으로 교체 (내용이 같으면 건너뛴다)"""
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+        if text == self._written:
+            return
+        self._write_atomic(self.path, text)
+        self._written = text
+        self.writes += 1
+
+        self.version += 1
+        self._write_atomic(self.history_path(self.version), text)
+        for version in self.versions()[:-self.history or None]:
+            os.remove(self.history_path(version))
+
+    @staticmethod
+    def _write_atomic(path: Path, text: str):
+        """임시 파일 작성 → fsync → rename → 디렉터리 fsync"""
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        if hasattr(os, "O_DIRECTORY"):
+            fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    async def flush(self):
+        """대기 중인 설정을 바로 기록하고 끝날 때까지 대기"""
+        await asyncio.wrap_future(self._submit())
+
+    def close(self):
+        """남은 설정을 기록한 뒤 저장소 종료"""
+        self._submit().result()
+        self._executor.shutdown(wait=True)
@@ -1,91 +1,416 @@
 from .bot import TradingBot
 from .kis import KisAPI
 from .config import BotConfig, TradingConfig
+from . import log_pipeline, strategy
+from .config_diff import CYCLE_TRADING_FIELDS, ConfigDiff, changed_fields, diff_trading_config
+from .ladder import LocLadder, build_ladder
+from .market_calendar import WINDOW_OPEN, MarketScheduler
+from .metrics import REGISTRY
+from .orders import FillEvent, OrderTracker
+from .price_feed import LatencyStats, PriceFeed
 import logging
 import asyncio
 import os
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# 계측 지표 (종목별 자식 지표는 봇 생성 시 한 번 만들어 둔다)
+TICKS = REGISTRY.counter("infinite_bot_ticks_total", "Trading decisions (run_once calls)", ("symbol",))
+TICK_SECONDS = REGISTRY.histogram("infinite_bot_tick_seconds", "run_once duration in seconds", ("symbol",))
+MARKET_DATA_SECONDS = REGISTRY.histogram("infinite_bot_market_data_seconds",
+                                         "_update_market_data duration in seconds", ("symbol",))
+STEPS = REGISTRY.counter("infinite_bot_steps_total", "Strategy step executions", ("symbol", "step"))
+ORDERS = REGISTRY.counter("infinite_bot_orders_total", "Orders sent by the bot", ("symbol", "side"))
+DECISION_SECONDS = REGISTRY.histogram("infinite_bot_decision_latency_seconds",
+                                      "Price receipt to order sent in seconds", ("symbol",))
+
 
 class InfiniteBuyingBot(TradingBot):
     """무한매수 봇 클래스"""
 
-    def __init__(self, bot_config: BotConfig, trading_config: TradingConfig):
-        """봇 초기화"""
+    # 재시작 후 복원해야 하는 매매 상태 필드
+    STATE_FIELDS = ("position_count", "current_division", "average_price", "total_investment",
+                    "cycle_number", "cycle_started_at", "cycle_investment", "realized_pnl")
+
+    def __init__(self, bot_config: BotConfig, trading_config: TradingConfig,
+                 kis_api: Optional[KisAPI] = None):
+        """봇 초기화 (kis_api를 넘기면 여러 봇이 같은 API 세션을 공유)"""
         super().__init__(bot_config, trading_config)
         self.position_count = 0
         self.current_division = 0
         self.average_price = 0
         self.total_investment = 0
+        self.cycle_number = 0  # 사이클 번호 (첫 매수 때마다 1씩 증가)
+        self.cycle_started_at: Optional[str] = None  # 사이클 시작 시각 (ISO)
+        self.cycle_investment = 0  # 사이클 누적 매수 금액
+        self.realized_pnl = 0  # 사이클 실현 손익
         self.last_trade_time = None
         self.current_price = None
-        self.kis_api = KisAPI(bot_config)
+        self.price_received_at: Optional[float] = None  # 현재가 수신 시각 (monotonic)
+        self.decision_latency = LatencyStats()  # 시세 수신 → 주문 전송 지연
+        self.kis_api = kis_api or KisAPI(bot_config)
+        self.on_trade: Optional[Callable[[Dict], None]] = None  # 체결 콜백
+        self.on_state: Optional[Callable[[Dict[str, Any]], None]] = None  # 상태 변경 콜백
+        self.on_cycle: Optional[Callable[[Dict[str, Any]], None]] = None  # 사이클 요약 변경 콜백
+        self.order_tracker: Optional[OrderTracker] = None  # 설정 시 체결 이벤트로 상태 반영
+        self.ladder: Optional[LocLadder] = None  # 현재 사이클의 LOC 사다리 (사이클 시작 시 생성)
+        self._in_tick = False  # 매매 판단 중 여부
+        self._pending_config: Optional[Tuple[BotConfig, TradingConfig]] = None  # 판단이 끝나면 적용할 설정
+        self._staged: Dict[str, Any] = {}  # 다음 사이클에 적용할 거래 설정 필드
         self.logger = self._setup_logger()
+        symbol = trading_config.symbol
+        self._ticks = TICKS.labels(symbol)
+        self._tick_seconds = TICK_SECONDS.labels(symbol)
+        self._market_data_seconds = MARKET_DATA_SECONDS.labels(symbol)
+        self._steps = {step: STEPS.labels(symbol, step) for step in ("exits", "first_buy", "additional_buy")}
+        self._orders = {side: ORDERS.labels(symbol, side) for side in ("BUY", "SELL")}
+        self._decision_seconds = DECISION_SECONDS.labels(symbol)
 
     def _setup_logger(self) -> logging.Logger:
         """로거 설정"""
-        logger = logging.getLogger(__name__)
-        logger.setLevel(logging.INFO)
-        os.makedirs(self.bot_config.log_dir, exist_ok=True)
-        handler = logging.FileHandler(f"{self.bot_config.log_dir}/trading.log")
-        handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
-        logger.addHandler(handler)
-        return logger
+        return log_pipeline.get_logger(
+            __name__, self.bot_config.log_dir, "trading.log",
+            max_bytes=self.bot_config.log_max_bytes,
+            backup_count=self.bot_config.log_backup_count,
+            when=self.bot_config.log_rotate_when,
+        )
 
     async def _update_market_data(self):
         """시장 데이터 업데이트"""
-        self.current_price = await self.kis_api.get_current_price(self.bot_config.symbol)
-        self.logger.info(f"Current price for {self.bot_config.symbol}: {self.current_price}")
+        started = time.perf_counter()
+        self.current_price = await self.kis_api.get_current_price(self.trading_config.symbol)
+        self._market_data_seconds.observe(time.perf_counter() - started)
+        self.logger.info(f"Current price for {self.trading_config.symbol}: {self.current_price}")
+
+    def _observe_decision_latency(self, side: str):
+        """주문 수와 시세 수신부터 주문 전송까지의 지연 기록 (주문 요청이 나간 직후 호출)"""
+        self._orders[side].inc()
+        if self.price_received_at is not None:
+            latency = time.monotonic() - self.price_received_at
+            self.decision_latency.observe(latency)
+            self._decision_seconds.observe(latency)
+
+    def cycle_open(self) -> bool:
+        """진행 중인 사이클 여부 (보유 수량 또는 미체결 주문이 있으면 True)"""
+        return self.position_count > 0 or bool(
+            self.order_tracker and self.order_tracker.has_open(self.trading_config.symbol))
+
+    @property
+    def staged_config(self) -> Dict[str, Any]:
+        """다음 사이클에 적용할 거래 설정 필드"""
+        return dict(self._staged)
+
+    def update_config(self, bot_config: BotConfig, trading_config: TradingConfig) -> ConfigDiff:
+        """설정 변경 (봇을 다시 만들지 않고 적용, 매매 판단 중이면 판단이 끝난 직후 적용)
+
+        사다리에 영향을 주는 필드는 진행 중인 사이클이 있으면 다음 사이클부터 적용한다.
+        """
+        diff = diff_trading_config(self.trading_config, trading_config, self.cycle_open())
+        if not diff.ok:
+            return diff
+        if self._in_tick:
+            self._pending_config = (bot_config, trading_config)
+        else:
+            diff = self._apply_config(bot_config, trading_config)
+        return diff
+
+    def _apply_config(self, bot_config: BotConfig, trading_config: TradingConfig) -> ConfigDiff:
+        """설정 적용 (매매 판단 사이에서만 호출)"""
+        diff = diff_trading_config(self.trading_config, trading_config, self.cycle_open())
+        keep = {name: getattr(self.trading_config, name) for name in diff.staged}
+        self._staged = {name: getattr(trading_config, name) for name in diff.staged}
+        self.trading_config = trading_config.model_copy(update=keep)
+        if CYCLE_TRADING_FIELDS.intersection(diff.applied):
+            self.ladder = None  # 다음 조회 때 새 설정으로 다시 계산
+
+        log_changed = any(name.startswith("log_") for name in changed_fields(self.bot_config, bot_config))
+        self.bot_config = bot_config
+        if log_changed:
+            self.logger = self._setup_logger()
+        if diff.applied or diff.staged:
+            self.logger.info(f"Config updated for {trading_config.symbol}: applied {diff.applied}, "
+                             f"staged {diff.staged}")
+        return diff
+
+    def _apply_staged(self):
+        """사이클이 끝난 뒤 미뤄둔 거래 설정 적용"""
+        self.trading_config = self.trading_config.model_copy(update=self._staged)
+        self.ladder = None
+        self.logger.info(f"Staged config applied for {self.trading_config.symbol}: {sorted(self._staged)}")
+        self._staged = {}
+
+    def cycle_ladder(self) -> LocLadder:
+        """현재 사이클의 LOC 사다리 (복원 직후처럼 없으면 생성)"""
+        if self.ladder is None:
+            self.ladder = build_ladder(self.trading_config)
+        return self.ladder
+
+    def _start_cycle(self):
+        """새 사이클 시작 (새 설정으로 사다리를 한 번 계산)"""
+        self.ladder = build_ladder(self.trading_config)
+        self.cycle_number += 1
+        self.cycle_started_at = datetime.now().isoformat()
+        self.cycle_investment = 0
+        self.realized_pnl = 0
+
+    def cycle_summary(self, ended_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """사이클 요약 (진행 중이면 ended_at은 None)"""
+        return {
+            "symbol": self.trading_config.symbol,
+            "cycle_number": self.cycle_number,
+            "started_at": self.cycle_started_at,
+            "ended_at": ended_at,
+            "total_investment": self.cycle_investment,
+            "realized_pnl": self.realized_pnl,
+        }
+
+    def state_dict(self) -> Dict[str, Any]:
+        """매매 상태"""
+        return {name: getattr(self, name) for name in self.STATE_FIELDS}
+
+    def restore_state(self, state: Dict[str, Any]):
+        """저장된 매매 상태 복원"""
+        for name in self.STATE_FIELDS:
+            if name in state:
+                setattr(self, name, state[name])
+        if self.position_count > 0 and self.cycle_number == 0:
+            # 사이클 번호를 기록하기 전에 저장된 포지션
+            self.cycle_number = 1
+
+    def _save_state(self):
+        """매매 상태 저장 (상태 변경 콜백 호출)"""
+        if self.on_state:
+            self.on_state(self.state_dict())
+
+    def _record_trade(self, action: str, quantity: int, price: float, cycle_closed: bool = False):
+        """체결 내역 기록"""
+        self.last_trade_time = datetime.now()
+        if action == "BUY":
+            self.cycle_investment += price * quantity
+        self._save_state()
+        if self.on_cycle:
+            self.on_cycle(self.cycle_summary(self.last_trade_time if cycle_closed else None))
+        if self.on_trade:
+            self.on_trade({
+                "timestamp": self.last_trade_time,
+                "symbol": self.trading_config.symbol,
+                "action": action,
+                "price": price,
+                "quantity": quantity,
+                "division": self.current_division,
+                "total_amount": price * quantity,
+                "cycle_number": self.cycle_number,
+            })
+
+    async def _submit_buy(self, quantity: int):
+        """추적 주문으로 매수 (상태는 체결 이벤트에서 반영)"""
+        await self.order_tracker.submit("BUY", self.trading_config.symbol, quantity, self.current_price,
+                                        deadline=self._order_deadline(), on_fill=self._on_fill)
+
+    def _order_deadline(self) -> Optional[datetime]:
+        """추적 주문의 마감 시각 (order_timeout이 0이면 없음)"""
+        if self.bot_config.order_timeout > 0:
+            return datetime.now() + timedelta(seconds=self.bot_config.order_timeout)
+        return None
+
+    def _on_fill(self, event: FillEvent):
+        """체결 이벤트 반영"""
+        if event.order.type == "SELL":
+            self._apply_sell(event.quantity, event.price, quarter_loss=event.first_fill and
+                             self.cycle_ladder().is_quarter_loss(self.current_division))
+            return
+        if self.position_count == 0:
+            self._start_cycle()
+        self.position_count += event.quantity
+        self.total_investment += event.price * event.quantity
+        self.average_price = self.total_investment / self.position_count
+        if event.first_fill:
+            # 주문 하나가 한 회차
+            self.current_division += 1
+        self._record_trade("BUY", event.quantity, event.price)
+        self.logger.info(f"Buy filled: {event.quantity} shares at {event.price} (order {event.order.order_number})")
+
+    def _apply_sell(self, quantity: int, price: float, quarter_loss: bool):
+        """매도 체결 반영 (전량 매도면 사이클 종료, 쿼터손절이면 회차 차감)"""
+        cost = self.average_price * quantity
+        self.realized_pnl += price * quantity - cost
+        self.position_count -= quantity
+        self.total_investment -= cost
+        cycle_closed = self.position_count <= 0
+        if cycle_closed:
+            self.position_count = 0
+            self.current_division = 0
+            self.average_price = 0
+            self.total_investment = 0
+            self.ladder = None
+        elif quarter_loss:
+            self.current_division = strategy.turn_after_quarter_loss(self.current_division)
+        self._record_trade("SELL", quantity, price, cycle_closed)
+        self.logger.info(f"Sell executed: {quantity} shares at {price} (realized {price * quantity - cost:.2f})")
+
+    async def _execute_exits(self) -> bool:
+        """목표가 매도 또는 쿼터손절 (사다리 조회, 사이클이 끝나면 True)"""
+        self._steps["exits"].inc()
+        if not self.trading_config.exits or self.position_count == 0:
+            return False
+        ladder = self.cycle_ladder()
+        quarter_loss = ladder.is_quarter_loss(self.current_division)
+        if quarter_loss:
+            quantity = strategy.quarter_loss_quantity(self.position_count)
+        elif self.current_price >= ladder.sell_price(self.current_division, self.average_price):
+            quantity = self.position_count
+        else:
+            return False
+        if quantity <= 0:
+            # 매도할 수량이 없어도 회차는 차감한다 (백테스트와 같은 규칙)
+            self.current_division = strategy.turn_after_quarter_loss(self.current_division)
+            self._save_state()
+            return False
+
+        if self.order_tracker:
+            await self.order_tracker.submit("SELL", self.trading_config.symbol, quantity, self.current_price,
+                                            deadline=self._order_deadline(), on_fill=self._on_fill)
+            self._observe_decision_latency("SELL")
+            return not quarter_loss
+        success = await self.kis_api.sell_stock(self.trading_config.symbol, quantity, self.current_price)
+        self._observe_decision_latency("SELL")
+        if not success:
+            return False
+        self._apply_sell(quantity, self.current_price, quarter_loss)
+        return not quarter_loss
 
     async def _execute_first_buy(self):
         """첫 매수 실행"""
+        self._steps["first_buy"].inc()
         if self.position_count > 0:
             return
 
-        quantity = int(self.trading_config.first_buy_amount / self.current_price)
+        quantity = strategy.first_buy_quantity(self.trading_config, self.current_price)
         if quantity > 0:
-            success = await self.kis_api.buy_stock(self.bot_config.symbol, quantity, self.current_price)
+            if self.order_tracker:
+                await self._submit_buy(quantity)
+                self._observe_decision_latency("BUY")
+                return
+            success = await self.kis_api.buy_stock(self.trading_config.symbol, quantity, self.current_price)
+            self._observe_decision_latency("BUY")
             if success:
+                self._start_cycle()
                 self.position_count = quantity
                 self.current_division = 1
                 self.average_price = self.current_price
                 self.total_investment = self.current_price * quantity
+                self._record_trade("BUY", quantity, self.current_price)
                 self.logger.info(f"First buy executed: {quantity} shares at {self.current_price}")
 
     async def _execute_additional_buy(self):
         """추가 매수 실행"""
-        if self.current_division >= self.trading_config.total_divisions:
-            return
-
-        # 현재가가 평균단가보다 낮은지 확인
-        if self.current_price >= self.average_price:
-            return
-
-        # 매수 수량 계산
-        amount = self.trading_config.first_buy_amount * (2 ** self.current_division)
-        quantity = int(amount / self.current_price)
+        self._steps["additional_buy"].inc()
+        # 매수 수량 계산 (분할 소진 또는 현재가가 평균단가 이상이면 0)
+        quantity = strategy.additional_buy_quantity(
+            self.trading_config, self.current_division, self.average_price, self.current_price
+        )
 
         if quantity > 0:
-            success = await self.kis_api.buy_stock(self.bot_config.symbol, quantity, self.current_price)
+            if self.order_tracker:
+                await self._submit_buy(quantity)
+                self._observe_decision_latency("BUY")
+                return
+            success = await self.kis_api.buy_stock(self.trading_config.symbol, quantity, self.current_price)
+            self._observe_decision_latency("BUY")
             if success:
                 self.position_count += quantity
                 self.current_division += 1
                 self.total_investment += self.current_price * quantity
                 self.average_price = self.total_investment / self.position_count
+                self._record_trade("BUY", quantity, self.current_price)
                 self.logger.info(f"Additional buy executed: {quantity} shares at {self.current_price}")
 
-    async def run(self):
-        """봇 실행"""
+    async def run_once(self, price: Optional[float] = None, received_at: Optional[float] = None):
+        """매매 판단 1회 실행 (price가 주어지면 시세 조회 생략)"""
+        started = time.perf_counter()
+        self._ticks.inc()
+        self._in_tick = True
+        try:
+            if self._staged and not self.cycle_open():
+                self._apply_staged()
+            await self._decide(price, received_at)
+        finally:
+            self._in_tick = False
+            if self._pending_config is not None:
+                pending, self._pending_config = self._pending_config, None
+                self._apply_config(*pending)
+            self._tick_seconds.observe(time.perf_counter() - started)
+
+    async def _decide(self, price: Optional[float], received_at: Optional[float]):
+        """매매 판단 (시세 반영 → 매도 → 매수)"""
+        if price is None:
+            await self._update_market_data()
+            self.price_received_at = time.monotonic()
+        else:
+            self.current_price = price
+            self.price_received_at = received_at
+        if self.order_tracker and self.order_tracker.has_open(self.trading_config.symbol):
+            # 미체결 주문이 남아 있으면 체결/취소될 때까지 새 주문을 내지 않는다
+            return
+        if await self._execute_exits():
+            # 목표가 매도로 사이클이 끝난 주기에는 매수하지 않는다 (백테스트와 같은 순서)
+            return
+        await self._execute_first_buy()
+        await self._execute_additional_buy()
+
+    async def _trade_until(self, deadline: Optional[datetime],
+                           clock: Optional[Callable[[], datetime]] = None):
+        """시세 피드 이벤트마다 매매 판단 (deadline이 지나면 반환, None이면 중지될 때까지)
+
+        clock: deadline과 비교할 현재 시각 (스케줄러와 같은 시계를 넘긴다)
+        """
+        clock = clock or (lambda: datetime.now(deadline.tzinfo if deadline else None))
+        price_event = asyncio.Event()
+        latest = {}
+
+        def on_price(symbol: str, price: float, received_at: float):
+            latest["price"], latest["received_at"] = price, received_at
+            price_event.set()
+
+        feed = PriceFeed(self.kis_api, on_price, streaming=self.bot_config.price_stream)
+        feed.set_symbols([self.trading_config.symbol])
+        feed_task = asyncio.create_task(feed.run(lambda: self.trading_config.trading_interval))
+
+        try:
+            while self.is_running:
+                timeout = 1.0
+                if deadline is not None:
+                    timeout = min(timeout, (deadline - clock()).total_seconds())
+                    if timeout <= 0:
+                        break
+                try:
+                    await asyncio.wait_for(price_event.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    continue
+                price_event.clear()
+                try:
+                    await self.run_once(latest["price"], latest["received_at"])
+                except Exception as e:
+                    self.logger.error(f"Error during trading cycle: {str(e)}")
+        finally:
+            feed_task.cancel()
+
+    async def run(self, scheduler: Optional[MarketScheduler] = None):
+        """봇 실행 (장 일정 사용 시 마감 전 주문 구간에만 매매)"""
         self.is_running = True
         self.logger.info("Bot started")
 
-        while self.is_running:
-            try:
-                await self._update_market_data()
-                await self._execute_first_buy()
-                await self._execute_additional_buy()
-            except Exception as e:
-                self.logger.error(f"Error during trading cycle: {str(e)}")
-            
-            await asyncio.sleep(1)  # 1초 대기
+        if not self.bot_config.market_schedule:
+            await self._trade_until(None)
+        else:
+            scheduler = scheduler or MarketScheduler()
+            async for when, kind in scheduler.events():
+                if not self.is_running:
+                    break
+                if kind == WINDOW_OPEN:
+                    window = scheduler.order_window(when)
+                    self.logger.info(f"Order window open until {window[1] if window else when}")
+                    await self._trade_until(window[1] if window else when, scheduler.clock)
 
         self.logger.info("Bot stopped")
@@ -0,0 +1,298 @@
+"""거래 저널 모듈
+
+거래 내역을 JSONL 세그먼트 파일에 추가만 하는 방식으로 기록한다.
+쓰기는 백그라운드 태스크가 모아서 한 번에 기록하고 fsync하므로 매매 루프를 막지 않는다.
+최근 거래는 메모리 링 버퍼에서, 오래된 거래는 오프셋 인덱스로 파일 위치를 바로 찾아 읽는다.
+쓰기 스레드는 자기 전용 세그먼트 상태(파일, 경로, 크기)만 바꾸고, 조회에 쓰는 세그먼트/오프셋
+인덱스는 이벤트 루프 쪽(_apply)에서만 갱신하므로 세그먼트 교체 중에도 조회가 어긋나지 않는다.
+"""
+import asyncio
+import bisect
+import json
+import logging
+import os
+from array import array
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from .records import TradeBatch
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "trades-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+def _normalize(trade: Dict) -> Dict:
+    """저장 형식으로 변환 (datetime -> ISO 문자열)"""
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in trade.items()}
+
+
+class TradeJournal:
+    """추가 전용 거래 저널"""
+
+    def __init__(self, directory: str, ring_size: int = 1000, segment_bytes: int = 16 * 1024 * 1024,
+                 flush_interval: float = 0.05):
+        """초기화 (기존 세그먼트를 읽어 인덱스 복원)"""
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+
+        self._segments: List[str] = []         # 세그먼트 파일 경로
+        self._segment_starts: List[int] = []   # 세그먼트별 첫 거래 번호
+        self._offsets = array("Q")             # 거래 번호 -> 세그먼트 내 바이트 오프셋
+        self._symbols: Dict[str, array] = {}   # 종목 -> 거래 번호 목록
+        self._ring: Deque[Dict] = deque(maxlen=ring_size)
+        self._unflushed: List[Dict] = []       # 아직 파일에 기록되지 않은 거래
+        self._unflushed_lines: List[bytes] = []
+        # 쓰기 스레드 전용 상태 (현재 세그먼트 파일, 경로, 기록된 바이트 수)
+        self._file = None
+        self._write_path = ""
+        self._write_size = 0
+        self._writer: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._write_error: Optional[Exception] = None  # 마지막 쓰기 오류
+        self.count = 0
+        self.fsyncs = 0
+
+        self._recover()
+
+    def _segment_path(self, number: int) -> str:
+        """세그먼트 파일 경로"""
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}")
+
+    def _recover(self):
+        """세그먼트 파일을 한 번 훑어 오프셋 인덱스와 링 버퍼 복원"""
+        names = sorted(name for name in os.listdir(self.directory)
+                       if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX))
+        for name in names:
+            path = os.path.join(self.directory, name)
+            self._segments.append(path)
+            self._segment_starts.append(len(self._offsets))
+            offset = 0
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # 기록 중 중단된 마지막 줄은 버린다
+                        break
+                    self._index(json.loads(line), offset)
+                    offset += len(line)
+            if offset != os.path.getsize(path):
+                logger.warning(f"Truncating partial journal record in {path}")
+                with open(path, "r+b") as f:
+                    f.truncate(offset)
+            self._write_size = offset
+        self.count = len(self._offsets)
+        if not self._segments:
+            self._segments.append(self._segment_path(1))
+            self._segment_starts.append(0)
+        self._write_path = self._segments[-1]
+
+    def _index(self, record: Dict, offset: int):
+        """복원 중 거래 한 건 색인"""
+        seq = len(self._offsets)
+        self._offsets.append(offset)
+        self._symbols.setdefault(record.get("symbol", ""), array("Q")).append(seq)
+        self._ring.append(record)
+
+    def _next_segment(self):
+        """쓰기 스레드: 다음 세그먼트로 교체"""
+        if self._file:
+            self._file.close()
+            self._file = None
+        number = int(os.path.basename(self._write_path)[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+        self._write_path = self._segment_path(number + 1)
+        self._write_size = 0
+
+    def append(self, trade: Dict) -> int:
+        """거래 추가 (기록은 백그라운드에서 수행하고 거래 번호 반환)"""
+        record = _normalize(trade)
+        seq = self.count
+        self.count += 1
+        self._ring.append(record)
+        self._symbols.setdefault(record.get("symbol", ""), array("Q")).append(seq)
+        self._unflushed.append(record)
+        self._unflushed_lines.append(json.dumps(record, ensure_ascii=False).encode() + b"\n")
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # 이벤트 루프 밖에서는 바로 기록
+            lines = list(self._unflushed_lines)
+            self._apply(len(lines), self._write(lines, len(self._offsets)))
+            return seq
+
+        self._ensure_writer()
+        self._wakeup.set()
+        return seq
+
+    def _ensure_writer(self):
+        """백그라운드 쓰기 태스크 시작 (실행 중이 아니면)"""
+        if self._writer is None or self._writer.done():
+            self._wakeup = asyncio.Event()
+            self._writer = asyncio.create_task(self._write_loop())
+
+    def _write(self, lines: List[bytes], start: int) -> List[Tuple[str, int, List[int]]]:
+        """거래 묶음을 파일에 기록하고 fsync (start: 첫 거래 번호)
+
+        쓰기 스레드 전용 상태만 바꾸고 세그먼트별 (경로, 첫 거래 번호, 오프셋 목록)을 반환한다.
+        """
+        chunks: List[Tuple[str, int, List[int]]] = []
+        current: List[int] = []
+        chunk_start = start
+        for i, line in enumerate(lines):
+            if self._write_size and self._write_size + len(line) > self.segment_bytes:
+                self._sync()
+                chunks.append((self._write_path, chunk_start, current))
+                current, chunk_start = [], start + i
+                self._next_segment()
+            if self._file is None:
+                self._file = open(self._write_path, "ab")
+            current.append(self._write_size)
+            self._file.write(line)
+            self._write_size += len(line)
+        chunks.append((self._write_path, chunk_start, current))
+        self._sync()
+        return chunks
+
+    def _sync(self):
+        """버퍼를 디스크에 반영"""
+        if self._file:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.fsyncs += 1
+
+    def _apply(self, written: int, chunks: List[Tuple[str, int, List[int]]]):
+        """기록 완료된 거래를 세그먼트/오프셋 인덱스에 반영 (이벤트 루프 쪽에서만 호출)"""
+        for path, start, offsets in chunks:
+            if path != self._segments[-1]:
+                self._segments.append(path)
+                self._segment_starts.append(start)
+            self._offsets.extend(offsets)
+        del self._unflushed[:written]
+        del self._unflushed_lines[:written]
+
+    async def _write_loop(self):
+        """쌓인 거래를 모아서 기록하는 백그라운드 루프"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            # 잠깐 기다렸다가 그동안 들어온 거래까지 한 번에 기록
+            await asyncio.sleep(self.flush_interval)
+            self._wakeup.clear()
+            lines = list(self._unflushed_lines)
+            if not lines:
+                continue
+            try:
+                chunks = await loop.run_in_executor(None, self._write, lines, len(self._offsets))
+            except Exception as e:
+                logger.error(f"Failed to write trade journal: {e}")
+                self._write_error = e
+                self._wakeup.set()
+                continue
+            self._write_error = None
+            self._apply(len(lines), chunks)
+
+    async def flush(self, timeout: float = 10.0):
+        """대기 중인 거래를 모두 기록 (timeout 안에 기록하지 못하면 TimeoutError, 원인은 마지막 쓰기 오류)"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self._unflushed:
+            if loop.time() >= deadline:
+                raise TimeoutError(f"Trade journal flush timed out with {len(self._unflushed)} unwritten trades") \
+                    from self._write_error
+            self._ensure_writer()
+            self._wakeup.set()
+            await asyncio.sleep(self.flush_interval)
+
+    async def close(self, timeout: float = 10.0):
+        """기록 완료 후 저널 종료 (timeout 안에 기록하지 못한 거래는 버린다)"""
+        if self._writer is not None and not self._writer.done():
+            try:
+                await self.flush(timeout)
+            except TimeoutError as e:
+                logger.error(f"Closing trade journal without writing {len(self._unflushed)} trades: {e.__cause__ or e}")
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+        self._writer = None
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _read_disk(self, seqs: List[int]) -> List[Dict]:
+        """오프셋 인덱스로 파일에서 거래 읽기 (연속 구간은 한 번에 읽는다)"""
+        records: List[Dict] = []
+        flushed = len(self._offsets)
+        i = 0
+        while i < len(seqs):
+            segment = bisect.bisect_right(self._segment_starts, seqs[i]) - 1
+            segment_end = flushed
+            if segment + 1 < len(self._segment_starts):
+                segment_end = min(flushed, self._segment_starts[segment + 1])
+            j = i + 1
+            while j < len(seqs) and seqs[j] == seqs[j - 1] + 1 and seqs[j] < segment_end:
+                j += 1
+            start = self._offsets[seqs[i]]
+            # 구간 끝이 세그먼트 끝이면 파일 끝까지 읽고 필요한 줄만 쓴다
+            end = self._offsets[seqs[j - 1] + 1] if seqs[j - 1] + 1 < segment_end else None
+            with open(self._segments[segment], "rb") as f:
+                f.seek(start)
+                chunk = f.read() if end is None else f.read(end - start)
+            records.extend(json.loads(line) for line in chunk.splitlines()[:j - i])
+            i = j
+        return records
+
+    def _records(self, seqs: Iterable[int]) -> List[Dict]:
+        """거래 번호 목록으로 조회 (링 버퍼 → 미기록 버퍼 → 파일 순)"""
+        seqs = list(seqs)
+        ring_start = self.count - len(self._ring)
+        flushed = len(self._offsets)
+        disk = [seq for seq in seqs if seq < ring_start and seq < flushed]
+        from_disk = iter(self._read_disk(disk)) if disk else iter(())
+        records = []
+        for seq in seqs:
+            if seq >= ring_start:
+                records.append(self._ring[seq - ring_start])
+            elif seq >= flushed:
+                records.append(self._unflushed[seq - flushed])
+            else:
+                records.append(next(from_disk))
+        return records
+
+    def size(self, symbol: Optional[str] = None) -> int:
+        """거래 수"""
+        if symbol is None:
+            return self.count
+        return len(self._symbols.get(symbol, ()))
+
+    def read(self, symbol: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """거래 내역 조회 (오래된 순, offset부터 limit건)"""
+        total = self.size(symbol)
+        start = max(0, min(offset, total))
+        stop = total if limit is None else min(total, start + max(0, limit))
+        if symbol is None:
+            return self._records(range(start, stop))
+        return self._records(self._symbols[symbol][start:stop] if stop > start else ())
+
+    def batch(self, symbol: Optional[str] = None) -> TradeBatch:
+        """거래 내역 전체를 열 단위 묶음으로 조회 (분석/백테스트용)"""
+        return TradeBatch.from_records(self.read(symbol))
+
+    def tail(self, n: int, symbol: Optional[str] = None) -> List[Dict]:
+        """최근 n건 조회"""
+        total = self.size(symbol)
+        return self.read(symbol, n, max(0, total - n))
+
+    def metrics(self) -> Dict[str, float]:
+        """저널 지표"""
+        return {
+            "trades": self.count,
+            "unflushed": len(self._unflushed),
+            "segments": len(self._segments),
+            "fsyncs": self.fsyncs,
+        }
@@ -1,34 +1,401 @@
-from typing import Optional
+import asyncio
+import itertools
+import logging
+import time
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
 from .config import BotConfig
+from .kis_client import KisAPIError, KisClient
+from .metrics import REGISTRY
+from .rate_limit import BrokerScheduler, Priority
+
+# 시세 조회용 거래소 코드 -> 주문용 거래소 코드
+ORDER_EXCHANGES = {"NAS": "NASD", "NYS": "NYSE", "AMS": "AMEX"}
+
+# 주문 구분 코드 (미국)
+ORDER_DIVISIONS = {"LIMIT": "00", "MOO": "31", "LOO": "32", "MOC": "33", "LOC": "34"}
+
+# 거래 ID (실전, 모의)
+TR_PRICE = "HHDFS00000300"
+TR_BUY = ("TTTT1002U", "VTTT1002U")
+TR_SELL = ("TTTT1006U", "VTTT1001U")
+TR_MODIFY = ("TTTT1004U", "VTTT1004U")
+TR_EXECUTIONS = ("TTTS3035R", "VTTS3035R")
+
+# 연속 조회 응답 코드 (다음 페이지 있음)
+MORE_PAGES = ("F", "M")
+MAX_EXECUTION_PAGES = 100  # 체결 조회 최대 페이지 수 (연속 키 오류 시 무한 반복 방지)
+
+# 정정/취소 구분 코드
+MODIFY_CODE = "01"
+CANCEL_CODE = "02"
+
+# 브로커 호출 계측 (call: quote/order/modify/executions)
+CALL_SECONDS = REGISTRY.histogram("kis_call_seconds", "Broker API request duration in seconds", ("call",))
+CALL_ERRORS = REGISTRY.counter("kis_call_errors_total", "Failed broker API requests", ("call",))
+
+logger = logging.getLogger(__name__)
+
+
+class Execution(NamedTuple):
+    """주문 체결 현황"""
+    filled: int         # 누적 체결 수량
+    price: float        # 평균 체결가
+    open: bool = True   # 미체결 잔량이 아직 접수 중인지 (False면 체결 완료, 취소, 만료 또는 거부)
+
+
+class QuoteAggregator:
+    """시세 요청 묶음 처리기
+
+    짧은 시간창 안에 들어온 시세 요청을 모아 종목별로 한 번씩만 조회한 뒤
+    기다리던 모든 호출자에게 결과를 나눠준다.
+    KIS 해외주식 현재가 API는 종목 하나씩 조회하므로 실제 HTTP 요청 수는 묶음 안의 종목 수다.
+    """
+
+    def __init__(self, fetch: Callable[[List[str]], Awaitable[Dict[str, float]]], window: float = 0.005):
+        """초기화 (window: 요청을 모으는 시간창, 초)"""
+        self._fetch = fetch
+        self.window = window
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self.requests = 0        # 호출자 시세 요청 수
+        self.batches = 0          # 묶음 조회 수
+        self.symbols_fetched = 0  # 브로커에 요청한 종목 수 (= 실제 HTTP 요청 수, 묶음 내 중복 제거 후)
+
+    async def get(self, symbol: str) -> float:
+        """시세 조회 (같은 시간창의 요청과 묶어서 조회)"""
+        self.requests += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(symbol, []).append(future)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self):
+        """시간창이 끝나면 모인 요청을 한 번에 조회"""
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+
+        self.batches += 1
+        self.symbols_fetched += len(pending)
+        try:
+            prices = await self._fetch(list(pending))
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for symbol, futures in pending.items():
+            price = prices.get(symbol)
+            for future in futures:
+                if future.done():
+                    continue
+                if price is None:
+                    future.set_exception(KeyError(f"No quote for {symbol}"))
+                else:
+                    future.set_result(price)
+
+    def metrics(self) -> Dict[str, float]:
+        """요청 절감 지표 (절감률은 실제로 나간 종목별 요청 수 기준)"""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "symbols_fetched": self.symbols_fetched,
+            "reduction_rate": 1 - self.symbols_fetched / self.requests if self.requests else 0.0,
+        }
+
+
+class QuoteCache:
+    """종목별 시세 TTL 캐시
+
+    유효시간 안의 요청은 캐시에서 바로 반환하고, 조회 중인 종목에 대한 동시 요청은
+    진행 중인 하나의 조회 결과를 함께 기다린다.
+    """
+
+    def __init__(self, fetch: Callable[[str], Awaitable[float]], ttl: float = 0.5):
+        """초기화 (ttl: 캐시 유효시간, 초)"""
+        self._fetch = fetch
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, float]] = {}  # 종목 -> (시세, 조회 시각)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0       # 캐시 적중 수
+        self.misses = 0     # 브로커 조회로 이어진 요청 수
+        self.coalesced = 0  # 진행 중인 조회에 합류한 요청 수
+
+    async def get(self, symbol: str) -> float:
+        """시세 조회"""
+        entry = self._entries.get(symbol)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            self.hits += 1
+            return entry[0]
+
+        task = self._inflight.get(symbol)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(self._load(symbol))
+            self._inflight[symbol] = task
+        # 한 호출자가 취소돼도 다른 대기자를 위해 조회는 계속한다
+        return await asyncio.shield(task)
+
+    async def _load(self, symbol: str) -> float:
+        """브로커 조회 후 캐시 저장"""
+        try:
+            price = await self._fetch(symbol)
+            if self.ttl > 0:
+                self._entries[symbol] = (price, time.monotonic())
+            return price
+        finally:
+            del self._inflight[symbol]
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """캐시 무효화 (종목 미지정 시 전체)"""
+        if symbol is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(symbol, None)
+
+    def metrics(self) -> Dict[str, float]:
+        """캐시 지표"""
+        total = self.hits + self.misses + self.coalesced
+        return {
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_coalesced": self.coalesced,
+            "cache_hit_rate": (self.hits + self.coalesced) / total if total else 0.0,
+        }
+
 
 class KisAPI:
-    """한국투자증권 API 클래스"""
+    """한국투자증권 API 클래스
 
-    def __init__(self, bot_config: BotConfig):
+    앱키/시크릿/계좌번호가 모두 설정되지 않으면 테스트 모드로 동작한다.
+    실제 호출은 모든 봇이 공유하는 하나의 KisClient 세션으로 나간다.
+    """
+
+    def __init__(self, bot_config: BotConfig, quote_window: float = 0.005,
+                 client: Optional[KisClient] = None):
         """API 초기화"""
         self.bot_config = bot_config
-        self.test_mode = True
+        self.test_mode = not (bot_config.app_key and bot_config.app_secret and bot_config.account_number)
+        self.client = client or KisClient(bot_config)
+        self.scheduler = BrokerScheduler(bot_config.api_rate_limit, bot_config.api_burst)
+        self.quotes = QuoteAggregator(self._fetch_prices, quote_window)
+        self.quote_cache = QuoteCache(self.quotes.get, bot_config.quote_ttl)
+        # 테스트 모드 주문 (주문번호 -> 주문 정보, 다음 체결 조회 때 전량 체결)
+        self._test_orders: Dict[str, Dict[str, Any]] = {}
+        self._test_order_numbers = itertools.count(1)
+        self._call_metrics = {call: (CALL_SECONDS.labels(call), CALL_ERRORS.labels(call))
+                              for call in ("quote", "order", "modify", "executions")}
 
-    async def get_current_price(self, symbol: str) -> float:
-        """현재가 조회"""
+    async def close(self):
+        """세션 종료"""
+        await self.client.close()
+
+    async def _request(self, call: str, *args, **kwargs) -> Dict:
+        """브로커 요청 (소요 시간과 실패 횟수 기록)"""
+        seconds, errors = self._call_metrics[call]
+        started = time.perf_counter()
+        try:
+            return await self.client.request(*args, **kwargs)
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            seconds.observe(time.perf_counter() - started)
+
+    def exchange(self, symbol: str) -> str:
+        """종목의 시세 조회용 거래소 코드"""
+        return self.bot_config.exchanges.get(symbol, "NAS")
+
+    async def _fetch_price(self, symbol: str) -> float:
+        """단일 종목 시세 조회 (브로커 호출)"""
         if self.test_mode:
             return 70000.0
-        
-        # TODO: 실제 API 호출
-        raise NotImplementedError
 
-    async def buy_stock(self, symbol: str, quantity: int, price: float) -> bool:
+        data = await self._request(
+            "quote", "GET", "/uapi/overseas-price/v1/quotations/price", TR_PRICE,
+            params={"AUTH": "", "EXCD": self.exchange(symbol), "SYMB": symbol},
+        )
+        return float(data["output"]["last"])
+
+    async def _fetch_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """여러 종목 시세 조회 (종목마다 요청 하나, 한 세션에서 동시에 요청)"""
+        prices = await asyncio.gather(
+            *(self.scheduler.call(Priority.QUOTE, self._fetch_price, symbol) for symbol in symbols)
+        )
+        return dict(zip(symbols, prices))
+
+    async def get_current_price(self, symbol: str) -> float:
+        """현재가 조회 (캐시 → 진행 중인 조회 합류 → 묶음 조회)"""
+        return await self.quote_cache.get(symbol)
+
+    async def get_current_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """여러 종목 현재가 조회 (캐시에 없는 종목은 한 번의 묶음 조회)"""
+        prices = await asyncio.gather(*(self.quote_cache.get(symbol) for symbol in symbols))
+        return dict(zip(symbols, prices))
+
+    def quote_metrics(self) -> Dict[str, float]:
+        """시세 캐시 및 묶음 조회 지표"""
+        return {**self.quote_cache.metrics(), **self.quotes.metrics()}
+
+    def _account(self) -> Dict[str, str]:
+        """계좌 파라미터"""
+        account = self.bot_config.account_number.replace("-", "")
+        return {"CANO": account[:8], "ACNT_PRDT_CD": self.bot_config.account_code}
+
+    async def _order(self, tr_ids: Tuple[str, str], symbol: str, quantity: int,
+                     price: float, condition: str) -> Dict:
+        """해외주식 주문"""
+        data = await self._request(
+            "order", "POST", "/uapi/overseas-stock/v1/trading/order", tr_ids[self.bot_config.virtual],
+            body={
+                **self._account(),
+                "OVRS_EXCG_CD": ORDER_EXCHANGES[self.exchange(symbol)],
+                "PDNO": symbol,
+                "ORD_QTY": str(quantity),
+                # 시장가 계열 주문은 가격 0
+                "OVRS_ORD_UNPR": "0" if condition in ("MOO", "MOC") else f"{price:.2f}",
+                "ORD_SVR_DVSN_CD": "0",
+                "ORD_DVSN": ORDER_DIVISIONS[condition],
+            },
+        )
+        return data["output"]
+
+    async def buy_stock(self, symbol: str, quantity: int, price: float, condition: str = "LIMIT") -> bool:
         """주식 매수"""
+        await self.scheduler.acquire(Priority.ORDER)
         if self.test_mode:
             return True
-        
-        # TODO: 실제 API 호출
-        raise NotImplementedError
 
-    async def sell_stock(self, symbol: str, quantity: int, price: float) -> bool:
+        try:
+            await self._order(TR_BUY, symbol, quantity, price, condition)
+        except KisAPIError as e:
+            logger.error(f"Order rejected for {symbol}: {e}")
+            return False
+        return True
+
+    async def sell_stock(self, symbol: str, quantity: int, price: float, condition: str = "LIMIT") -> bool:
         """주식 매도"""
+        await self.scheduler.acquire(Priority.ORDER)
         if self.test_mode:
             return True
-        
-        # TODO: 실제 API 호출
-        raise NotImplementedError
+
+        try:
+            await self._order(TR_SELL, symbol, quantity, price, condition)
+        except KisAPIError as e:
+            logger.error(f"Order rejected for {symbol}: {e}")
+            return False
+        return True
+
+    async def place_order(self, side: str, symbol: str, quantity: int, price: float,
+                          condition: str = "LIMIT") -> Optional[str]:
+        """주문 후 주문번호 반환 (거부되면 None)"""
+        await self.scheduler.acquire(Priority.ORDER)
+        if self.test_mode:
+            order_number = f"T{next(self._test_order_numbers):09d}"
+            self._test_orders[order_number] = {"quantity": quantity, "price": price, "cancelled": False}
+            return order_number
+
+        try:
+            output = await self._order(TR_BUY if side == "BUY" else TR_SELL, symbol, quantity, price, condition)
+        except KisAPIError as e:
+            logger.error(f"Order rejected for {symbol}: {e}")
+            return None
+        return output["ODNO"]
+
+    async def _modify_order(self, order_number: str, symbol: str, quantity: int,
+                            price: float, code: str) -> bool:
+        """주문 정정/취소"""
+        await self.scheduler.acquire(Priority.ORDER)
+        if self.test_mode:
+            order = self._test_orders.get(order_number)
+            if order is None:
+                return False
+            if code == CANCEL_CODE:
+                order["cancelled"] = True
+            else:
+                order["price"] = price
+            return True
+
+        try:
+            await self._request(
+                "modify", "POST", "/uapi/overseas-stock/v1/trading/order-rvsecncl", TR_MODIFY[self.bot_config.virtual],
+                body={
+                    **self._account(),
+                    "OVRS_EXCG_CD": ORDER_EXCHANGES[self.exchange(symbol)],
+                    "PDNO": symbol,
+                    "ORGN_ODNO": order_number,
+                    "RVSE_CNCL_DVSN_CD": code,
+                    "ORD_QTY": str(quantity),
+                    "OVRS_ORD_UNPR": "0" if code == CANCEL_CODE else f"{price:.2f}",
+                    "ORD_SVR_DVSN_CD": "0",
+                },
+            )
+        except KisAPIError as e:
+            logger.error(f"Order {order_number} modify/cancel rejected: {e}")
+            return False
+        return True
+
+    async def cancel_order(self, order_number: str, symbol: str, quantity: int) -> bool:
+        """미체결 주문 취소"""
+        return await self._modify_order(order_number, symbol, quantity, 0.0, CANCEL_CODE)
+
+    async def modify_order(self, order_number: str, symbol: str, quantity: int, price: float) -> bool:
+        """미체결 주문 가격 정정"""
+        return await self._modify_order(order_number, symbol, quantity, price, MODIFY_CODE)
+
+    async def order_executions(self, start: Optional[date] = None) -> Dict[str, Execution]:
+        """주문별 체결 현황 조회 (주문번호 -> Execution, start: 조회 시작일, 기본 오늘)
+
+        한 페이지에 담기지 않으면 연속 조회 키로 마지막 페이지까지 이어서 조회한다.
+        """
+        await self.scheduler.acquire(Priority.QUERY)
+        if self.test_mode:
+            return {number: Execution(0, 0.0, False) if order["cancelled"]
+                    else Execution(order["quantity"], order["price"], False)
+                    for number, order in self._test_orders.items()}
+
+        executions: Dict[str, Execution] = {}
+        params = {
+            **self._account(),
+            "PDNO": "%",
+            "ORD_STRT_DT": (start.strftime("%Y%m%d") if start else time.strftime("%Y%m%d")),
+            "ORD_END_DT": time.strftime("%Y%m%d"),
+            "SLL_BUY_DVSN": "00",
+            "CCLD_NCCS_DVSN": "00",
+            "OVRS_EXCG_CD": "%",
+            "SORT_SQN": "DS",
+            "ORD_DT": "",
+            "ORD_GNO_BRNO": "",
+            "ODNO": "",
+            "CTX_AREA_NK200": "",
+            "CTX_AREA_FK200": "",
+        }
+        tr_cont = ""
+        for page in range(MAX_EXECUTION_PAGES):
+            if page:
+                await self.scheduler.acquire(Priority.QUERY)
+            data = await self._request(
+                "executions", "GET", "/uapi/overseas-stock/v1/trading/inquire-ccnl", TR_EXECUTIONS[self.bot_config.virtual],
+                params=params, tr_cont=tr_cont,
+            )
+            for row in data.get("output", []):
+                filled = int(float(row.get("ft_ccld_qty") or 0))
+                price = float(row.get("ft_ccld_unpr3") or 0)
+                # 미체결 수량이 0이면 체결 완료 또는 취소/만료/거부로 더 이상 체결되지 않는다
+                remaining = row.get("nccs_qty")
+                executions[row["odno"]] = Execution(filled, price, remaining is None or int(float(remaining or 0)) > 0)
+            if data.get("tr_cont") not in MORE_PAGES:
+                break
+            # 연속 조회 키로 다음 페이지 요청
+            params["CTX_AREA_NK200"] = data.get("ctx_area_nk200", "")
+            params["CTX_AREA_FK200"] = data.get("ctx_area_fk200", "")
+            tr_cont = "N"
+        else:
+            logger.warning(f"Order execution query stopped after {MAX_EXECUTION_PAGES} pages")
+        return executions
@@ -0,0 +1,163 @@
+"""한국투자증권 REST 클라이언트 모듈
+
+하나의 aiohttp 세션을 오래 유지하며 연결 풀, DNS 캐시, HTTP keep-alive를 재사용한다.
+접근 토큰은 만료 전에 백그라운드에서 갱신하므로 진행 중인 요청은 기존 토큰으로 계속 나간다.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from .config import BotConfig
+
+logger = logging.getLogger(__name__)
+
+REAL_URL = "https://openapi.koreainvestment.com:9443"
+VIRTUAL_URL = "https://openapivts.koreainvestment.com:29443"
+
+REAL_WS_URL = "ws://ops.koreainvestment.com:21000"
+VIRTUAL_WS_URL = "ws://ops.koreainvestment.com:31000"
+
+TOKEN_PATH = "/oauth2/tokenP"
+APPROVAL_PATH = "/oauth2/Approval"
+TOKEN_REFRESH_MARGIN = 600  # 만료 10분 전부터 백그라운드 갱신
+TOKEN_RETRY_INTERVAL = 60  # 백그라운드 갱신 재시도 간격 (토큰 발급은 분당 1회 제한)
+
+
+class KisAPIError(Exception):
+    """한국투자증권 API 오류"""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(f"[{code}] {message}")
+        self.code = code
+        self.message = message
+
+
+class KisClient:
+    """한국투자증권 REST 클라이언트"""
+
+    def __init__(self, bot_config: BotConfig, base_url: Optional[str] = None,
+                 pool_size: int = 10, timeout: float = 5.0, ws_url: Optional[str] = None):
+        """초기화"""
+        self.bot_config = bot_config
+        self.base_url = (base_url or (VIRTUAL_URL if bot_config.virtual else REAL_URL)).rstrip("/")
+        self.ws_url = ws_url or (VIRTUAL_WS_URL if bot_config.virtual else REAL_WS_URL)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._next_refresh_at = 0.0
+        self.token_refreshes = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """공유 세션 조회 (처음 호출 시 생성)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"content-type": "application/json; charset=utf-8"},
+            )
+        return self._session
+
+    async def close(self):
+        """세션 종료"""
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _issue_token(self):
+        """접근 토큰 발급"""
+        session = self._get_session()
+        async with session.post(self.base_url + TOKEN_PATH, json={
+            "grant_type": "client_credentials",
+            "appkey": self.bot_config.app_key,
+            "appsecret": self.bot_config.app_secret,
+        }) as response:
+            data = await response.json(content_type=None)
+        if "access_token" not in data:
+            raise KisAPIError(data.get("error_code", str(response.status)),
+                              data.get("error_description", "token issue failed"))
+        self._token = data["access_token"]
+        self._token_expires_at = time.monotonic() + float(data.get("expires_in", 86400))
+        self.token_refreshes += 1
+        logger.info("KIS access token refreshed")
+
+    def _start_refresh(self) -> asyncio.Task:
+        """토큰 갱신 태스크 시작 (이미 진행 중이면 재사용)"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._issue_token())
+            self._refresh_task.add_done_callback(self._log_refresh_error)
+        return self._refresh_task
+
+    async def access_token(self) -> str:
+        """유효한 접근 토큰 조회"""
+        remaining = self._token_expires_at - time.monotonic()
+        if self._token and remaining > 0:
+            if remaining < TOKEN_REFRESH_MARGIN and time.monotonic() >= self._next_refresh_at:
+                # 기존 토큰이 아직 유효하므로 갱신은 기다리지 않는다
+                self._next_refresh_at = time.monotonic() + TOKEN_RETRY_INTERVAL
+                self._start_refresh()
+            return self._token
+
+        await asyncio.shield(self._start_refresh())
+        return self._token
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Task):
+        """백그라운드 토큰 갱신 오류 기록"""
+        if not task.cancelled() and task.exception():
+            logger.error(f"Background token refresh failed: {task.exception()}")
+
+    async def approval_key(self) -> str:
+        """실시간 웹소켓 접속키 발급"""
+        session = self._get_session()
+        async with session.post(self.base_url + APPROVAL_PATH, json={
+            "grant_type": "client_credentials",
+            "appkey": self.bot_config.app_key,
+            "secretkey": self.bot_config.app_secret,
+        }) as response:
+            data = await response.json(content_type=None)
+        if "approval_key" not in data:
+            raise KisAPIError(data.get("error_code", str(response.status)),
+                              data.get("error_description", "approval key issue failed"))
+        return data["approval_key"]
+
+    async def ws_connect(self) -> aiohttp.ClientWebSocketResponse:
+        """실시간 웹소켓 연결 (공유 세션 사용)"""
+        return await self._get_session().ws_connect(self.ws_url, heartbeat=30)
+
+    async def request(self, method: str, path: str, tr_id: str,
+                      params: Optional[Dict[str, Any]] = None,
+                      body: Optional[Dict[str, Any]] = None, tr_cont: str = "") -> Dict[str, Any]:
+        """API 요청 (tr_cont: 연속 조회 시 "N", 응답의 tr_cont 키에 다음 페이지 여부가 담긴다)"""
+        token = await self.access_token()
+        headers = {
+            "authorization": f"Bearer {token}",
+            "appkey": self.bot_config.app_key,
+            "appsecret": self.bot_config.app_secret,
+            "tr_id": tr_id,
+            "custtype": "P",
+        }
+        if tr_cont:
+            headers["tr_cont"] = tr_cont
+        session = self._get_session()
+        async with session.request(method, self.base_url + path, params=params, json=body, headers=headers) as response:
+            data = await response.json(content_type=None)
+            # 응답 헤더 tr_cont: F/M이면 다음 페이지가 있다
+            data["tr_cont"] = response.headers.get("tr_cont", "")
+
+        if data.get("rt_cd") != "0":
+            raise KisAPIError(data.get("msg_cd", str(response.status)), data.get("msg1", ""))
+        return data
@@ -0,0 +1,78 @@
+"""LOC 주문 사다리 모듈
+
+사이클 시작 시 거래 설정으로 회차(0..총 분할 수, 0.5 단위)별 LOC 퍼센트, 매도 목표 배수,
+쿼터손절 여부를 한 번 계산해 배열로 보관한다. 매 주기의 매도 판단은 배열 조회만 한다.
+값은 strategy 함수와 같은 식으로 계산하므로 라이브 봇, 백테스트와 결과가 같다.
+매수 수량은 라이브 봇과 백테스트 모두 strategy.additional_buy_quantity로 정하므로 사다리에 두지 않는다.
+"""
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from . import strategy
+from .config import TradingConfig
+
+STEPS_PER_TURN = 2  # 회차 배열 해상도 (LOC 주문 하나만 체결되면 0.5회차 진행)
+
+
+@dataclass
+class LocLadder:
+    """회차별 LOC 주문 사다리 (배열 인덱스는 회차 × STEPS_PER_TURN)"""
+    total_divisions: int
+    pre_turn_threshold: int
+    loc_percent: np.ndarray        # 회차별 LOC 퍼센트
+    sell_multiplier: np.ndarray    # 회차별 평단 대비 매도 목표가 배수
+    quarter_loss: np.ndarray       # 회차별 쿼터손절 여부
+
+    @property
+    def turns(self) -> np.ndarray:
+        """배열 인덱스별 회차"""
+        return np.arange(self.total_divisions * STEPS_PER_TURN + 1) / STEPS_PER_TURN
+
+    def _turn(self, turn: float) -> int:
+        """회차 인덱스 (0.5 단위가 아닌 회차는 ValueError, 범위 밖은 양 끝으로)"""
+        index = round(turn * STEPS_PER_TURN)
+        if abs(turn * STEPS_PER_TURN - index) > 1e-9:
+            raise ValueError(f"Turn must be a multiple of {1 / STEPS_PER_TURN}: {turn}")
+        return min(max(index, 0), self.total_divisions * STEPS_PER_TURN)
+
+    def sell_price(self, turn: float, average_price: float) -> float:
+        """회차의 LOC 매도 목표가"""
+        return average_price * self.sell_multiplier[self._turn(turn)]
+
+    def is_quarter_loss(self, turn: float) -> bool:
+        """쿼터손절 회차 여부"""
+        return bool(self.quarter_loss[self._turn(turn)])
+
+    def to_frame(self) -> pd.DataFrame:
+        """회차별 사다리 표"""
+        return pd.DataFrame({
+            "loc_percent": self.loc_percent,
+            "sell_multiplier": self.sell_multiplier,
+            "quarter_loss": self.quarter_loss,
+        }, index=pd.Index(self.turns, name="turn"))
+
+    def to_dict(self) -> Dict:
+        """내보내기용 딕셔너리"""
+        return {
+            "total_divisions": self.total_divisions,
+            "pre_turn_threshold": self.pre_turn_threshold,
+            "turns": self.to_frame().reset_index().to_dict(orient="records"),
+        }
+
+
+def build_ladder(trading_config: TradingConfig) -> LocLadder:
+    """사다리 생성"""
+    total = trading_config.total_divisions
+    turns = np.arange(total * STEPS_PER_TURN + 1, dtype=np.float64) / STEPS_PER_TURN
+    loc_percent = strategy.BASE_LOC_PERCENT * (1 - turns / trading_config.pre_turn_threshold)
+
+    return LocLadder(
+        total_divisions=total,
+        pre_turn_threshold=trading_config.pre_turn_threshold,
+        loc_percent=loc_percent,
+        sell_multiplier=1 + loc_percent / 100,
+        quarter_loss=turns >= trading_config.quarter_loss_start,
+    )
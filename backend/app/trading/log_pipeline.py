@@ -0,0 +1,187 @@
+"""로그 파이프라인
+
+로거에는 큐에 레코드를 넣기만 하는 QueueHandler를 붙이고, 파일/콘솔 쓰기는 프로세스에
+하나뿐인 QueueListener 스레드가 맡는다. 그래서 로그 한 줄이 이벤트 루프에서 디스크를
+기다리지 않는다. 파일에는 한 줄에 JSON 레코드 하나를 쓰고 크기 또는 시각 기준으로 교체한다.
+
+같은 로거에 같은 파일로 다시 설정하면 아무것도 하지 않고, 다른 파일이면 기존 큐 핸들러를
+교체하므로 봇을 다시 만들어도 같은 줄이 여러 번 기록되지 않는다.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from typing import Dict, Optional
+
+CONSOLE = "<console>"  # 콘솔 출력 대상 키
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# LogRecord 기본 속성 (나머지는 extra로 넘긴 구조화 필드)
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "destinations"}
+
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_lock = threading.Lock()  # 출력 핸들러/로거 목록 보호
+_lifecycle = threading.Lock()  # 리스너 시작/중지 (리스너 스레드는 _lock만 잡으므로 따로 둔다)
+_listener: Optional[QueueListener] = None
+_outputs: Dict[str, logging.Handler] = {}  # 출력 대상(파일 경로 또는 CONSOLE) -> 실제 핸들러
+_owners: Dict[str, tuple] = {}  # 로거 이름 -> 출력 대상
+
+
+class JsonFormatter(logging.Formatter):
+    """JSON 한 줄 포맷"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED:
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _PipelineHandler(QueueHandler):
+    """출력 대상을 레코드에 실어 큐에 넣는 핸들러"""
+
+    def __init__(self, destinations: tuple):
+        super().__init__(_queue)
+        self.destinations = destinations
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지와 예외는 호출 스레드에서 문자열로 만들고 구조화 필드는 그대로 둔다
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.destinations = self.destinations
+        return record
+
+
+class _Router(logging.Handler):
+    """리스너 스레드에서 레코드를 출력 대상 핸들러로 전달"""
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if hasattr(record, "release"):
+            _release(record.release)
+            return True
+        for destination in getattr(record, "destinations", ()):
+            handler = _outputs.get(destination)
+            if handler is not None and record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+    def emit(self, record: logging.LogRecord):
+        self.handle(record)
+
+
+def _output(path: Optional[str], max_bytes: int, backup_count: int, when: Optional[str]) -> str:
+    """출력 핸들러 등록 (이미 있으면 재사용) 후 대상 키 반환"""
+    if path is None:
+        if CONSOLE not in _outputs:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+            _outputs[CONSOLE] = handler
+        return CONSOLE
+
+    path = os.path.abspath(path)
+    if path not in _outputs:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if when:
+            handler = TimedRotatingFileHandler(path, when=when, backupCount=backup_count, encoding="utf-8")
+        else:
+            handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        handler.setFormatter(JsonFormatter())
+        _outputs[path] = handler
+    return path
+
+
+def _release(destinations: tuple):
+    """더 이상 쓰는 로거가 없는 출력 핸들러 닫기 (앞선 레코드를 모두 쓴 뒤 리스너 스레드에서 호출)"""
+    with _lock:
+        in_use = {destination for owned in _owners.values() for destination in owned}
+        for destination in destinations:
+            if destination not in in_use and destination in _outputs:
+                _outputs.pop(destination).close()
+
+
+def _start():
+    """리스너 스레드 시작 (한 번만)"""
+    global _listener
+    with _lifecycle:
+        if _listener is None:
+            _listener = QueueListener(_queue, _Router())
+            _listener.start()
+
+
+def get_logger(name: str, log_dir: Optional[str] = None, filename: str = "trading.log",
+               level: int = logging.INFO, console: bool = False, max_bytes: int = 10 * 1024 * 1024,
+               backup_count: int = 5, when: Optional[str] = None) -> logging.Logger:
+    """큐 기반 로거 설정 (같은 설정으로 다시 호출해도 핸들러가 늘지 않는다)
+
+    log_dir가 있으면 log_dir/filename에 JSON 레코드를 기록한다. when을 지정하면
+    ("midnight", "H" 등) 시각 기준으로, 아니면 max_bytes 크기 기준으로 교체한다.
+    """
+    with _lock:
+        destinations = []
+        if log_dir is not None:
+            destinations.append(_output(os.path.join(log_dir, filename), max_bytes, backup_count, when))
+        if console:
+            destinations.append(_output(None, max_bytes, backup_count, when))
+        destinations = tuple(destinations)
+
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        current = [handler for handler in logger.handlers if isinstance(handler, _PipelineHandler)]
+        if [handler.destinations for handler in current] != [destinations]:
+            for handler in current:
+                logger.removeHandler(handler)
+            logger.addHandler(_PipelineHandler(destinations))
+            previous = _owners.get(name, ())
+            _owners[name] = destinations
+            if previous:
+                # 이전 파일은 큐에 남은 레코드를 쓴 뒤 닫는다
+                _queue.put(logging.makeLogRecord({"release": previous}))
+    _start()
+    return logger
+
+
+def flush():
+    """큐에 쌓인 레코드를 모두 기록 (리스너를 재시작)"""
+    global _listener
+    with _lifecycle:
+        if _listener is not None:
+            _listener.stop()
+            _listener = QueueListener(_queue, _Router())
+            _listener.start()
+    with _lock:
+        for handler in _outputs.values():
+            handler.flush()
+
+
+def shutdown():
+    """남은 레코드를 기록하고 리스너와 파일 핸들러 종료"""
+    global _listener
+    with _lifecycle:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+    with _lock:
+        for handler in _outputs.values():
+            handler.close()
+        _outputs.clear()
+
+
+atexit.register(shutdown)
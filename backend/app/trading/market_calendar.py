@@ -0,0 +1,194 @@
+"""미국 시장 달력 및 장 일정 스케줄러 모듈
+
+NYSE 정규장 시간, 휴장일, 조기 폐장일을 계산하고(서머타임은 America/New_York 시간대로 처리)
+LOC/MOC 주문 구간, 장 마감 후 체결 확인, 일일 리포트 시각에만 봇을 깨운다.
+그 밖의 시간에는 다음 일정까지 잠들어 있으므로 CPU와 API 호출이 거의 없다.
+"""
+import asyncio
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+ET = ZoneInfo("America/New_York")
+
+REGULAR_OPEN = time(9, 30)
+REGULAR_CLOSE = time(16, 0)
+EARLY_CLOSE = time(13, 0)
+
+# 장 일정 이벤트
+WINDOW_OPEN = "window_open"      # 마감 전 주문 구간 시작
+WINDOW_CLOSE = "window_close"    # 주문 구간 종료 (LOC/MOC 접수 마감)
+POST_CLOSE = "post_close"        # 장 마감 후 체결 확인
+DAILY_REPORT = "daily_report"    # 일일 리포트
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n번째 요일 (n=-1이면 마지막)"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    """부활절 (그레고리력, 익명 알고리즘)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month = (h + l - 7 * m + 90) // 25
+    day = (h + l - 7 * m + 33 * month + 19) % 32
+    return date(year, month, day)
+
+
+def _observed(day: date) -> date:
+    """주말 공휴일의 대체 휴장일 (토요일 → 금요일, 일요일 → 월요일)"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=32)
+def nyse_holidays(year: int) -> Set[date]:
+    """NYSE 정규 휴장일"""
+    holidays = {
+        _nth_weekday(year, 1, 0, 3),         # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),         # Presidents' Day
+        _easter(year) - timedelta(days=2),   # Good Friday
+        _nth_weekday(year, 5, 0, -1),        # Memorial Day
+        _observed(date(year, 7, 4)),         # Independence Day
+        _nth_weekday(year, 9, 0, 1),         # Labor Day
+        _nth_weekday(year, 11, 3, 4),        # Thanksgiving
+        _observed(date(year, 12, 25)),       # Christmas
+    }
+    # 신정이 토요일이면 전년도 12월 31일은 쉬지 않는다
+    if date(year, 1, 1).weekday() != 5:
+        holidays.add(_observed(date(year, 1, 1)))
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+    return holidays
+
+
+@lru_cache(maxsize=32)
+def nyse_early_closes(year: int) -> Set[date]:
+    """NYSE 조기 폐장일 (13:00 마감)"""
+    early = {_nth_weekday(year, 11, 3, 4) + timedelta(days=1)}  # 추수감사절 다음 날
+    for day in (date(year, 7, 3), date(year, 12, 24)):
+        # 독립기념일/성탄절 전날이 월~목요일일 때만 (금요일이면 대체 휴장일)
+        if day.weekday() < 4:
+            early.add(day)
+    return early
+
+
+@dataclass(frozen=True)
+class Session:
+    """정규장 세션 (뉴욕 시간)"""
+    day: date
+    open: datetime
+    close: datetime
+
+    @property
+    def early_close(self) -> bool:
+        """조기 폐장 여부"""
+        return self.close.time() != REGULAR_CLOSE
+
+
+class MarketCalendar:
+    """미국 주식시장 달력"""
+
+    def __init__(self, extra_holidays: Iterable[date] = ()):
+        """초기화 (extra_holidays: 임시 휴장일)"""
+        self.extra_holidays = set(extra_holidays)
+
+    def is_trading_day(self, day: date) -> bool:
+        """거래일 여부"""
+        return day.weekday() < 5 and day not in nyse_holidays(day.year) and day not in self.extra_holidays
+
+    def session(self, day: date) -> Optional[Session]:
+        """해당 날짜의 정규장 세션 (휴장일이면 None)"""
+        if not self.is_trading_day(day):
+            return None
+        close = EARLY_CLOSE if day in nyse_early_closes(day.year) else REGULAR_CLOSE
+        return Session(day, datetime.combine(day, REGULAR_OPEN, ET), datetime.combine(day, close, ET))
+
+    def sessions_from(self, day: date) -> Iterable[Session]:
+        """day부터 이어지는 세션"""
+        while True:
+            session = self.session(day)
+            if session is not None:
+                yield session
+            day += timedelta(days=1)
+
+
+class MarketScheduler:
+    """장 일정 스케줄러
+
+    거래일마다 마감 window_start분 전에 주문 구간을 열고 window_end분 전에 닫는다.
+    마감 post_close분 뒤 체결 확인, report분 뒤 일일 리포트 이벤트를 낸다.
+    """
+
+    def __init__(self, calendar: Optional[MarketCalendar] = None, window_start: float = 20,
+                 window_end: float = 10, post_close: float = 10, report: float = 30,
+                 clock: Callable[[], datetime] = lambda: datetime.now(ET),
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        """초기화 (시간 단위는 분)"""
+        self.calendar = calendar or MarketCalendar()
+        self.window_start = timedelta(minutes=window_start)
+        self.window_end = timedelta(minutes=window_end)
+        self.post_close = timedelta(minutes=post_close)
+        self.report = timedelta(minutes=report)
+        self.clock = clock
+        self.sleep = sleep
+
+    def events_for(self, session: Session) -> List[Tuple[datetime, str]]:
+        """세션의 일정 이벤트"""
+        return [
+            (session.close - self.window_start, WINDOW_OPEN),
+            (session.close - self.window_end, WINDOW_CLOSE),
+            (session.close + self.post_close, POST_CLOSE),
+            (session.close + self.report, DAILY_REPORT),
+        ]
+
+    def next_event(self, now: datetime) -> Tuple[datetime, str]:
+        """now 이후 첫 이벤트"""
+        # 전날 세션의 리포트가 자정을 넘길 수 있으므로 하루 전부터 확인
+        for session in self.calendar.sessions_from(now.astimezone(ET).date() - timedelta(days=1)):
+            for when, kind in self.events_for(session):
+                if when > now:
+                    return when, kind
+
+    def order_window(self, now: datetime) -> Optional[Tuple[datetime, datetime]]:
+        """now가 주문 구간 안이면 (시작, 종료)"""
+        session = self.calendar.session(now.astimezone(ET).date())
+        if session is None:
+            return None
+        start, end = session.close - self.window_start, session.close - self.window_end
+        return (start, end) if start <= now < end else None
+
+    async def sleep_until(self, when: datetime):
+        """when까지 대기 (시계 변경에 대비해 최대 1시간씩 나눠 잔다)"""
+        while True:
+            remaining = (when - self.clock()).total_seconds()
+            if remaining <= 0:
+                return
+            await self.sleep(min(remaining, 3600))
+
+    async def events(self) -> AsyncIterator[Tuple[datetime, str]]:
+        """일정 이벤트 (시작 시 주문 구간 안이면 바로 WINDOW_OPEN)"""
+        now = self.clock()
+        if self.order_window(now):
+            yield now, WINDOW_OPEN
+        while True:
+            when, kind = self.next_event(now)
+            await self.sleep_until(when)
+            yield when, kind
+            now = when
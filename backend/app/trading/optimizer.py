@@ -0,0 +1,142 @@
+"""TradingConfig 파라미터 스윕 모듈
+
+가격 데이터는 공유 메모리에 한 번만 올리고, 워커 프로세스는 초기화 시 이를 복사 없이 붙여서 사용한다.
+설정 조합은 묶음(chunk) 단위로 전달해 프로세스 간 통신 비용을 줄인다.
+"""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .backtest import run_backtest, _close_prices
+from .config import TradingConfig
+
+# 스윕 대상 파라미터
+SWEEP_PARAMS = ("total_divisions", "first_buy_amount", "pre_turn_threshold", "quarter_loss_start")
+
+# 워커 프로세스 전역 상태 (초기화 함수에서 설정)
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_prices: Optional[np.ndarray] = None
+
+
+def grid_configs(base: TradingConfig, **grid: Sequence[Any]) -> List[TradingConfig]:
+    """파라미터 격자의 모든 조합 생성"""
+    names = list(grid)
+    return [
+        base.model_copy(update=dict(zip(names, values)))
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+def random_configs(
+    base: TradingConfig,
+    count: int,
+    seed: Optional[int] = None,
+    **ranges: Tuple[float, float],
+) -> List[TradingConfig]:
+    """파라미터 범위에서 무작위 조합 생성 (정수 필드는 정수로 샘플링)"""
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(count):
+        update = {}
+        for name, (low, high) in ranges.items():
+            if isinstance(getattr(base, name), int):
+                update[name] = int(rng.integers(low, high + 1))
+            else:
+                update[name] = float(rng.uniform(low, high))
+        configs.append(base.model_copy(update=update))
+    return configs
+
+
+def _init_worker(shm_name: str, shape: Tuple[int, ...], dtype: str):
+    """워커 초기화: 공유 메모리 가격 배열 연결"""
+    global _worker_shm, _worker_prices
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_prices = np.ndarray(shape, dtype=dtype, buffer=_worker_shm.buf)
+
+
+def _evaluate(prices: np.ndarray, config: Dict[str, Any], initial_capital: Optional[float]) -> Dict[str, Any]:
+    """설정 하나에 대한 백테스트 지표 계산"""
+    result = run_backtest(prices, TradingConfig(**config))
+    row = {name: config[name] for name in SWEEP_PARAMS}
+    row.update({
+        "cagr": result.cagr(initial_capital),
+        "max_drawdown": result.max_drawdown(initial_capital),
+        "cycles_completed": result.cycles_completed,
+        "peak_investment": result.peak_investment,
+        "fills": len(result.fills),
+    })
+    return row
+
+
+def _run_chunk(configs: List[Dict[str, Any]], initial_capital: Optional[float]) -> List[Dict[str, Any]]:
+    """워커에서 설정 묶음 실행"""
+    return [_evaluate(_worker_prices, config, initial_capital) for config in configs]
+
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    """리스트를 size 단위로 분할"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def rank_results(rows: List[Dict[str, Any]], sort_by: str = "cagr") -> pd.DataFrame:
+    """결과 행을 순위표로 정렬"""
+    frame = pd.DataFrame(rows)
+    if frame.empty:
+        return frame
+    ascending = sort_by == "max_drawdown"
+    frame = frame.sort_values([sort_by, "max_drawdown"], ascending=[ascending, True], kind="stable")
+    frame.index = pd.RangeIndex(1, len(frame) + 1, name="rank")
+    return frame
+
+
+def run_sweep(
+    bars,
+    configs: Sequence[TradingConfig],
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    initial_capital: Optional[float] = None,
+    sort_by: str = "cagr",
+) -> pd.DataFrame:
+    """파라미터 스윕 실행
+
+    Args:
+        bars: run_backtest와 같은 형식의 가격 데이터
+        configs: 평가할 설정 목록
+        max_workers: 워커 프로세스 수 (기본값: CPU 코어 수, 1이면 현재 프로세스에서 실행)
+        chunk_size: 워커에 한 번에 넘길 설정 개수 (기본값: 워커당 약 4묶음)
+        initial_capital: CAGR/낙폭 계산 기준 자본금 (기본값: 설정별 최대 투입 원금)
+        sort_by: 정렬 기준 지표
+    """
+    prices = np.ascontiguousarray(_close_prices(bars))
+    payload = [config.model_dump() for config in configs]
+    workers = max_workers or os.cpu_count() or 1
+
+    if workers == 1 or len(payload) <= 1:
+        return rank_results([_evaluate(prices, config, initial_capital) for config in payload], sort_by)
+
+    size = chunk_size or max(1, len(payload) // (workers * 4))
+    shm = shared_memory.SharedMemory(create=True, size=max(1, prices.nbytes))
+    try:
+        shared = np.ndarray(prices.shape, dtype=prices.dtype, buffer=shm.buf)
+        shared[:] = prices
+        rows: List[Dict[str, Any]] = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shm.name, prices.shape, prices.dtype.str),
+        ) as executor:
+            chunks = list(_chunks(payload, size))
+            for chunk_rows in executor.map(_run_chunk, chunks, itertools.repeat(initial_capital, len(chunks))):
+                rows.extend(chunk_rows)
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return rank_results(rows, sort_by)
@@ -0,0 +1,272 @@
+"""주문 추적 모듈
+
+미체결 주문을 주문번호로 관리하고, 주기마다 한 번의 체결 조회로 모든 주문의 체결을 맞춘다.
+새 체결분은 체결 이벤트로 전달하며, 마감 시각까지 체결되지 않은 주문은 취소하거나 가격을 정정한다.
+취소한 주문은 추적을 끝내기 전에 체결을 한 번 더 조회해 취소 직전 체결분을 놓치지 않는다.
+정정한 주문도 reprice_timeout 안에 체결되지 않으면 취소한다.
+브로커에서 더 이상 접수 중이 아닌 주문(취소, 만료, 거부)은 체결분만 반영하고 추적을 끝낸다.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from .kis import Execution, KisAPI
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_ACTIONS = ("cancel", "reprice")
+CLOSE_CONDITIONS = ("LOC", "MOC")  # 장 마감에 체결되는 주문 (마감 시각 필수)
+OPEN_STATUSES = ("PENDING", "PARTIAL")
+
+# 주문부터 첫 체결까지 걸린 시간 (LOC/MOC는 장 마감까지 기다리므로 버킷을 길게 잡는다)
+FILL_SECONDS = REGISTRY.histogram("order_fill_seconds", "Order submit to first fill in seconds", ("side",),
+                                  buckets=(1, 5, 15, 60, 300, 900, 3600, 4 * 3600, 8 * 3600, 86400))
+
+
+@dataclass(slots=True)
+class TrackedOrder:
+    """추적 중인 주문 (models.OrderTracking과 같은 필드)"""
+    order_number: str  # 주문번호
+    symbol: str        # 종목코드
+    type: str          # 매수/매도 (BUY/SELL)
+    price: float       # 주문가격
+    qty: int           # 주문수량
+    executed_qty: int  # 체결수량
+    condition: str     # 주문조건
+    time: datetime     # 주문시각
+    deadline: Optional[datetime] = None  # 마감 시각 (미체결 시 취소/정정)
+    status: str = "PENDING"
+    fill_amount: float = 0.0  # 누적 체결 금액
+    repriced: bool = False  # 마감 시각에 가격을 정정했는지 (다음 마감에는 취소)
+    on_fill: Optional[Callable[["FillEvent"], None]] = field(default=None, repr=False)
+
+    @property
+    def pending_qty(self) -> int:
+        """미체결 수량"""
+        return self.qty - self.executed_qty
+
+    @property
+    def is_complete(self) -> bool:
+        """체결 완료 여부"""
+        return self.executed_qty == self.qty
+
+    def to_dict(self) -> Dict:
+        """저장용 딕셔너리"""
+        return {
+            "order_number": self.order_number,
+            "symbol": self.symbol,
+            "type": self.type,
+            "price": self.price,
+            "qty": self.qty,
+            "executed_qty": self.executed_qty,
+            "condition": self.condition,
+            "time": self.time,
+            "status": self.status,
+        }
+
+
+@dataclass(slots=True)
+class FillEvent:
+    """체결 이벤트 (이번 조회에서 새로 체결된 분량)"""
+    order: TrackedOrder
+    quantity: int
+    price: float
+    first_fill: bool  # 주문의 첫 체결 여부
+
+
+class OrderTracker:
+    """주문 추적기"""
+
+    def __init__(self, api: KisAPI, interval: float = 1.0, deadline_action: str = "cancel",
+                 reprice: Optional[Callable[[TrackedOrder], Awaitable[float]]] = None,
+                 on_change: Optional[Callable[[TrackedOrder], None]] = None, reprice_timeout: float = 300.0):
+        """초기화 (reprice: 정정 가격 계산 함수, on_change: 주문 상태 변경 콜백,
+        reprice_timeout: 정정한 주문을 취소하기까지 기다릴 시간, 초)"""
+        if deadline_action not in DEADLINE_ACTIONS:
+            raise ValueError(f"Unknown deadline action: {deadline_action}")
+        self.api = api
+        self.interval = interval
+        self.deadline_action = deadline_action
+        self.reprice = reprice or self._current_price
+        self.on_change = on_change
+        self.reprice_timeout = timedelta(seconds=reprice_timeout)
+        self.open_orders: Dict[str, TrackedOrder] = {}
+        self.reconciles = 0
+        self.fills = 0
+
+    async def _current_price(self, order: TrackedOrder) -> float:
+        """기본 정정 가격 (현재가)"""
+        return await self.api.get_current_price(order.symbol)
+
+    def has_open(self, symbol: Optional[str] = None) -> bool:
+        """미체결 주문 여부"""
+        if symbol is None:
+            return bool(self.open_orders)
+        return any(order.symbol == symbol for order in self.open_orders.values())
+
+    def _changed(self, order: TrackedOrder):
+        """주문 상태 변경 알림"""
+        if self.on_change:
+            self.on_change(order)
+
+    async def submit(self, side: str, symbol: str, quantity: int, price: float, condition: str = "LIMIT",
+                     deadline: Optional[datetime] = None,
+                     on_fill: Optional[Callable[[FillEvent], None]] = None) -> Optional[TrackedOrder]:
+        """주문 전송 후 추적 시작 (거부되면 None)"""
+        if condition in CLOSE_CONDITIONS and deadline is None:
+            raise ValueError(f"{condition} orders require a deadline")
+        order_number = await self.api.place_order(side, symbol, quantity, price, condition)
+        if order_number is None:
+            return None
+        order = TrackedOrder(
+            order_number=order_number,
+            symbol=symbol,
+            type=side,
+            price=price,
+            qty=quantity,
+            executed_qty=0,
+            condition=condition,
+            time=datetime.now(),
+            deadline=deadline,
+            on_fill=on_fill,
+        )
+        self.open_orders[order_number] = order
+        self._changed(order)
+        logger.info(f"Order {order_number} submitted: {side} {quantity} {symbol} @ {price} ({condition})")
+        return order
+
+    def restore(self, rows: Iterable[Dict]) -> int:
+        """저장된 미체결 주문 복원 (재시작 후 계속 추적, 복원한 주문 수 반환)"""
+        restored = 0
+        for row in rows:
+            if row["status"] not in OPEN_STATUSES or row["order_number"] in self.open_orders:
+                continue
+            order_time = row["time"]
+            self.open_orders[row["order_number"]] = TrackedOrder(
+                order_number=row["order_number"],
+                symbol=row["symbol"],
+                type=row["type"],
+                price=row["price"],
+                qty=row["qty"],
+                executed_qty=row["executed_qty"],
+                condition=row["condition"],
+                time=datetime.fromisoformat(order_time) if isinstance(order_time, str) else order_time,
+                status=row["status"],
+                fill_amount=row["price"] * row["executed_qty"],
+            )
+            restored += 1
+        if restored:
+            logger.info(f"Restored {restored} open orders")
+        return restored
+
+    def attach(self, symbol: str, on_fill: Optional[Callable[[FillEvent], None]]):
+        """종목의 미체결 주문 체결 콜백 교체 (봇을 다시 만들었을 때)"""
+        for order in self.open_orders.values():
+            if order.symbol == symbol:
+                order.on_fill = on_fill
+
+    async def reconcile(self, now: Optional[datetime] = None) -> List[FillEvent]:
+        """체결 조회 한 번으로 모든 미체결 주문 갱신 후 마감 처리"""
+        if not self.open_orders:
+            return []
+        # 복원된 이전 날짜 주문도 조회되도록 가장 오래된 주문일부터 조회
+        start = min(order.time for order in self.open_orders.values()).date()
+        executions = await self.api.order_executions(start)
+        self.reconciles += 1
+
+        events = []
+        for order in list(self.open_orders.values()):
+            execution = Execution(*executions.get(order.order_number, (order.executed_qty, 0.0)))
+            event = self._apply_execution(order, execution)
+            if event:
+                events.append(event)
+            if order.is_complete:
+                del self.open_orders[order.order_number]
+            elif not execution.open:
+                # 취소/만료/거부된 주문: 남은 수량은 더 체결되지 않는다
+                order.status = "EXPIRED"
+                del self.open_orders[order.order_number]
+                logger.info(f"Order {order.order_number} closed by broker ({order.pending_qty} unfilled)")
+                self._changed(order)
+
+        events.extend(await self._handle_deadlines(now or datetime.now()))
+        return events
+
+    def _apply_execution(self, order: TrackedOrder, execution: Execution) -> Optional[FillEvent]:
+        """조회한 누적 체결에서 새 체결분을 반영하고 체결 이벤트 전달 (새 체결이 없으면 None)"""
+        filled, average = execution.filled, execution.price
+        new_qty = min(filled, order.qty) - order.executed_qty
+        if new_qty <= 0:
+            return None
+        # 평균 체결가로 누적 금액을 맞추고 이번 체결분의 가격을 역산
+        total_amount = average * (order.executed_qty + new_qty) if average else \
+            order.fill_amount + order.price * new_qty
+        fill_price = (total_amount - order.fill_amount) / new_qty
+        event = FillEvent(order, new_qty, fill_price, first_fill=order.executed_qty == 0)
+        if event.first_fill:
+            FILL_SECONDS.labels(order.type).observe((datetime.now() - order.time).total_seconds())
+        order.executed_qty += new_qty
+        order.fill_amount = total_amount
+        order.status = "FILLED" if order.is_complete else "PARTIAL"
+        self.fills += 1
+        if order.on_fill:
+            order.on_fill(event)
+        self._changed(order)
+        return event
+
+    async def _handle_deadlines(self, now: datetime) -> List[FillEvent]:
+        """마감 시각이 지난 미체결 주문 취소 또는 정정 (취소 직전 체결분의 체결 이벤트 반환)"""
+        events = []
+        for order in list(self.open_orders.values()):
+            if order.deadline is None or now < order.deadline:
+                continue
+            if self.deadline_action == "cancel" or order.repriced:
+                if await self.api.cancel_order(order.order_number, order.symbol, order.pending_qty):
+                    event = await self._final_fills(order)
+                    if event:
+                        events.append(event)
+                    del self.open_orders[order.order_number]
+                    if not order.is_complete:
+                        order.status = "CANCELLED"
+                        logger.info(f"Order {order.order_number} cancelled at deadline "
+                                    f"({order.pending_qty} unfilled)")
+                        self._changed(order)
+            else:
+                price = await self.reprice(order)
+                if await self.api.modify_order(order.order_number, order.symbol, order.pending_qty, price):
+                    logger.info(f"Order {order.order_number} repriced {order.price} -> {price}")
+                    order.price = price
+                    order.repriced = True
+                    # 정정 후에도 체결되지 않으면 다음 마감에 취소
+                    order.deadline = now + self.reprice_timeout
+                    self._changed(order)
+        return events
+
+    async def _final_fills(self, order: TrackedOrder) -> Optional[FillEvent]:
+        """취소한 주문의 체결을 한 번 더 조회해 마지막 조회 이후 체결분 반영"""
+        try:
+            executions = await self.api.order_executions(order.time.date())
+        except Exception as e:
+            logger.error(f"Failed to check executions of cancelled order {order.order_number}: {e}")
+            return None
+        execution = executions.get(order.order_number)
+        return self._apply_execution(order, Execution(*execution)) if execution else None
+
+    async def run(self):
+        """주기적 체결 조회 루프"""
+        try:
+            while True:
+                try:
+                    await self.reconcile()
+                except Exception as e:
+                    logger.error(f"Failed to reconcile orders: {e}")
+                await asyncio.sleep(self.interval)
+        except asyncio.CancelledError:
+            logger.info("Order tracker cancelled")
+
+    def metrics(self) -> Dict[str, int]:
+        """추적 지표"""
+        return {"open_orders": len(self.open_orders), "reconciles": self.reconciles, "fills": self.fills}
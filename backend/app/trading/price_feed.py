@@ -0,0 +1,186 @@
+"""시세 피드 모듈
+
+한국투자증권 실시간 체결가 웹소켓을 구독해 체결이 들어올 때마다 시세를 전달한다.
+스트림이 끊기면 재연결을 기다리는 동안 KisAPI 폴링으로 대체한다.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+import aiohttp
+
+from .kis import KisAPI
+
+logger = logging.getLogger(__name__)
+
+TR_REALTIME_PRICE = "HDFSCNT0"  # 해외주식 실시간 체결가
+PRICE_FIELDS = 26               # 체결 레코드 한 건의 필드 수
+SYMBOL_FIELD = 1                # SYMB
+LAST_FIELD = 11                 # LAST
+
+RECONNECT_MIN = 1.0    # 재연결 최소 대기 (초)
+RECONNECT_MAX = 60.0   # 재연결 최대 대기 (초)
+
+PriceHandler = Callable[[str, float, float], None]  # (종목, 가격, 수신 시각)
+
+
+class LatencyStats:
+    """지연 시간 통계"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, seconds: float):
+        """측정값 추가"""
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self) -> Dict[str, float]:
+        """통계 딕셔너리 (밀리초)"""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "max_ms": self.max * 1000,
+            "last_ms": self.last * 1000,
+        }
+
+
+def parse_realtime_prices(message: str) -> List[Tuple[str, float]]:
+    """실시간 체결가 메시지에서 (종목, 현재가) 목록 추출"""
+    parts = message.split("|", 3)
+    if len(parts) < 4 or parts[1] != TR_REALTIME_PRICE:
+        return []
+    fields = parts[3].split("^")
+    count = int(parts[2])
+    size = len(fields) // count if count else PRICE_FIELDS
+    prices = []
+    for start in range(0, size * count, size):
+        record = fields[start:start + size]
+        if len(record) > LAST_FIELD:
+            prices.append((record[SYMBOL_FIELD], float(record[LAST_FIELD])))
+    return prices
+
+
+class PriceFeed:
+    """스트리밍 우선, 폴링 대체 시세 피드"""
+
+    def __init__(self, api: KisAPI, on_price: PriceHandler, streaming: bool = False):
+        """초기화"""
+        self.api = api
+        self.on_price = on_price
+        self.streaming = streaming
+        self._symbols: Set[str] = set()
+        self._reconnect_delay = RECONNECT_MIN
+        self._next_stream_attempt = 0.0
+        self.mode = "polling"
+        self.events = 0
+        self.reconnects = 0
+
+    def set_symbols(self, symbols: Iterable[str]):
+        """구독 종목 변경 (스트림 연결 중이면 다음 수신 주기에 반영)"""
+        self._symbols = set(symbols)
+
+    def _tr_key(self, symbol: str) -> str:
+        """실시간 구독 키 (D + 거래소 + 종목)"""
+        return f"D{self.api.exchange(symbol)}{symbol}"
+
+    def _publish(self, symbol: str, price: float):
+        """시세 전달"""
+        self.events += 1
+        self.on_price(symbol, price, time.monotonic())
+
+    async def _poll_once(self):
+        """폴링으로 전체 종목 시세 조회"""
+        if not self._symbols:
+            return
+        try:
+            prices = await self.api.get_current_prices(sorted(self._symbols))
+        except Exception as e:
+            logger.error(f"Failed to fetch prices: {e}")
+            return
+        for symbol, price in prices.items():
+            self._publish(symbol, price)
+
+    async def _send_subscription(self, ws: aiohttp.ClientWebSocketResponse, approval_key: str,
+                                 symbol: str, subscribe: bool):
+        """구독/해지 요청 전송"""
+        await ws.send_str(json.dumps({
+            "header": {
+                "approval_key": approval_key,
+                "custtype": "P",
+                "tr_type": "1" if subscribe else "2",
+                "content-type": "utf-8",
+            },
+            "body": {"input": {"tr_id": TR_REALTIME_PRICE, "tr_key": self._tr_key(symbol)}},
+        }))
+
+    async def _stream(self):
+        """웹소켓 스트림 수신 (연결이 끊기면 반환)"""
+        approval_key = await self.api.client.approval_key()
+        ws = await self.api.client.ws_connect()
+        subscribed: Set[str] = set()
+        try:
+            self.mode = "streaming"
+            logger.info("Price stream connected")
+            while True:
+                # 구독 종목 변경 반영
+                for symbol in self._symbols - subscribed:
+                    await self._send_subscription(ws, approval_key, symbol, True)
+                for symbol in subscribed - self._symbols:
+                    await self._send_subscription(ws, approval_key, symbol, False)
+                subscribed = set(self._symbols)
+
+                try:
+                    msg = await ws.receive(timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    if msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED,
+                                    aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.ERROR):
+                        return
+                    continue
+
+                data = msg.data
+                if data[:1] in ("0", "1"):
+                    self._reconnect_delay = RECONNECT_MIN
+                    for symbol, price in parse_realtime_prices(data):
+                        if symbol in self._symbols:
+                            self._publish(symbol, price)
+                elif '"PINGPONG"' in data:
+                    await ws.send_str(data)
+        finally:
+            self.mode = "polling"
+            await ws.close()
+
+    async def run(self, interval: Callable[[], float]):
+        """피드 실행 (스트림 연결 실패/종료 시 폴링으로 대체하고 재연결 시도)"""
+        try:
+            while True:
+                if self.streaming and self._symbols and time.monotonic() >= self._next_stream_attempt:
+                    try:
+                        await self._stream()
+                        logger.warning("Price stream closed, falling back to polling")
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        logger.error(f"Price stream failed, falling back to polling: {e}")
+                    self.reconnects += 1
+                    self._next_stream_attempt = time.monotonic() + self._reconnect_delay
+                    self._reconnect_delay = min(self._reconnect_delay * 2, RECONNECT_MAX)
+
+                await self._poll_once()
+                await asyncio.sleep(interval())
+        except asyncio.CancelledError:
+            logger.info("Price feed cancelled")
+
+    def metrics(self) -> Dict[str, float]:
+        """피드 지표"""
+        return {"mode": self.mode, "events": self.events, "reconnects": self.reconnects}
@@ -0,0 +1,130 @@
+"""브로커 API 호출 한도 관리 모듈
+
+토큰 버킷으로 초당 호출 수를 제한하고, 토큰을 기다리는 호출은 우선순위 순서로 처리한다.
+주문/취소는 시세보다, 시세는 잔고/리포트 조회보다 먼저 토큰을 받는다.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class Priority(IntEnum):
+    """호출 우선순위 (값이 작을수록 먼저 처리)"""
+    ORDER = 0   # 주문/취소
+    QUOTE = 1   # 시세 조회
+    QUERY = 2   # 잔고/리포트 조회
+
+
+class TokenBucket:
+    """토큰 버킷"""
+
+    def __init__(self, rate: float, capacity: float):
+        """초기화 (rate: 초당 충전 토큰 수, capacity: 최대 토큰 수)"""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        """경과 시간만큼 토큰 충전"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, reserve: float = 0) -> bool:
+        """토큰 1개 획득 시도 (reserve개는 남겨둔다)"""
+        self._refill()
+        if self.tokens >= 1 + reserve:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self, reserve: float = 0) -> float:
+        """토큰 1개를 얻을 때까지 남은 시간 (초)"""
+        self._refill()
+        return max(0.0, (1 + reserve - self.tokens) / self.rate)
+
+
+class BrokerScheduler:
+    """우선순위 기반 브로커 호출 스케줄러
+
+    주문용으로 order_reserve개의 토큰을 남겨두어, 시세/조회 요청이 몰려도 주문은 바로 나간다.
+    """
+
+    def __init__(self, rate: float, burst: float, order_reserve: float = 1):
+        """초기화"""
+        self.bucket = TokenBucket(rate, burst)
+        self._order_reserve = order_reserve
+        self.order_reserve = min(order_reserve, max(0.0, burst - 1))
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self.calls: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self.waited: Dict[Priority, int] = {priority: 0 for priority in Priority}
+
+    def set_rate(self, rate: float, burst: float):
+        """호출 한도 변경 (남은 토큰은 새 최대치까지만 유지)"""
+        self.bucket._refill()
+        self.bucket.rate = rate
+        self.bucket.capacity = burst
+        self.bucket.tokens = min(self.bucket.tokens, burst)
+        self.order_reserve = min(self._order_reserve, max(0.0, burst - 1))
+        self._wakeup.set()
+
+    def _reserve(self, priority: Priority) -> float:
+        """우선순위별로 남겨야 하는 토큰 수"""
+        return 0 if priority == Priority.ORDER else self.order_reserve
+
+    async def acquire(self, priority: Priority = Priority.QUERY):
+        """호출 토큰 획득"""
+        self.calls[priority] += 1
+        # 같거나 높은 우선순위의 대기자가 없으면 바로 토큰 획득 시도
+        if (not self._waiters or self._waiters[0][0] > priority) \
+                and self.bucket.try_acquire(self._reserve(priority)):
+            return
+
+        self.waited[priority] += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        else:
+            # 더 높은 우선순위가 들어왔을 수 있으니 대기 시간을 다시 계산
+            self._wakeup.set()
+        await future
+
+    async def _dispatch(self):
+        """대기 중인 호출에 우선순위 순서로 토큰 배분"""
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                # 취소된 대기자
+                heapq.heappop(self._waiters)
+                continue
+            if self.bucket.try_acquire(self._reserve(priority)):
+                heapq.heappop(self._waiters)
+                future.set_result(None)
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.bucket.wait_time(self._reserve(priority)))
+            except asyncio.TimeoutError:
+                pass
+
+    async def call(self, priority: Priority, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """토큰을 받은 뒤 브로커 호출 실행"""
+        await self.acquire(priority)
+        return await func(*args, **kwargs)
+
+    def metrics(self) -> Dict[str, float]:
+        """스케줄러 지표"""
+        data = {"tokens": self.bucket.tokens, "queued": len(self._waiters)}
+        for priority in Priority:
+            name = priority.name.lower()
+            data[f"{name}_calls"] = self.calls[priority]
+            data[f"{name}_waited"] = self.waited[priority]
+        return data
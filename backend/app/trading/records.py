@@ -0,0 +1,237 @@
+"""거래 기록 타입 모듈
+
+체결 한 건은 __slots__ 기반 불변 레코드(Trade)로, 대량의 체결은 NumPy 구조화 배열 하나에
+열 단위로 담는 TradeBatch로 보관한다. 종목은 코드 번호로, 매수/매도는 부호(+1/-1)로 저장하고
+체결 금액은 가격 × 수량으로 계산하므로 한 건에 TRADE_DTYPE.itemsize(29바이트)만 쓴다.
+to_frame()은 숫자/시각 열을 복사 없이 DataFrame으로 넘기고, 손익 계산은 반복문 없이 배열 연산으로 한다.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+BUY, SELL = 1, -1  # side 열 값
+SIDES = {"BUY": BUY, "SELL": SELL}
+
+TRADE_DTYPE = np.dtype([
+    ("timestamp", "datetime64[us]"),
+    ("symbol", "u2"),  # TradeBatch.symbols의 인덱스
+    ("side", "i1"),
+    ("price", "f8"),
+    ("quantity", "i4"),
+    ("division", "i2"),
+    ("cycle_number", "i4"),
+])
+
+
+@dataclass(frozen=True, slots=True)
+class Trade:
+    """체결 레코드 (BotManager.add_trade_history에 넘기는 딕셔너리와 같은 필드)"""
+    timestamp: datetime
+    symbol: str
+    action: str  # BUY/SELL
+    price: float
+    quantity: int
+    division: int = 0
+    total_amount: float = 0.0
+    cycle_number: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Trade":
+        """거래 딕셔너리에서 생성 (timestamp는 ISO 문자열도 허용)"""
+        timestamp = data["timestamp"]
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        return cls(timestamp, data["symbol"], data["action"], float(data["price"]), int(data["quantity"]),
+                   int(data.get("division", 0)), float(data.get("total_amount", data["price"] * data["quantity"])),
+                   int(data.get("cycle_number", 0)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """거래 딕셔너리"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class TradeBatch:
+    """구조화 배열 기반 체결 묶음 (추가 시 용량을 두 배씩 늘린다)"""
+
+    def __init__(self, capacity: int = 1024, symbols: Sequence[str] = ()):
+        self._data = np.empty(max(capacity, 1), dtype=TRADE_DTYPE)
+        self._size = 0
+        self.symbols: List[str] = list(symbols)  # 종목 코드 번호 -> 종목
+        self._codes: Dict[str, int] = {symbol: code for code, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Union[Trade, Dict[str, Any]]]) -> "TradeBatch":
+        """Trade 또는 거래 딕셔너리 목록에서 생성"""
+        records = list(records)
+        batch = cls(len(records))
+        batch.extend(records)
+        return batch
+
+    @classmethod
+    def from_array(cls, array: np.ndarray, symbols: Sequence[str]) -> "TradeBatch":
+        """TRADE_DTYPE 배열과 종목 목록에서 생성 (배열은 복사하지 않는다)"""
+        if array.dtype != TRADE_DTYPE:
+            raise ValueError(f"Expected {TRADE_DTYPE}, got {array.dtype}")
+        batch = cls(1, symbols)
+        batch._data = array
+        batch._size = len(array)
+        return batch
+
+    def _reserve(self, size: int):
+        """용량 확보"""
+        if size > len(self._data):
+            grown = np.empty(max(size, len(self._data) * 2), dtype=TRADE_DTYPE)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+
+    def _code(self, symbol: str) -> int:
+        """종목 코드 번호 (처음 보는 종목이면 추가)"""
+        code = self._codes.get(symbol)
+        if code is None:
+            code = self._codes[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return code
+
+    def _row(self, record: Union[Trade, Dict[str, Any]]) -> tuple:
+        """배열 한 행"""
+        if isinstance(record, dict):
+            record = Trade.from_dict(record)
+        return (np.datetime64(record.timestamp, "us"), self._code(record.symbol), SIDES[record.action],
+                record.price, record.quantity, record.division, record.cycle_number)
+
+    def append(self, record: Union[Trade, Dict[str, Any]]):
+        """체결 추가"""
+        self._reserve(self._size + 1)
+        self._data[self._size] = self._row(record)
+        self._size += 1
+
+    def extend(self, records: Iterable[Union[Trade, Dict[str, Any]]]):
+        """여러 체결 추가"""
+        rows = [self._row(record) for record in records]
+        self._reserve(self._size + len(rows))
+        self._data[self._size:self._size + len(rows)] = rows
+        self._size += len(rows)
+
+    @property
+    def array(self) -> np.ndarray:
+        """채워진 부분의 구조화 배열 (뷰)"""
+        return self._data[:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        """체결 데이터가 차지하는 바이트 수"""
+        return self._size * TRADE_DTYPE.itemsize
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Trade:
+        row = self.array[index]
+        price, quantity = float(row["price"]), int(row["quantity"])
+        return Trade(row["timestamp"].astype(datetime), self.symbols[row["symbol"]],
+                     "BUY" if row["side"] == BUY else "SELL", price, quantity, int(row["division"]),
+                     price * quantity, int(row["cycle_number"]))
+
+    def __iter__(self) -> Iterator[Trade]:
+        for index in range(self._size):
+            yield self[index]
+
+    def total_amount(self) -> np.ndarray:
+        """체결 금액"""
+        return self.array["price"] * self.array["quantity"]
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame 변환 (숫자/시각 열은 배열을 그대로 공유, 종목은 범주형, 매수/매도는 문자열)"""
+        array = self.array
+        columns = {name: array[name] for name in TRADE_DTYPE.names}
+        columns["symbol"] = pd.Categorical.from_codes(array["symbol"].astype(np.int32), categories=self.symbols) \
+            if self.symbols else pd.Categorical([])
+        columns["action"] = np.where(array["side"] == BUY, "BUY", "SELL")
+        columns["total_amount"] = self.total_amount()
+        return pd.DataFrame(columns, copy=False)
+
+    def signed_quantity(self) -> np.ndarray:
+        """매수는 +, 매도는 - 수량"""
+        array = self.array
+        return array["side"].astype(np.int64) * array["quantity"]
+
+    def positions(self) -> np.ndarray:
+        """체결 직후 종목별 보유 수량"""
+        order, starts = self._groups(self.array["symbol"])
+        return self._unsort(order, self._group_cumsum(self.signed_quantity()[order], starts))
+
+    def realized_pnl(self) -> np.ndarray:
+        """체결별 실현 손익 (이동평균 단가 기준, 매수는 0)
+
+        봇과 같은 규칙으로 매도 수량만큼 원가를 비율대로 줄이므로 원가는
+        cost_k = a_k * cost_(k-1) + b_k 점화식(매수: a=1, b=금액 / 매도: a=1-매도수량/보유수량, b=0)을
+        따른다. 종목이 바뀌거나 보유 수량이 0이 된 뒤마다 구간을 나눠 누적곱과 누적합으로 한 번에 푼다.
+        """
+        array = self.array
+        if not len(array):
+            return np.zeros(0)
+        order, starts = self._groups(array["symbol"])
+        sell = array["side"][order] == SELL
+        quantity = array["quantity"][order].astype(np.float64)
+        amount = array["price"][order] * quantity
+
+        signed = np.where(sell, -quantity, quantity)
+        position_after = self._group_cumsum(signed, starts)
+        position_before = position_after - signed
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(sell & (position_before > 0), 1 - quantity / position_before, 1.0)
+        ratio = np.clip(ratio, 0.0, 1.0)
+        # 전량 매도 다음 체결부터 새 구간 (전량 매도의 ratio 0은 누적곱에 1로 넣는다)
+        segments = np.union1d(starts, np.flatnonzero(position_after[:-1] <= 0) + 1)
+        scale = np.exp(self._group_cumsum(np.log(np.where(ratio > 0, ratio, 1.0)), segments))
+        cost_after = scale * self._group_cumsum(np.where(sell, 0.0, amount) / scale, segments)
+        cost_before = np.concatenate(([0.0], cost_after[:-1]))
+        cost_before[segments] = 0.0
+
+        realized = np.where(sell, amount - cost_before * (1 - ratio), 0.0)
+        return self._unsort(order, realized)
+
+    def cycle_summary(self) -> pd.DataFrame:
+        """종목/사이클별 매수·매도 금액, 남은 수량, 실현 손익"""
+        array, amount = self.array, self.total_amount()
+        frame = pd.DataFrame({
+            "symbol": np.array(self.symbols, dtype=object)[array["symbol"]] if self.symbols else [],
+            "cycle_number": array["cycle_number"],
+            "bought": np.where(array["side"] == BUY, amount, 0.0),
+            "sold": np.where(array["side"] == SELL, amount, 0.0),
+            "quantity": self.signed_quantity(),
+            "realized_pnl": self.realized_pnl(),
+        })
+        return frame.groupby(["symbol", "cycle_number"]).sum()
+
+    @staticmethod
+    def _groups(*keys: np.ndarray):
+        """키 순서로 안정 정렬한 인덱스와 각 구간 시작 위치"""
+        order = np.lexsort(keys[::-1])
+        sorted_keys = [key[order] for key in keys]
+        boundary = np.zeros(len(order), dtype=bool)
+        if len(order):
+            boundary[0] = True
+            for key in sorted_keys:
+                boundary[1:] |= key[1:] != key[:-1]
+        return order, np.flatnonzero(boundary)
+
+    @staticmethod
+    def _group_cumsum(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        """구간별 누적합"""
+        total = np.cumsum(values)
+        if not len(total):
+            return total
+        offsets = np.concatenate(([0], total[starts[1:] - 1]))
+        return total - np.repeat(offsets, np.diff(np.append(starts, len(total))))
+
+    @staticmethod
+    def _unsort(order: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """정렬 전 순서로 되돌리기"""
+        result = np.empty_like(values)
+        result[order] = values
+        return result
+
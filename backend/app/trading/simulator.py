@@ -0,0 +1,330 @@
+"""시뮬레이션 거래소 및 모의 브로커 모듈
+
+과거 또는 합성 일봉 경로를 가상 시계에 맞춰 재생하는 거래소(SimulatedExchange)와
+KisAPI와 같은 인터페이스로 그 거래소에 주문하는 모의 브로커(PaperBroker)를 제공한다.
+네트워크 없이 봇과 BotManager 전체를 수년치 가상 시간 동안 돌려 볼 수 있다.
+
+가상 시계는 speed배 빠르게 흐르고, fast_forward초보다 긴 sleep(장 마감 후, 야간, 주말)은
+기다리지 않고 건너뛴다. 주문 구간은 speed배속으로 흐르므로 시세 피드와 체결 조회가 그대로 동작한다.
+
+장중 시세는 일봉의 시가 → 저가/고가 → 종가를 세션 시간에 선형 보간한다.
+
+체결 규칙:
+    - 지정가(LIMIT): 조회 시점 시세가 지정가에 닿으면 그 시세로 체결, 마감까지 남으면 LOC처럼 종가 판단
+    - LOC: 종가가 지정가 이하(매수)/이상(매도)이면 종가에 체결, MOC: 종가에 체결
+    - 조회 한 번(장 마감 체결 포함)에 주문당 liquidity주까지만 체결되어 부분 체결이 생긴다
+    - 장 마감 시 남은 당일 주문은 만료된다 (체결분은 유지)
+    - 장 시간 외 주문, 수량 0 이하, 예수금/보유 수량 부족, reject_rate 확률의 임의 거부
+"""
+import asyncio
+import bisect
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import BotConfig
+from .kis import CANCEL_CODE, Execution, KisAPI
+from .kis_client import KisClient
+from .market_calendar import ET, REGULAR_CLOSE, REGULAR_OPEN, MarketCalendar, Session
+from .rate_limit import Priority
+
+logger = logging.getLogger(__name__)
+
+CLOSE_ORDERS = ("LOC", "MOC")
+
+
+class SimClock:
+    """가상 시계
+
+    실제 시간보다 speed배 빠르게 흐르며, fast_forward초(가상)보다 긴 sleep은 바로 건너뛴다.
+    MarketScheduler의 clock/sleep으로 넘길 수 있다.
+    """
+
+    def __init__(self, start: datetime, speed: float = 1000.0, fast_forward: float = 900.0):
+        """초기화 (start: 시작 시각, 시간대 포함)"""
+        self.speed = speed
+        self.fast_forward = fast_forward
+        self._start = start
+        self._started_at = time.monotonic()
+        self._skipped = 0.0
+
+    def __call__(self) -> datetime:
+        """현재 가상 시각"""
+        elapsed = (time.monotonic() - self._started_at) * self.speed
+        return self._start + timedelta(seconds=elapsed + self._skipped)
+
+    async def sleep(self, seconds: float):
+        """가상 시간 seconds초 대기"""
+        if seconds > self.fast_forward:
+            self._skipped += seconds
+            await asyncio.sleep(0)
+        else:
+            await asyncio.sleep(max(seconds, 0) / self.speed)
+
+
+def synthetic_bars(start: date, days: int, price: float = 50.0, drift: float = 0.0,
+                   volatility: float = 0.03, seed: int = 0,
+                   calendar: Optional[MarketCalendar] = None) -> pd.DataFrame:
+    """합성 일봉 (거래일마다 기하 브라운 운동, 같은 seed면 같은 경로)"""
+    calendar = calendar or MarketCalendar()
+    sessions = list(itertools.islice(calendar.sessions_from(start), days))
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(drift - volatility ** 2 / 2, volatility, days)))
+    previous = np.concatenate(([price], close[:-1]))
+    open_ = previous * np.exp(rng.normal(0, volatility / 4, days))
+    wick = np.abs(rng.normal(0, volatility / 2, (2, days)))
+    return pd.DataFrame({
+        "open": open_,
+        "high": np.maximum(open_, close) * (1 + wick[0]),
+        "low": np.minimum(open_, close) * (1 - wick[1]),
+        "close": close,
+    }, index=pd.Index([session.day for session in sessions], name="date"))
+
+
+@dataclass(slots=True)
+class SimOrder:
+    """거래소 접수 주문"""
+    order_number: str
+    side: str
+    symbol: str
+    quantity: int
+    price: float
+    condition: str
+    session: Session
+    filled: int = 0
+    fill_amount: float = 0.0
+    open: bool = True
+
+    @property
+    def remaining(self) -> int:
+        """미체결 수량"""
+        return self.quantity - self.filled
+
+    def execution(self) -> Execution:
+        """체결 현황"""
+        return Execution(self.filled, self.fill_amount / self.filled if self.filled else 0.0, self.open)
+
+
+class SimulatedExchange:
+    """시뮬레이션 거래소 (종목별 일봉 재생, 예수금/보유 수량 관리)"""
+
+    def __init__(self, bars: Dict[str, pd.DataFrame], clock: Callable[[], datetime],
+                 cash: float = 100_000.0, liquidity: Optional[int] = None, reject_rate: float = 0.0,
+                 seed: int = 0, calendar: Optional[MarketCalendar] = None):
+        """초기화
+
+        Args:
+            bars: 종목 -> open/high/low/close 컬럼과 날짜 인덱스를 가진 일봉
+            clock: 현재 시각 (SimClock)
+            cash: 초기 예수금
+            liquidity: 조회 한 번에 주문당 체결 가능한 최대 수량 (None이면 제한 없음)
+            reject_rate: 정상 주문을 임의로 거부할 확률
+        """
+        self.clock = clock
+        self.cash = cash
+        self.liquidity = liquidity
+        self.reject_rate = reject_rate
+        self.calendar = calendar or MarketCalendar()
+        self._rng = np.random.default_rng(seed)
+        self._days: Dict[str, List[date]] = {}
+        self._ohlc: Dict[str, np.ndarray] = {}
+        for symbol, frame in bars.items():
+            self._days[symbol] = [pd.Timestamp(day).date() for day in frame.index]
+            self._ohlc[symbol] = frame[["open", "high", "low", "close"]].to_numpy(dtype=np.float64)
+        self.positions: Dict[str, int] = {symbol: 0 for symbol in bars}
+        self.orders: Dict[str, SimOrder] = {}
+        self._open: Dict[str, SimOrder] = {}
+        self._order_numbers = itertools.count(1)
+        self.fills: List[Tuple[datetime, str, str, str, int, float]] = []  # (시각, 주문번호, 종목, 매수/매도, 수량, 가격)
+        self.rejects = 0
+
+    def _bar(self, symbol: str, day: date) -> Tuple[int, bool]:
+        """day 이전 마지막 일봉 인덱스와 day 당일 일봉 여부"""
+        days = self._days[symbol]
+        i = bisect.bisect_right(days, day) - 1
+        return i, i >= 0 and days[i] == day
+
+    def _session(self, day: date) -> Optional[Session]:
+        """세션 (달력에 없어도 일봉이 있으면 정규장 시간)"""
+        session = self.calendar.session(day)
+        if session is None and any(self._bar(symbol, day)[1] for symbol in self._days):
+            session = Session(day, datetime.combine(day, REGULAR_OPEN, ET), datetime.combine(day, REGULAR_CLOSE, ET))
+        return session
+
+    def _price_at(self, symbol: str, now: datetime) -> float:
+        """now 시각의 시세 (장중 보간, 장 전에는 전일 종가, 장 후에는 종가)"""
+        if symbol not in self._days:
+            raise KeyError(f"No price path for {symbol}")
+        day = now.astimezone(ET).date()
+        i, today = self._bar(symbol, day)
+        if i < 0:
+            return float(self._ohlc[symbol][0, 0])
+        open_, high, low, close = self._ohlc[symbol][i]
+        if not today:
+            return float(close)
+        session = self._session(day)
+        if now < session.open:
+            return float(self._ohlc[symbol][i - 1, 3] if i > 0 else open_)
+        fraction = min((now - session.open) / (session.close - session.open), 1.0)
+        # 양봉은 저가를 먼저, 음봉은 고가를 먼저 지난다
+        path = (open_, low, high, close) if close >= open_ else (open_, high, low, close)
+        return float(np.interp(fraction, (0, 1 / 3, 2 / 3, 1), path))
+
+    def price(self, symbol: str) -> float:
+        """현재가"""
+        self.match()
+        return self._price_at(symbol, self.clock())
+
+    def _reserved(self, side: str, symbol: Optional[str] = None) -> float:
+        """미체결 주문이 묶어 둔 금액(매수) 또는 수량(매도)"""
+        orders = [order for order in self._open.values() if order.side == side
+                  and (symbol is None or order.symbol == symbol)]
+        if side == "BUY":
+            return sum(order.remaining * (order.price or self._price_at(order.symbol, self.clock()))
+                       for order in orders)
+        return sum(order.remaining for order in orders)
+
+    def submit(self, side: str, symbol: str, quantity: int, price: float, condition: str = "LIMIT") -> Optional[str]:
+        """주문 접수 (거부되면 None)"""
+        self.match()
+        now = self.clock()
+        session = self._session(now.astimezone(ET).date())
+        reason = None
+        if symbol not in self._days:
+            reason = "unknown symbol"
+        elif session is None or not session.open <= now < session.close:
+            reason = "market closed"
+        elif quantity <= 0:
+            reason = "invalid quantity"
+        elif side == "BUY" and quantity * (price or self._price_at(symbol, now)) > self.cash - self._reserved("BUY"):
+            reason = "insufficient cash"
+        elif side == "SELL" and quantity > self.positions[symbol] - self._reserved("SELL", symbol):
+            reason = "insufficient position"
+        elif self.reject_rate and self._rng.random() < self.reject_rate:
+            reason = "random reject"
+        if reason is not None:
+            self.rejects += 1
+            logger.info(f"Simulated order rejected: {side} {quantity} {symbol} @ {price} ({reason})")
+            return None
+
+        order = SimOrder(f"S{next(self._order_numbers):09d}", side, symbol, quantity,
+                         0.0 if condition == "MOC" else price, condition, session)
+        self.orders[order.order_number] = order
+        self._open[order.order_number] = order
+        self.match()
+        return order.order_number
+
+    def _fill(self, order: SimOrder, price: float, when: datetime):
+        """체결 (liquidity 한도까지)"""
+        quantity = order.remaining if self.liquidity is None else min(order.remaining, self.liquidity)
+        if quantity <= 0:
+            return
+        order.filled += quantity
+        order.fill_amount += quantity * price
+        sign = 1 if order.side == "BUY" else -1
+        self.positions[order.symbol] += sign * quantity
+        self.cash -= sign * quantity * price
+        self.fills.append((when, order.order_number, order.symbol, order.side, quantity, price))
+        if order.remaining == 0:
+            self._close(order)
+
+    def _close(self, order: SimOrder):
+        """주문 종료 (체결 완료, 취소 또는 만료)"""
+        order.open = False
+        self._open.pop(order.order_number, None)
+
+    def match(self):
+        """현재 시각까지 체결 처리 (지난 장 마감 체결과 만료, 장중 지정가 체결)"""
+        now = self.clock()
+        for order in list(self._open.values()):
+            close_time = order.session.close
+            if now >= close_time:
+                close = self._price_at(order.symbol, close_time)
+                # LOC와 마감까지 남은 지정가 주문은 종가 조건을 만족하면 종가에 체결
+                if order.condition == "MOC" or (
+                        close <= order.price if order.side == "BUY" else close >= order.price):
+                    self._fill(order, close, close_time)
+                # 당일 주문은 장 마감에 만료
+                self._close(order)
+            elif order.condition not in CLOSE_ORDERS:
+                price = self._price_at(order.symbol, now)
+                if price <= order.price if order.side == "BUY" else price >= order.price:
+                    self._fill(order, price, now)
+
+    def cancel(self, order_number: str) -> bool:
+        """미체결 주문 취소"""
+        self.match()
+        order = self._open.get(order_number)
+        if order is None:
+            return False
+        self._close(order)
+        return True
+
+    def modify(self, order_number: str, price: float) -> bool:
+        """미체결 주문 가격 정정"""
+        self.match()
+        order = self._open.get(order_number)
+        if order is None or order.condition == "MOC":
+            return False
+        order.price = price
+        self.match()
+        return True
+
+    def executions(self) -> Dict[str, Execution]:
+        """주문별 체결 현황"""
+        self.match()
+        return {number: order.execution() for number, order in self.orders.items()}
+
+
+class PaperBroker(KisAPI):
+    """시뮬레이션 거래소에 주문하는 모의 브로커 (KisAPI와 같은 인터페이스)
+
+    시세 캐시, 묶음 조회, 호출 우선순위 제한은 KisAPI 그대로 사용하고
+    브로커 호출만 거래소로 대체한다.
+    """
+
+    def __init__(self, bot_config: BotConfig, quote_window: float = 0.005,
+                 client: Optional[KisClient] = None, *, market: SimulatedExchange):
+        """초기화 (market: 주문을 받을 시뮬레이션 거래소)"""
+        super().__init__(bot_config, quote_window, client)
+        self.market = market
+        self.test_mode = False
+
+    async def _fetch_price(self, symbol: str) -> float:
+        """단일 종목 시세 조회"""
+        return self.market.price(symbol)
+
+    async def buy_stock(self, symbol: str, quantity: int, price: float, condition: str = "LIMIT") -> bool:
+        """주식 매수"""
+        await self.scheduler.acquire(Priority.ORDER)
+        return self.market.submit("BUY", symbol, quantity, price, condition) is not None
+
+    async def sell_stock(self, symbol: str, quantity: int, price: float, condition: str = "LIMIT") -> bool:
+        """주식 매도"""
+        await self.scheduler.acquire(Priority.ORDER)
+        return self.market.submit("SELL", symbol, quantity, price, condition) is not None
+
+    async def place_order(self, side: str, symbol: str, quantity: int, price: float,
+                          condition: str = "LIMIT") -> Optional[str]:
+        """주문 후 주문번호 반환 (거부되면 None)"""
+        await self.scheduler.acquire(Priority.ORDER)
+        return self.market.submit(side, symbol, quantity, price, condition)
+
+    async def _modify_order(self, order_number: str, symbol: str, quantity: int,
+                            price: float, code: str) -> bool:
+        """주문 정정/취소"""
+        await self.scheduler.acquire(Priority.ORDER)
+        if code == CANCEL_CODE:
+            return self.market.cancel(order_number)
+        return self.market.modify(order_number, price)
+
+    async def order_executions(self, start: Optional[date] = None) -> Dict[str, Execution]:
+        """주문별 체결 현황 조회"""
+        await self.scheduler.acquire(Priority.QUERY)
+        return self.market.executions()
@@ -0,0 +1,173 @@
+"""매매 상태 저장소 모듈
+
+종목별 매매 상태(회차, 보유 수량, 평균단가, 투자금)를 스냅샷 파일과 변경 로그로 보관한다.
+변경은 메모리에 바로 반영하고, 로그 추가와 fsync는 전용 스레드가 순서대로 수행하므로
+매매 루프를 막지 않는다. 로그가 길어지면 임시 파일에 스냅샷을 쓰고 rename으로 교체한다.
+재시작 시 스냅샷을 읽고 로그만 재생하면 상태가 복원된다.
+"""
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "snapshot.json"
+LOG_FILE = "changes.log"
+
+
+class StateStore:
+    """스냅샷 + 변경 로그 기반 상태 저장소"""
+
+    def __init__(self, directory: str, compact_every: int = 1000):
+        """초기화 (스냅샷 로드 후 변경 로그 재생)"""
+        self.directory = directory
+        self.compact_every = compact_every
+        os.makedirs(directory, exist_ok=True)
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self._log_path = os.path.join(directory, LOG_FILE)
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._seq = 0
+        self._log_entries = 0
+        self.replayed = 0
+
+        self._recover()
+        self._log = open(self._log_path, "ab")
+        # 파일 기록은 전용 스레드 하나에서만 수행 (기록 순서 보장)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-store")
+        self._last_write: Optional[Future] = None
+
+    def _recover(self):
+        """스냅샷 로드 후 이후 변경만 재생"""
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, "r") as f:
+                snapshot = json.load(f)
+            self._seq = snapshot["seq"]
+            self._state = snapshot["state"]
+
+        if not os.path.exists(self._log_path):
+            return
+        valid = 0
+        with open(self._log_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # 기록 중 중단된 마지막 변경은 버린다
+                    break
+                entry = json.loads(line)
+                valid += len(line)
+                self._log_entries += 1
+                # 스냅샷 교체 후 로그를 비우기 전에 중단된 경우 이미 반영된 변경은 건너뛴다
+                if entry["seq"] <= self._seq:
+                    continue
+                self._apply(entry)
+                self.replayed += 1
+        if valid != os.path.getsize(self._log_path):
+            logger.warning("Truncating partial state change record")
+            with open(self._log_path, "r+b") as f:
+                f.truncate(valid)
+
+    def _apply(self, entry: Dict[str, Any]):
+        """변경 반영"""
+        self._seq = entry["seq"]
+        if entry.get("removed"):
+            self._state.pop(entry["key"], None)
+        else:
+            self._state.setdefault(entry["key"], {}).update(entry["changes"])
+
+    def _submit(self, fn: Callable, *args):
+        """파일 기록 예약 (이벤트 루프 밖에서는 기록이 끝날 때까지 대기)"""
+        future = self._executor.submit(fn, *args)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            future.result()
+            return
+        future.add_done_callback(self._check_write)
+        self._last_write = future
+
+    @staticmethod
+    def _check_write(future: Future):
+        """백그라운드 기록 오류 로그"""
+        if future.exception() is not None:
+            logger.error(f"Failed to write state store: {future.exception()}")
+
+    def _write_line(self, line: bytes):
+        """변경 로그 한 줄 기록 후 fsync"""
+        self._log.write(line)
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+    def _append(self, entry: Dict[str, Any]):
+        """변경 반영 후 로그 기록 예약"""
+        self._apply(entry)
+        self._submit(self._write_line, json.dumps(entry, ensure_ascii=False).encode() + b"\n")
+        self._log_entries += 1
+        if self._log_entries >= self.compact_every:
+            self.snapshot()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """상태 조회"""
+        state = self._state.get(key)
+        return dict(state) if state is not None else None
+
+    def update(self, key: str, state: Dict[str, Any]) -> bool:
+        """상태 갱신 (바뀐 필드만 로그에 기록, 변경이 있으면 True)"""
+        current = self._state.get(key, {})
+        changes = {name: value for name, value in state.items()
+                   if name not in current or current[name] != value}
+        if not changes:
+            return False
+        self._append({"seq": self._seq + 1, "key": key, "changes": changes})
+        return True
+
+    def remove(self, key: str):
+        """상태 삭제"""
+        if key in self._state:
+            self._append({"seq": self._seq + 1, "key": key, "removed": True})
+
+    def clear(self):
+        """모든 상태 삭제"""
+        for key in list(self._state):
+            self.remove(key)
+
+    def snapshot(self):
+        """스냅샷 저장 후 변경 로그 비우기 (현재 상태를 직렬화해 두고 기록은 전용 스레드에서)"""
+        self._submit(self._write_snapshot, json.dumps({"seq": self._seq, "state": self._state}, ensure_ascii=False))
+        self._log_entries = 0
+
+    def _write_snapshot(self, data: str):
+        """임시 파일에 스냅샷을 쓰고 rename으로 교체한 뒤 로그 비우기"""
+        temp_path = self._snapshot_path + ".tmp"
+        with open(temp_path, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self._snapshot_path)
+        self._fsync_directory()
+
+        self._log.truncate(0)
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+    def _fsync_directory(self):
+        """rename 결과를 디스크에 반영"""
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    async def flush(self):
+        """예약된 기록이 끝날 때까지 대기"""
+        if self._last_write is not None:
+            await asyncio.wrap_future(self._last_write)
+
+    def close(self):
+        """남은 기록을 마친 뒤 저장소 종료"""
+        self._executor.shutdown(wait=True)
+        if not self._log.closed:
+            self._log.close()
@@ -0,0 +1,59 @@
+"""무한매수 전략 판단 함수 모듈
+
+라이브 봇과 백테스트가 같은 판단 결과를 내도록 상태를 갖지 않는 순수 함수로 분리한다.
+"""
+from .config import TradingConfig
+
+# 전반전 첫 회차의 LOC 기준 퍼센트 (10 - T/2 공식의 10)
+BASE_LOC_PERCENT = 10.0
+
+
+def first_buy_quantity(trading_config: TradingConfig, price: float) -> int:
+    """첫 매수 수량 계산"""
+    return int(trading_config.first_buy_amount / price)
+
+
+def additional_buy_quantity(
+    trading_config: TradingConfig,
+    current_division: int,
+    average_price: float,
+    price: float,
+) -> int:
+    """추가 매수 수량 계산 (매수하지 않으면 0)"""
+    if current_division >= trading_config.total_divisions:
+        return 0
+
+    # 현재가가 평균단가보다 낮을 때만 매수
+    if price >= average_price:
+        return 0
+
+    amount = trading_config.first_buy_amount * (2 ** current_division)
+    return int(amount / price)
+
+
+def loc_percent(trading_config: TradingConfig, turn: float) -> float:
+    """회차별 LOC 퍼센트 계산
+
+    전반전 기준 회차에서 0%가 되도록 선형 감소한다 (기본 설정에서 10 - T/2).
+    """
+    return BASE_LOC_PERCENT * (1 - turn / trading_config.pre_turn_threshold)
+
+
+def sell_target_price(trading_config: TradingConfig, turn: float, average_price: float) -> float:
+    """LOC 매도 목표가 계산"""
+    return average_price * (1 + loc_percent(trading_config, turn) / 100)
+
+
+def is_quarter_loss_turn(trading_config: TradingConfig, turn: float) -> bool:
+    """쿼터손절 회차 여부"""
+    return turn >= trading_config.quarter_loss_start
+
+
+def quarter_loss_quantity(position_count: int) -> int:
+    """쿼터손절 매도 수량 계산"""
+    return position_count // 4
+
+
+def turn_after_quarter_loss(turn: int) -> int:
+    """쿼터손절 후 회차 (보유 수량과 같은 비율로 1/4 차감)"""
+    return turn - turn // 4
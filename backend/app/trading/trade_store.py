@@ -0,0 +1,268 @@
+"""SQLite 거래 저장소 모듈
+
+거래, 주문, 사이클 요약을 SQLite(WAL 모드)에 보관한다.
+쓰기는 전용 스레드 하나가 큐에 쌓인 변경을 한 트랜잭션으로 모아 처리하고,
+조회는 별도 연결로 수행하므로 쓰기 중에도 막히지 않는다.
+거래 내역은 (종목, 시각) 또는 (시각) 인덱스를 타는 키셋 페이지네이션으로 조회한다.
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    journal_seq INTEGER UNIQUE,
+    timestamp TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    action TEXT NOT NULL,
+    price REAL NOT NULL,
+    quantity REAL NOT NULL,
+    division INTEGER NOT NULL,
+    total_amount REAL NOT NULL,
+    cycle_number INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_trades_symbol_timestamp ON trades (symbol, timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades (timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_trades_cycle ON trades (cycle_number);
+
+CREATE TABLE IF NOT EXISTS orders (
+    order_number TEXT PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    type TEXT NOT NULL,
+    price REAL NOT NULL,
+    qty INTEGER NOT NULL,
+    executed_qty INTEGER NOT NULL DEFAULT 0,
+    condition TEXT NOT NULL,
+    time TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'PENDING'
+);
+CREATE INDEX IF NOT EXISTS idx_orders_symbol_time ON orders (symbol, time);
+
+CREATE TABLE IF NOT EXISTS cycles (
+    symbol TEXT NOT NULL,
+    cycle_number INTEGER NOT NULL,
+    started_at TEXT,
+    ended_at TEXT,
+    total_investment REAL NOT NULL DEFAULT 0,
+    realized_pnl REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (symbol, cycle_number)
+);
+CREATE INDEX IF NOT EXISTS idx_cycles_cycle ON cycles (cycle_number);
+"""
+
+TRADE_COLUMNS = ("timestamp", "symbol", "action", "price", "quantity", "division", "total_amount")
+ORDER_COLUMNS = ("order_number", "symbol", "type", "price", "qty", "executed_qty", "condition", "time", "status")
+CYCLE_COLUMNS = ("symbol", "cycle_number", "started_at", "ended_at", "total_investment", "realized_pnl")
+
+INSERT_TRADE = (
+    "INSERT OR IGNORE INTO trades (journal_seq, timestamp, symbol, action, price, quantity, division,"
+    " total_amount, cycle_number) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+UPSERT_ORDER = (
+    "INSERT INTO orders (order_number, symbol, type, price, qty, executed_qty, condition, time, status)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (order_number) DO UPDATE SET"
+    " executed_qty = excluded.executed_qty, status = excluded.status"
+)
+UPSERT_CYCLE = (
+    "INSERT INTO cycles (symbol, cycle_number, started_at, ended_at, total_investment, realized_pnl)"
+    " VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (symbol, cycle_number) DO UPDATE SET"
+    " ended_at = excluded.ended_at, total_investment = excluded.total_investment,"
+    " realized_pnl = excluded.realized_pnl"
+)
+
+
+def _text(value: Any) -> Any:
+    """datetime을 ISO 문자열로 변환"""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class TradeStore:
+    """SQLite 거래/주문/사이클 저장소"""
+
+    def __init__(self, path: str):
+        """초기화 (스키마 생성)"""
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # 쓰기 연결은 전용 스레드에서만 사용
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trade-store")
+        self._writer_conn = self._executor.submit(self._connect).result()
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self.batches = 0
+        # 거래 내역 버전 (거래가 추가될 때마다 증가, 저장소마다 다른 토큰으로 구분)
+        self.token = uuid.uuid4().hex[:8]
+        self.trade_version = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """쓰기 연결 생성"""
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """조회용 연결 생성 (WAL 모드라 쓰기와 동시에 읽을 수 있다)"""
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # 쓰기
+
+    def _enqueue(self, sql: str, params: Tuple):
+        """쓰기 요청 추가 (전용 쓰기 태스크가 모아서 처리)"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._queue.put_nowait((sql, params))
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_loop())
+
+    def _write_batch(self, batch: List[Tuple[str, Tuple]]):
+        """쓰기 요청 묶음을 한 트랜잭션으로 실행"""
+        with self._writer_conn:
+            for sql, params in batch:
+                self._writer_conn.execute(sql, params)
+
+    async def _write_loop(self):
+        """쓰기 전용 태스크"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await loop.run_in_executor(self._executor, self._write_batch, batch)
+                self.batches += 1
+            except Exception as e:
+                logger.error(f"Failed to write trade store batch: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def add_trade(self, trade: Dict, journal_seq: Optional[int] = None):
+        """거래 추가"""
+        self.trade_version += 1
+        self._enqueue(INSERT_TRADE, (journal_seq, *(_text(trade.get(column)) for column in TRADE_COLUMNS),
+                                     trade.get("cycle_number", 1)))
+
+    def save_order(self, order: Dict):
+        """주문 추가/갱신 (체결 수량과 상태만 갱신)"""
+        self._enqueue(UPSERT_ORDER, tuple(_text(order.get(column)) for column in ORDER_COLUMNS[:-1])
+                      + (order.get("status", "PENDING"),))
+
+    def save_cycle(self, cycle: Dict):
+        """사이클 요약 추가/갱신"""
+        self._enqueue(UPSERT_CYCLE, tuple(_text(cycle.get(column)) for column in CYCLE_COLUMNS))
+
+    async def flush(self):
+        """대기 중인 쓰기 완료 대기"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self):
+        """쓰기 완료 후 저장소 종료"""
+        await self.flush()
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        self._executor.submit(self._writer_conn.close).result()
+        self._executor.shutdown()
+
+    # 조회
+
+    def _query(self, sql: str, params: Sequence = ()) -> List[Dict]:
+        """조회 실행"""
+        conn = self._reader()
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    async def _fetch(self, sql: str, params: Sequence = ()) -> List[Dict]:
+        """대기 중인 쓰기를 반영한 뒤 이벤트 루프 밖에서 조회"""
+        await self.flush()
+        return await asyncio.to_thread(self._query, sql, params)
+
+    async def trades(self, symbol: Optional[str] = None, start: Optional[datetime] = None,
+                     end: Optional[datetime] = None, after: Optional[int] = None,
+                     limit: int = 100, cycle_number: Optional[int] = None) -> List[Dict]:
+        """거래 내역 조회 (오래된 순, after: 이전 페이지 마지막 거래 id)"""
+        conditions, params = [], []
+        if symbol is not None:
+            conditions.append("symbol = ?")
+            params.append(symbol)
+        if cycle_number is not None:
+            conditions.append("cycle_number = ?")
+            params.append(cycle_number)
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params.append(_text(start))
+        if end is not None:
+            conditions.append("timestamp < ?")
+            params.append(_text(end))
+        if after is not None:
+            # 키셋 페이지네이션: 이전 페이지 마지막 거래 다음부터
+            conditions.append("(timestamp, id) > (SELECT timestamp, id FROM trades WHERE id = ?)")
+            params.append(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+        return await self._fetch(
+            f"SELECT id, {', '.join(TRADE_COLUMNS)}, cycle_number FROM trades {where}"
+            " ORDER BY timestamp, id LIMIT ?",
+            params,
+        )
+
+    async def orders(self, symbol: Optional[str] = None, status: Optional[str] = None) -> List[Dict]:
+        """주문 조회"""
+        conditions, params = [], []
+        if symbol is not None:
+            conditions.append("symbol = ?")
+            params.append(symbol)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return await self._fetch(f"SELECT {', '.join(ORDER_COLUMNS)} FROM orders {where} ORDER BY time", params)
+
+    async def cycles(self, symbol: Optional[str] = None) -> List[Dict]:
+        """사이클 요약 조회"""
+        where, params = ("WHERE symbol = ?", (symbol,)) if symbol is not None else ("", ())
+        return await self._fetch(
+            f"SELECT {', '.join(CYCLE_COLUMNS)} FROM cycles {where} ORDER BY symbol, cycle_number", params
+        )
+
+    async def cycle_pnl(self, symbol: str) -> List[Dict]:
+        """사이클별 매수/매도 금액과 실현 손익 (진행 중인 사이클은 status가 open)
+
+        끝난 사이클의 손익은 매도 - 매수 금액이고, 진행 중인 사이클은 보유분 매수 금액을
+        손실로 보지 않도록 사이클 요약의 실현 손익만 보고한다.
+        """
+        return await self._fetch(
+            "SELECT t.cycle_number, t.bought, t.sold,"
+            " CASE WHEN c.ended_at IS NULL THEN COALESCE(c.realized_pnl, 0) ELSE t.sold - t.bought END AS pnl,"
+            " CASE WHEN c.ended_at IS NULL THEN 'open' ELSE 'closed' END AS status"
+            " FROM (SELECT cycle_number,"
+            " SUM(CASE WHEN action = 'BUY' THEN total_amount ELSE 0 END) AS bought,"
+            " SUM(CASE WHEN action = 'SELL' THEN total_amount ELSE 0 END) AS sold"
+            " FROM trades WHERE symbol = ? GROUP BY cycle_number) AS t"
+            " LEFT JOIN cycles AS c ON c.symbol = ? AND c.cycle_number = t.cycle_number"
+            " ORDER BY t.cycle_number",
+            (symbol, symbol),
+        )
+
+    def last_journal_seq(self) -> int:
+        """저장된 마지막 저널 번호 (없으면 -1)"""
+        row = self._query("SELECT MAX(journal_seq) AS seq FROM trades")[0]
+        return -1 if row["seq"] is None else row["seq"]
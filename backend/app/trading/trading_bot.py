@@ -1,6 +1,6 @@
 from pykis import PyKis
 from .config import BotConfig, TradingConfig
-import logging
+from . import log_pipeline
 from datetime import datetime
 import asyncio
 from abc import ABC, abstractmethod
@@ -35,19 +35,8 @@ class InfiniteBuyingBot(TradingBot):
 
     def _setup_logging(self):
         """로깅 설정"""
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.INFO)
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        
-        # 파일 핸들러
-        fh = logging.FileHandler('logs/trading.log')
-        fh.setFormatter(formatter)
-        self.logger.addHandler(fh)
-
-        # 콘솔 핸들러
-        ch = logging.StreamHandler()
-        ch.setFormatter(formatter)
-        self.logger.addHandler(ch)
+        # 파일 및 콘솔 출력은 로그 파이프라인의 리스너 스레드가 담당
+        self.logger = log_pipeline.get_logger(__name__, "logs", "trading.log", console=True)
 
     async def run(self):
         """트레이딩 시작"""
@@ -0,0 +1,206 @@
+"""벤치마크 하네스
+
+pytest-benchmark와 같은 방식으로 `benchmark` 픽스처에 측정할 함수를 넘긴다.
+코루틴 함수는 픽스처의 이벤트 루프에서 실행한다. 라운드마다 min_time 이상 걸리도록
+반복 횟수를 맞춘 뒤 라운드별 1회 평균 시간으로 통계를 낸다.
+
+실행 결과는 JSON으로 저장하고(.benchmarks/<시각>_<커밋>.json 또는 --benchmark-json),
+--benchmark-compare로 이전 결과를 넘기면 평균 시간 변화를 출력한다.
+--benchmark-max-regression을 함께 주면 그 비율 이상 느려진 항목이 있을 때 실패한다.
+
+    python -m pytest benchmarks
+    python -m pytest benchmarks --benchmark-compare .benchmarks/<이전 결과>.json --benchmark-max-regression 0.2
+"""
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+RESULTS_DIR = os.path.join(ROOT, ".benchmarks")
+
+_results: List[Dict[str, Any]] = []
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark")
+    group.addoption("--benchmark-json", default=None, help="결과 JSON 경로 (기본: .benchmarks/<시각>_<커밋>.json)")
+    group.addoption("--benchmark-compare", default=None, help="비교할 이전 결과 JSON")
+    group.addoption("--benchmark-max-regression", type=float, default=None,
+                    help="이 비율 이상 평균 시간이 늘면 실패 (예: 0.2 = 20%)")
+    group.addoption("--benchmark-rounds", type=int, default=20, help="측정 라운드 수")
+    group.addoption("--benchmark-min-time", type=float, default=0.001, help="라운드당 최소 측정 시간 (초)")
+    group.addoption("--benchmark-history-size", type=int, default=1_000_000, help="거래 내역 벤치마크 행 수")
+
+
+class Benchmark:
+    """측정기 (pytest-benchmark의 benchmark 픽스처와 같은 호출 방식)"""
+
+    def __init__(self, name: str, group: Optional[str], params: Optional[Dict[str, Any]],
+                 loop: asyncio.AbstractEventLoop, rounds: int, min_time: float):
+        self.name = name
+        self.group = group
+        self.params = params
+        self.loop = loop
+        self.rounds = rounds
+        self.min_time = min_time
+        self.stats: Optional[Dict[str, float]] = None
+        self.extra_info: Dict[str, Any] = {}
+
+    def _timer(self, fn: Callable, args, kwargs) -> Callable[[int], float]:
+        """iterations회 실행 시간을 재는 함수"""
+        if asyncio.iscoroutinefunction(fn):
+            async def run(iterations: int) -> float:
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    await fn(*args, **kwargs)
+                return time.perf_counter() - started
+            return lambda iterations: self.loop.run_until_complete(run(iterations))
+
+        def run_sync(iterations: int) -> float:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                fn(*args, **kwargs)
+            return time.perf_counter() - started
+        return run_sync
+
+    def __call__(self, fn: Callable, *args, **kwargs) -> Any:
+        """fn 측정 후 마지막 실행 결과 반환"""
+        timer = self._timer(fn, args, kwargs)
+        # 워밍업 겸 반복 횟수 보정
+        iterations = 1
+        while timer(iterations) < self.min_time and iterations < 1_000_000:
+            iterations *= 10
+        samples = [timer(iterations) / iterations for _ in range(self.rounds)]
+        mean = statistics.fmean(samples)
+        self.stats = {
+            "min": min(samples),
+            "max": max(samples),
+            "mean": mean,
+            "median": statistics.median(samples),
+            "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            "rounds": self.rounds,
+            "iterations": iterations,
+            "ops": 1 / mean if mean else 0.0,
+        }
+        if asyncio.iscoroutinefunction(fn):
+            return self.loop.run_until_complete(fn(*args, **kwargs))
+        return fn(*args, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def loop():
+    """벤치마크용 이벤트 루프 (세션 공유)"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def benchmark(request, loop):
+    """측정 픽스처"""
+    callspec = getattr(request.node, "callspec", None)
+    marker = request.node.get_closest_marker("benchmark")
+    bench = Benchmark(
+        request.node.name,
+        marker.kwargs.get("group") if marker else None,
+        dict(callspec.params) if callspec else None,
+        loop,
+        request.config.getoption("--benchmark-rounds"),
+        request.config.getoption("--benchmark-min-time"),
+    )
+    yield bench
+    if bench.stats is not None:
+        _results.append({
+            "name": bench.name,
+            # 실행 위치와 관계없이 비교할 수 있도록 저장소 기준 경로 사용
+            "fullname": f"{os.path.relpath(request.node.path, ROOT)}::{request.node.name}",
+            "group": bench.group,
+            "params": bench.params,
+            "extra_info": bench.extra_info,
+            "stats": bench.stats,
+        })
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark(group): 벤치마크 그룹")
+
+
+def _commit() -> Dict[str, Any]:
+    """현재 커밋 정보"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"id": None, "dirty": None}
+    return {"id": commit, "dirty": dirty}
+
+
+def _compare(previous_path: str, max_regression: Optional[float], reporter) -> List[str]:
+    """이전 결과와 평균 시간 비교 (기준을 넘은 항목 반환)"""
+    with open(previous_path) as f:
+        previous = {entry["fullname"]: entry["stats"]["mean"] for entry in json.load(f)["benchmarks"]}
+    regressions = []
+    reporter.write_sep("-", f"benchmark comparison with {os.path.basename(previous_path)}")
+    for entry in _results:
+        before = previous.get(entry["fullname"])
+        if not before:
+            continue
+        change = entry["stats"]["mean"] / before - 1
+        flag = ""
+        if max_regression is not None and change > max_regression:
+            regressions.append(entry["fullname"])
+            flag = "  REGRESSION"
+        reporter.write_line(f"{entry['fullname']}: {before * 1e6:.1f}us -> "
+                            f"{entry['stats']['mean'] * 1e6:.1f}us ({change:+.1%}){flag}")
+    return regressions
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results:
+        return
+    config = session.config
+    commit = _commit()
+    path = config.getoption("--benchmark-json")
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"{stamp}_{(commit['id'] or 'unknown')[:8]}.json")
+    with open(path, "w") as f:
+        json.dump({
+            "datetime": datetime.now().isoformat(),
+            "commit": commit,
+            "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                        "processor": platform.processor()},
+            "benchmarks": _results,
+        }, f, indent=2)
+
+    reporter = config.pluginmanager.get_plugin("terminalreporter")
+    if reporter is None:
+        return
+    reporter.write_sep("-", "benchmark results (mean per call)")
+    for entry in _results:
+        stats = entry["stats"]
+        reporter.write_line(f"{entry['fullname']}: {stats['mean'] * 1e6:.1f}us "
+                            f"(min {stats['min'] * 1e6:.1f}us, {stats['ops']:.0f} ops/s)")
+    reporter.write_line(f"saved to {path}")
+
+    previous = config.getoption("--benchmark-compare")
+    if previous:
+        regressions = _compare(previous, config.getoption("--benchmark-max-regression"), reporter)
+        if regressions:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
@@ -0,0 +1,32 @@
+"""증분 손익 엔진 벤치마크"""
+from datetime import datetime
+
+import pytest
+
+from backend.app.trading.analytics import AnalyticsEngine
+
+SYMBOLS = ("TQQQ", "SOXL", "UPRO", "TECL")
+
+
+@pytest.fixture
+def engine():
+    engine = AnalyticsEngine()
+    for i, symbol in enumerate(SYMBOLS):
+        engine.on_trade({"timestamp": datetime(2024, 1, 2), "symbol": symbol, "action": "BUY",
+                         "price": 50.0 + i, "quantity": 100, "cycle_number": 1})
+    return engine
+
+
+@pytest.mark.benchmark(group="analytics")
+def test_price_tick(benchmark, engine):
+    """시세 1건 반영 (종목 지표 + 포트폴리오 합계)"""
+    benchmark(engine.on_price, "SOXL", 52.5)
+    assert engine.position("SOXL").unrealized_pnl == 150.0
+
+
+@pytest.mark.benchmark(group="analytics")
+def test_fill(benchmark, engine):
+    """체결 1건 반영"""
+    trade = {"symbol": "TQQQ", "action": "BUY", "price": 49.0, "quantity": 1, "cycle_number": 1}
+    benchmark(engine.on_trade, trade)
+    assert engine.position("TQQQ").quantity > 100
@@ -0,0 +1,89 @@
+"""매매 판단 1회(틱)와 BotManager 상태 조회 벤치마크"""
+import tempfile
+
+import httpx
+import pytest
+
+from backend.app.main import app
+from backend.app.trading.bot_manager import BotManager, bot_manager
+from backend.app.trading.config import BotConfig, TradingConfig
+from backend.app.trading.infinite_buying_bot import InfiniteBuyingBot
+from backend.app.trading.kis import KisAPI
+
+# 호출 한도에 걸리지 않도록 충분히 큰 한도 (오프라인 테스트 모드 API)
+FAST_API = dict(api_rate_limit=1e9, api_burst=1e9)
+
+STATE = {"position_count": 10, "current_division": 1, "average_price": 50.0, "total_investment": 500.0,
+         "cycle_number": 1, "cycle_investment": 500.0, "realized_pnl": 0.0}
+
+
+def trading_config(symbol: str = "TQQQ") -> TradingConfig:
+    return TradingConfig(symbol=symbol, total_divisions=40, first_buy_amount=500,
+                         pre_turn_threshold=20, quarter_loss_start=39)
+
+
+@pytest.fixture
+def bot():
+    config = BotConfig(log_dir=tempfile.mkdtemp(), **FAST_API)
+    bot = InfiniteBuyingBot(config, trading_config(), kis_api=KisAPI(config, quote_window=0))
+    bot.restore_state(STATE)
+    return bot
+
+
+@pytest.mark.benchmark(group="tick")
+def test_tick_hold(benchmark, bot):
+    """주문이 없는 틱 (평균단가 근처 시세)"""
+    benchmark(bot.run_once, 50.0)
+    assert bot.position_count == 10
+
+
+@pytest.mark.benchmark(group="tick")
+def test_tick_additional_buy(benchmark, bot):
+    """추가 매수 주문을 내는 틱"""
+    async def tick():
+        bot.restore_state(STATE)
+        await bot.run_once(45.0)
+
+    benchmark(tick)
+    assert bot.current_division == 2
+
+
+async def _manager(bots: int) -> BotManager:
+    """bots개 종목 봇을 올린 BotManager (장 일정 사용, 시세 피드는 돌지 않는다)"""
+    config = BotConfig(log_dir=tempfile.mkdtemp(), data_dir=tempfile.mkdtemp(), **FAST_API)
+    bot_manager._api = KisAPI(config, quote_window=0)
+    for i in range(bots):
+        await bot_manager.initialize_bot(config, trading_config(f"SYM{i:03d}"))
+    await bot_manager.start()
+    for slot in bot_manager._bots.values():
+        slot.bot.restore_state(STATE)
+        slot.bot.current_price = 51.0
+    return bot_manager
+
+
+@pytest.fixture(params=[1, 10, 100], ids=lambda bots: f"{bots}bots")
+def manager(request, loop):
+    manager = loop.run_until_complete(_manager(request.param))
+    yield manager
+    loop.run_until_complete(manager.close())
+    manager._bots.clear()
+
+
+@pytest.mark.benchmark(group="status")
+def test_get_status(benchmark, manager):
+    """BotManager.get_status (전체 봇)"""
+    status = benchmark(manager.get_status)
+    assert len(status["bots"]) == len(manager.symbols)
+
+
+@pytest.mark.benchmark(group="status")
+def test_status_endpoint(benchmark, manager):
+    """GET /trading/status (직렬화 포함)"""
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+    async def request():
+        response = await client.get("/trading/status")
+        assert response.status_code == 200
+
+    benchmark(request)
+    benchmark.loop.run_until_complete(client.aclose())
@@ -0,0 +1,41 @@
+"""설정 파일 로드/저장 벤치마크"""
+import pytest
+
+from backend.app.routers import config as config_router
+from backend.app.trading.config_store import ConfigStore
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    store = ConfigStore(path)
+    monkeypatch.setattr(config_router, "CONFIG_FILE", path)
+    monkeypatch.setattr(config_router, "_store", store)
+    config_router.create_default_config()
+    yield path
+    store.close()
+
+
+@pytest.mark.benchmark(group="config")
+def test_load_config(benchmark, config_file):
+    """설정 파일 로드"""
+    benchmark(config_router.load_config)
+    assert config_router._trading_config is not None
+
+
+@pytest.mark.benchmark(group="config")
+def test_save_config(benchmark, config_file):
+    """이벤트 루프 밖 설정 저장 (기록 완료까지 대기, 같은 내용은 건너뜀)"""
+    benchmark(config_router.save_config)
+    assert config_file.exists()
+
+
+@pytest.mark.benchmark(group="config")
+def test_save_config_in_loop(benchmark, config_file):
+    """라우트 핸들러 안의 설정 저장 (기록 예약만 하고 반환)"""
+    async def save():
+        config_router.save_config()
+
+    benchmark(save)
+    benchmark.loop.run_until_complete(config_router.flush_config())
+    assert config_router._store.requests > 1
@@ -0,0 +1,91 @@
+"""대용량 거래 내역 페이지 조회 벤치마크"""
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from backend.app.main import app
+from backend.app.trading.bot_manager import bot_manager
+from backend.app.trading.trade_store import INSERT_TRADE, TradeStore
+
+SYMBOLS = ("TQQQ", "SOXL", "UPRO", "TECL")
+
+
+def _populate(path: str, count: int):
+    """count건의 거래를 직접 기록 (종목을 번갈아 가며 1분 간격)"""
+    started = datetime(2020, 1, 1)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(INSERT_TRADE, (
+            (seq, (started + timedelta(minutes=seq)).isoformat(), SYMBOLS[seq % len(SYMBOLS)], "BUY",
+             50.0 + seq % 7, 10, seq % 40 + 1, 500.0, seq // 40 + 1)
+            for seq in range(count)
+        ))
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def store(request, loop):
+    count = request.config.getoption("--benchmark-history-size")
+    store = TradeStore(os.path.join(tempfile.mkdtemp(), "trades.db"))
+    _populate(store.path, count)
+    yield store
+    loop.run_until_complete(store.close())
+
+
+@pytest.mark.benchmark(group="history")
+@pytest.mark.parametrize("position", [0.0, 0.5, 0.99], ids=["first", "middle", "last"])
+def test_history_page(benchmark, store, position):
+    """전체 거래 내역 100건 페이지 (커서 위치별)"""
+    count = store.last_journal_seq() + 1
+    after = int(count * position) or None
+    rows = benchmark(store.trades, limit=100, after=after)
+    assert len(rows) == min(100, count - (after or 0))
+
+
+@pytest.mark.benchmark(group="history")
+def test_history_page_by_symbol(benchmark, store):
+    """종목 필터 + 커서 페이지"""
+    count = store.last_journal_seq() + 1
+    rows = benchmark(store.trades, "SOXL", limit=100, after=count // 2 + 1)
+    assert all(row["symbol"] == "SOXL" for row in rows)
+
+
+@pytest.mark.benchmark(group="history")
+def test_history_endpoint(benchmark, store, loop):
+    """GET /trading/history (직렬화 포함)"""
+    bot_manager._trade_store = store
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+    after = (store.last_journal_seq() + 1) // 2
+
+    async def request():
+        response = await client.get("/trading/history", params={"after": after, "limit": 100})
+        assert response.status_code == 200
+
+    try:
+        benchmark(request)
+    finally:
+        bot_manager._trade_store = None
+        loop.run_until_complete(client.aclose())
+
+
+@pytest.mark.benchmark(group="history")
+def test_history_endpoint_not_modified(benchmark, store, loop):
+    """GET /trading/history (If-None-Match 일치 -> 304)"""
+    bot_manager._trade_store = store
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+    params = {"after": (store.last_journal_seq() + 1) // 2, "limit": 100}
+    etag = loop.run_until_complete(client.get("/trading/history", params=params)).headers["ETag"]
+
+    async def request():
+        response = await client.get("/trading/history", params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    try:
+        benchmark(request)
+    finally:
+        bot_manager._trade_store = None
+        loop.run_until_complete(client.aclose())
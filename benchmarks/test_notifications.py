@@ -0,0 +1,26 @@
+"""알림 메시지 생성 벤치마크"""
+from decimal import Decimal
+
+import pytest
+
+from notifications import format_balance, format_error, format_order
+
+STOCKS = [{"symbol": f"SYM{i}", "quantity": 10 * i, "average_price": 50.0 + i, "current_price": 52.0 + i,
+           "total_value": (52.0 + i) * 10 * i, "profit_rate": 3.1} for i in range(10)]
+
+
+@pytest.mark.benchmark(group="notifications")
+def test_format_order(benchmark):
+    message = benchmark(format_order, "매수 체결", "TQQQ", qty=Decimal("10"), price=50.25, amount=502.5)
+    assert "TQQQ" in message
+
+
+@pytest.mark.benchmark(group="notifications")
+def test_format_balance(benchmark):
+    message = benchmark(format_balance, 10_000.0, STOCKS)
+    assert message.count("평균단가") == len(STOCKS)
+
+
+@pytest.mark.benchmark(group="notifications")
+def test_format_error(benchmark):
+    assert "boom" in benchmark(format_error, RuntimeError("boom"))
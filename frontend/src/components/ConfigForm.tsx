@@ -96,7 +96,7 @@ export const ConfigForm: React.FC = () => {
   };
 
   const handleResetBot = async () => {
-    if (window.confirm('Are you sure you want to reset the bot? This will clear all trading history.')) {
+    if (window.confirm('Are you sure you want to reset the bot? This will clear all trading history (an archive copy is kept on the server).')) {
       try {
         await axios.post(`${API_BASE_URL}/config/reset`);
         await fetchConfig();
@@ -29,18 +29,31 @@ export const TradeHistory: React.FC = () => {
   const [trades, setTrades] = useState<Trade[]>([]);
   const [page, setPage] = useState(0);
   const [rowsPerPage, setRowsPerPage] = useState(10);
+  // 페이지별 시작 커서 (이전 페이지 마지막 거래 id, 첫 페이지는 null)
+  const [cursors, setCursors] = useState<(number | null)[]>([null]);
+  const [hasNext, setHasNext] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
   const fetchHistory = async () => {
     try {
+      const after = cursors[page];
       const response = await axios.get(`${API_BASE_URL}/trading/history`, {
         params: {
           limit: rowsPerPage,
-          offset: page * rowsPerPage,
+          ...(after !== null && after !== undefined ? { after } : {}),
         },
       });
       if (response.data) {
         setTrades(response.data);
+        const next = response.headers['x-next-cursor'];
+        setHasNext(next !== undefined);
+        if (next !== undefined) {
+          setCursors((prev) => {
+            const updated = prev.slice(0, page + 1);
+            updated[page + 1] = Number(next);
+            return updated;
+          });
+        }
         setError(null);
       } else {
         setTrades([]);
@@ -63,6 +76,7 @@ export const TradeHistory: React.FC = () => {
 
   const handleChangeRowsPerPage = (event: React.ChangeEvent<HTMLInputElement>) => {
     setRowsPerPage(parseInt(event.target.value, 10));
+    setCursors([null]);
     setPage(0);
   };
 
@@ -115,7 +129,7 @@ export const TradeHistory: React.FC = () => {
       </TableContainer>
       <TablePagination
         component="div"
-        count={-1}
+        count={hasNext ? -1 : page * rowsPerPage + trades.length}
         rowsPerPage={rowsPerPage}
         page={page}
         onPageChange={handleChangePage}
@@ -6,11 +6,15 @@ import {
   Box,
   Chip,
 } from '@mui/material';
-import axios from 'axios';
 
 const API_BASE_URL = 'http://localhost:8000';
 
+// 서버 변경분에서 삭제된 키 목록이 담기는 키 (broadcaster.REMOVED_KEY)
+const REMOVED_KEY = '$removed';
+
 interface TradingStatus {
+  symbol: string;
+  is_running: boolean;
   current_price: number;
   position_count: number;
   average_price: number;
@@ -20,36 +24,93 @@ interface TradingStatus {
   last_updated: string;
 }
 
-interface TradingStatusResponse {
-  status: TradingStatus;
-  recent_trades: any[];  // TODO: Add proper type
+interface BotState {
+  is_running: boolean;
+  position_count: number;
+  current_division: number;
+  average_price: number;
+  total_investment: number;
+  current_price: number | null;
 }
 
-export const TradingStatus: React.FC = () => {
-  const [status, setStatus] = useState<TradingStatus | null>(null);
-  const [error, setError] = useState<string | null>(null);
+interface StreamState {
+  is_running: boolean;
+  bots: Record<string, BotState>;
+}
 
-  const fetchStatus = async () => {
-    try {
-      const response = await axios.get<TradingStatusResponse>(`${API_BASE_URL}/trading/status`);
-      if (response.data && response.data.status) {
-        setStatus(response.data.status);
-        setError(null);
-      } else {
-        setStatus(null);
-        setError('Invalid response format');
-      }
-    } catch (error) {
-      console.error('Failed to fetch trading status:', error);
-      setStatus(null);
-      setError(error instanceof Error ? error.message : 'Failed to fetch status');
+// 서버가 보낸 변경분을 현재 상태에 병합 (REMOVED_KEY에 담긴 키는 삭제, null은 값으로 유지)
+const applyDelta = (target: any, delta: any): any => {
+  const result = { ...target };
+  Object.entries(delta).forEach(([key, value]) => {
+    if (key === REMOVED_KEY) {
+      (value as string[]).forEach((removed) => delete result[removed]);
+    } else if (value !== null && typeof value === 'object' && !Array.isArray(value)
+      && result[key] !== null && typeof result[key] === 'object') {
+      result[key] = applyDelta(result[key], value);
+    } else {
+      result[key] = value;
     }
-  };
+  });
+  return result;
+};
+
+const toTradingStatuses = (state: StreamState): TradingStatus[] => {
+  const updated = new Date().toISOString();
+  return Object.entries(state.bots ?? {})
+    .sort(([a], [b]) => a.localeCompare(b))
+    .map(([symbol, bot]) => {
+      const currentPrice = bot.current_price ?? 0;
+      return {
+        symbol,
+        is_running: bot.is_running,
+        current_price: currentPrice,
+        position_count: bot.position_count,
+        average_price: bot.average_price,
+        total_investment: bot.total_investment,
+        unrealized_pnl: (currentPrice - bot.average_price) * bot.position_count,
+        current_division: bot.current_division,
+        last_updated: updated,
+      };
+    });
+};
+
+const Field: React.FC<{ label: string; children: React.ReactNode; color?: string }> = ({ label, children, color }) => (
+  <Grid item xs={6} md={4}>
+    <Box>
+      <Typography variant="body2" color="text.secondary">
+        {label}
+      </Typography>
+      <Typography variant="h6" color={color}>
+        {children}
+      </Typography>
+    </Box>
+  </Grid>
+);
+
+export const TradingStatus: React.FC = () => {
+  const [statuses, setStatuses] = useState<TradingStatus[] | null>(null);
+  const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    fetchStatus();
-    const interval = setInterval(fetchStatus, 5000); // 5초마다 업데이트
-    return () => clearInterval(interval);
+    // 폴링 대신 서버 푸시(SSE)로 변경분만 수신
+    let state: StreamState = { is_running: false, bots: {} };
+    const source = new EventSource(`${API_BASE_URL}/trading/stream`);
+
+    source.addEventListener('snapshot', (event) => {
+      state = JSON.parse((event as MessageEvent).data);
+      setStatuses(toTradingStatuses(state));
+      setError(null);
+    });
+    source.addEventListener('delta', (event) => {
+      state = applyDelta(state, JSON.parse((event as MessageEvent).data));
+      setStatuses(toTradingStatuses(state));
+    });
+    source.onerror = () => {
+      // EventSource가 자동으로 재연결하며, 재연결 시 스냅샷을 다시 받는다
+      setError(source.readyState === EventSource.CLOSED ? 'Status stream closed' : null);
+    };
+
+    return () => source.close();
   }, []);
 
   if (error) {
@@ -60,7 +121,7 @@ export const TradingStatus: React.FC = () => {
     );
   }
 
-  if (!status) {
+  if (!statuses) {
     return (
       <Paper elevation={3} sx={{ p: 3, mb: 3 }}>
         <Typography>Loading trading status...</Typography>
@@ -73,81 +134,30 @@ export const TradingStatus: React.FC = () => {
       <Typography variant="h6" gutterBottom>
         Trading Status
       </Typography>
-      <Grid container spacing={2}>
-        <Grid item xs={6} md={4}>
-          <Box>
-            <Typography variant="body2" color="text.secondary">
-              Current Price
-            </Typography>
-            <Typography variant="h6">
-              ${status.current_price.toFixed(2)}
-            </Typography>
+      {statuses.length === 0 && <Typography>No bots configured</Typography>}
+      {statuses.map((status) => (
+        <Box key={status.symbol} sx={{ mb: 3 }}>
+          <Box sx={{ display: 'flex', alignItems: 'center', gap: 1, mb: 1 }}>
+            <Typography variant="subtitle1">{status.symbol}</Typography>
+            <Chip
+              label={status.is_running ? 'Running' : 'Stopped'}
+              color={status.is_running ? 'success' : 'default'}
+              size="small"
+            />
           </Box>
-        </Grid>
-        <Grid item xs={6} md={4}>
-          <Box>
-            <Typography variant="body2" color="text.secondary">
-              Position Count
-            </Typography>
-            <Typography variant="h6">
-              {status.position_count}
-            </Typography>
-          </Box>
-        </Grid>
-        <Grid item xs={6} md={4}>
-          <Box>
-            <Typography variant="body2" color="text.secondary">
-              Average Price
-            </Typography>
-            <Typography variant="h6">
-              ${status.average_price.toFixed(2)}
-            </Typography>
-          </Box>
-        </Grid>
-        <Grid item xs={6} md={4}>
-          <Box>
-            <Typography variant="body2" color="text.secondary">
-              Total Investment
-            </Typography>
-            <Typography variant="h6">
-              ${status.total_investment.toFixed(2)}
-            </Typography>
-          </Box>
-        </Grid>
-        <Grid item xs={6} md={4}>
-          <Box>
-            <Typography variant="body2" color="text.secondary">
-              Unrealized P&L
-            </Typography>
-            <Typography
-              variant="h6"
-              color={status.unrealized_pnl >= 0 ? 'success.main' : 'error.main'}
-            >
+          <Grid container spacing={2}>
+            <Field label="Current Price">${status.current_price.toFixed(2)}</Field>
+            <Field label="Position Count">{status.position_count}</Field>
+            <Field label="Average Price">${status.average_price.toFixed(2)}</Field>
+            <Field label="Total Investment">${status.total_investment.toFixed(2)}</Field>
+            <Field label="Unrealized P&L" color={status.unrealized_pnl >= 0 ? 'success.main' : 'error.main'}>
               ${status.unrealized_pnl.toFixed(2)}
-            </Typography>
-          </Box>
-        </Grid>
-        <Grid item xs={6} md={4}>
-          <Box>
-            <Typography variant="body2" color="text.secondary">
-              Current Division
-            </Typography>
-            <Typography variant="h6">
-              {status.current_division}
-            </Typography>
-          </Box>
-        </Grid>
-        <Grid item xs={6} md={4}>
-          <Box>
-            <Typography variant="body2" color="text.secondary">
-              Last Updated
-            </Typography>
-            <Typography variant="h6">
-              {status.last_updated}
-            </Typography>
-          </Box>
-        </Grid>
-      </Grid>
+            </Field>
+            <Field label="Current Division">{status.current_division}</Field>
+            <Field label="Last Updated">{status.last_updated}</Field>
+          </Grid>
+        </Box>
+      ))}
     </Paper>
   );
 };
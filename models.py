@@ -3,7 +3,7 @@ from dataclasses import dataclass, asdict
 from decimal import Decimal
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class TradingState:
     """매매 상태"""
     cycle_number: int = 1          # 현재 사이클 번호
@@ -37,7 +37,7 @@ class TradingState:
             data['last_updated'] = datetime.fromisoformat(data['last_updated'])
         return cls(**data)
 
-@dataclass
+@dataclass(slots=True)
 class StockBalance:
     """주식 잔고 정보"""
     quantity: Decimal      # 보유 수량
@@ -52,9 +52,11 @@ class StockBalance:
     @property
     def profit_rate(self) -> float:
         """수익률"""
+        if not self.average_price:
+            return 0.0
         return (self.current_price - self.average_price) / self.average_price * 100
 
-@dataclass
+@dataclass(slots=True)
 class OrderTracking:
     order_number: str  # 주문번호
     symbol: str       # 종목코드
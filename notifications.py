@@ -1,21 +1,47 @@
 # notifications.py
 import os
 from telegram import Update
+from telegram.error import RetryAfter
 from telegram.ext import Application, CommandHandler, ContextTypes
 import logging
+import time
 from datetime import datetime
 from dotenv import load_dotenv
 import asyncio
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# 텔레그램 메시지 최대 길이
+MAX_MESSAGE_LENGTH = 4096
+
+
 class TelegramNotifier:
-    def __init__(self):
+    """텔레그램 알림
+
+    send_notification은 메시지를 제한된 크기의 큐에 넣기만 하고 바로 반환한다.
+    백그라운드 작업자가 큐를 비우면서 짧은 시간에 몰린 메시지를 하나로 묶고,
+    전송 간격을 지키며, 실패하면 지수 백오프로 재시도한다.
+    따라서 주문 경로는 텔레그램 응답 속도나 오류에 영향을 받지 않는다.
+    """
+
+    def __init__(self, queue_size: int = 100, batch_window: float = 0.5,
+                 min_interval: float = 1.0, max_retries: int = 5, retry_delay: float = 1.0):
         self.token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.chat_id = os.getenv('TELEGRAM_MY_ID')
         self.application = None
+        self.batch_window = batch_window      # 메시지를 묶어 보낼 대기 시간(초)
+        self.min_interval = min_interval      # 전송 간 최소 간격(초, 채팅방당 초당 1건 제한)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay        # 첫 재시도 대기(초), 실패할 때마다 2배
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._worker: Optional[asyncio.Task] = None
+        self._last_sent = 0.0
+        self.sent = 0
+        self.dropped = 0
 
     async def initialize(self):
         """비동기 초기화"""
@@ -24,73 +50,194 @@ class TelegramNotifier:
         await self.application.initialize()
         await self.application.start()
 
-    async def shutdown(self):
-        """비동기 종료"""
+    async def shutdown(self, timeout: float = 5.0):
+        """비동기 종료 (남은 알림을 timeout 동안 전송한 뒤 작업자 중지)"""
+        if self._worker is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Dropping {self._queue.qsize()} pending notifications on shutdown")
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
         if self.application:
             await self.application.stop()
-            
+
     async def status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """상태 확인 명령어"""
         await update.message.reply_text("봇이 정상 작동중입니다.")
 
     async def send_notification(self, message: str):
-        if not self.application:
-            await self.initialize()
-            
+        """알림 예약 (큐에 넣고 바로 반환, 큐가 가득 차면 버린다)"""
         if not self.chat_id:
             raise ValueError("chat_id is not set")
-            
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
         try:
-            await self.application.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode='HTML'
-            )
-        except Exception as e:
-            raise  # 예외를 상위로 전파
-
-    async def notify_order(self, order_type: str, symbol: str, qty: Optional[Decimal] = None, 
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Notification queue full, dropping message")
+
+    async def flush(self):
+        """예약된 알림이 모두 처리될 때까지 대기"""
+        await self._queue.join()
+
+    async def _run(self):
+        """알림 작업자: 큐에서 메시지를 모아 전송"""
+        while True:
+            messages = await self._collect()
+            try:
+                for text in self._batch(messages):
+                    await self._deliver(text)
+            except Exception as e:
+                logger.error(f"Notification worker error: {e}")
+            finally:
+                for _ in messages:
+                    self._queue.task_done()
+
+    async def _collect(self) -> List[str]:
+        """첫 메시지 이후 batch_window 동안 쌓인 메시지를 함께 꺼낸다"""
+        messages = [await self._queue.get()]
+        if self.batch_window > 0:
+            await asyncio.sleep(self.batch_window)
+        while not self._queue.empty():
+            messages.append(self._queue.get_nowait())
+        return messages
+
+    @staticmethod
+    def _batch(messages: List[str]) -> List[str]:
+        """메시지를 최대 길이 안에서 하나로 합친다"""
+        batches: List[str] = []
+        for message in messages:
+            message = message[:MAX_MESSAGE_LENGTH]
+            if batches and len(batches[-1]) + len(message) + 2 <= MAX_MESSAGE_LENGTH:
+                batches[-1] += "\n\n" + message
+            else:
+                batches.append(message)
+        return batches
+
+    async def _deliver(self, text: str):
+        """전송 간격을 지키며 전송, 실패 시 지수 백오프로 재시도"""
+        delay = self.retry_delay
+        for attempt in range(1, self.max_retries + 1):
+            wait = self._last_sent + self.min_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                if not self.application:
+                    await self.initialize()
+                await self.application.bot.send_message(
+                    chat_id=self.chat_id,
+                    text=text,
+                    parse_mode='HTML'
+                )
+                self._last_sent = time.monotonic()
+                self.sent += 1
+                return
+            except RetryAfter as e:
+                # 텔레그램이 알려준 대기 시간만큼 기다린다
+                retry_after = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") else e.retry_after
+                logger.warning(f"Telegram rate limited, retrying in {retry_after}s")
+                await asyncio.sleep(retry_after)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    break
+                logger.warning(f"Failed to send notification (attempt {attempt}): {e}")
+                await asyncio.sleep(delay)
+                delay *= 2
+        self.dropped += 1
+        logger.error(f"Giving up notification after {self.max_retries} attempts")
+
+    async def notify_order(self, order_type: str, symbol: str, qty: Optional[Decimal] = None,
                          price: Optional[float] = None, amount: Optional[float] = None):
         """주문 관련 알림"""
-        message = f"🔔 <b>{order_type}</b>\n"
-        message += f"종목: {symbol}\n"
-        
-        if qty is not None:
-            message += f"수량: {qty}주\n"
-        if price is not None:
-            message += f"가격: ${price:,.2f}\n"
-        if amount is not None:
-            message += f"금액: ${amount:,.2f}\n"
-            
-        message += f"시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        
-        await self.send_notification(message)
+        await self.send_notification(format_order(order_type, symbol, qty, price, amount))
 
     async def notify_balance(self, account_balance: float, stocks: list):
         """계좌 잔고 알림"""
-        message = "📊 <b>일일 계좌 현황</b>\n\n"
-        message += f"💵 예수금: ${account_balance:,.2f}\n\n"
-        
-        if stocks:
-            message += "📈 보유 주식:\n"
-            for stock in stocks:
-                message += (
-                    f"- {stock['symbol']}: {stock['quantity']}주\n"
-                    f"  평균단가: ${stock['average_price']:,.2f}\n"
-                    f"  현재가: ${stock['current_price']:,.2f}\n"
-                    f"  평가금액: ${stock['total_value']:,.2f}\n"
-                    f"  수익률: {stock['profit_rate']:.2f}%\n\n"
-                )
-        else:
-            message += "보유 주식 없음"
-            
-        await self.send_notification(message)
+        await self.send_notification(format_balance(account_balance, stocks))
+
+    async def notify_daily_report(self, status: dict):
+        """일일 손익 리포트 알림 (BotManager.on_daily_report에 넘기는 상태)"""
+        await self.send_notification(format_daily_report(status))
 
     async def notify_error(self, error: Exception):
         """에러 알림"""
-        message = (
-            f"⚠️ <b>에러 발생</b>\n"
-            f"시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            f"에러: {str(error)}"
+        await self.send_notification(format_error(error))
+
+
+def format_order(order_type: str, symbol: str, qty: Optional[Decimal] = None,
+                 price: Optional[float] = None, amount: Optional[float] = None) -> str:
+    """주문 알림 메시지"""
+    message = f"🔔 <b>{order_type}</b>\n"
+    message += f"종목: {symbol}\n"
+
+    if qty is not None:
+        message += f"수량: {qty}주\n"
+    if price is not None:
+        message += f"가격: ${price:,.2f}\n"
+    if amount is not None:
+        message += f"금액: ${amount:,.2f}\n"
+
+    message += f"시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    return message
+
+
+def format_balance(account_balance: float, stocks: list) -> str:
+    """계좌 잔고 알림 메시지"""
+    message = "📊 <b>일일 계좌 현황</b>\n\n"
+    message += f"💵 예수금: ${account_balance:,.2f}\n\n"
+
+    if stocks:
+        message += "📈 보유 주식:\n"
+        for stock in stocks:
+            message += _format_stock(stock) + "\n"
+    else:
+        message += "보유 주식 없음"
+    return message
+
+
+def _format_stock(stock: dict) -> str:
+    """종목 잔고 항목"""
+    return (
+        f"- {stock['symbol']}: {stock['quantity']}주\n"
+        f"  평균단가: ${stock['average_price']:,.2f}\n"
+        f"  현재가: ${stock['current_price']:,.2f}\n"
+        f"  평가금액: ${stock['total_value']:,.2f}\n"
+        f"  수익률: {stock['profit_rate']:.2f}%\n"
+    )
+
+
+def format_daily_report(status: dict) -> str:
+    """일일 손익 리포트 메시지 (BotManager.get_status() 전체 상태의 손익 지표 사용)"""
+    message = "📊 <b>일일 손익 리포트</b>\n\n"
+    for bot in status.get("bots", {}).values():
+        pnl = bot["pnl"]
+        message += (
+            _format_stock(pnl)
+            + f"  회차: T{bot['current_division']} / 사이클 {pnl['cycle_number']}\n"
+            f"  사이클 수익률: {pnl['cycle_return']:.2f}%\n"
+            f"  실현손익: ${pnl['realized_pnl']:,.2f}\n\n"
         )
-        await self.send_notification(message)
\ No newline at end of file
+    total = status.get("pnl")
+    if total:
+        message += (
+            f"💰 실현손익: ${total['realized_pnl']:,.2f}\n"
+            f"📈 평가손익: ${total['unrealized_pnl']:,.2f}\n"
+            f"📦 노출금액: ${total['exposure']:,.2f}\n"
+            f"📉 최대 낙폭: ${total['max_drawdown']:,.2f}"
+        )
+    return message
+
+
+def format_error(error: Exception) -> str:
+    """에러 알림 메시지"""
+    return (
+        f"⚠️ <b>에러 발생</b>\n"
+        f"시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"에러: {str(error)}"
+    )
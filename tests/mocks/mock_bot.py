@@ -6,8 +6,8 @@ import asyncio
 class MockInfiniteBuyingBot(InfiniteBuyingBot):
     """테스트용 무한매수 봇"""
 
-    def __init__(self, bot_config: BotConfig, trading_config: TradingConfig):
-        super().__init__(bot_config, trading_config)
+    def __init__(self, bot_config: BotConfig, trading_config: TradingConfig, kis_api=None):
+        super().__init__(bot_config, trading_config, kis_api=kis_api)
         self.current_price = 70000  # 삼성전자 시가
         self.position_count = 0
         self.total_investment = 0
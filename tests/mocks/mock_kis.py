@@ -1,17 +1,27 @@
 """Mock classes for testing"""
 import asyncio
-from trading.kis import KisAPI
+from typing import Optional
+
+from backend.app.trading.config import BotConfig
+from backend.app.trading.kis import KisAPI
+from backend.app.trading.kis_client import KisClient
+
 
 class MockKisAPI(KisAPI):
-    """테스트용 KIS API"""
+    """테스트용 KIS API (KisAPI와 같은 생성자, 고정 가격과 모의 잔고)
+
+    장 시간과 체결 규칙까지 필요한 테스트는 simulator.PaperBroker를 사용한다.
+    """
 
-    def __init__(self, app_key: str, app_secret: str, account_number: str, account_code: str):
-        super().__init__(app_key, app_secret, account_number, account_code)
-        self.current_price = 70000  # 모의 가격
+    def __init__(self, bot_config: Optional[BotConfig] = None, quote_window: float = 0.005,
+                 client: Optional[KisClient] = None):
+        super().__init__(bot_config or BotConfig(), quote_window, client)
+        self.test_mode = False
+        self.current_price = 70000.0  # 모의 가격
         self.balance = 10000000  # 모의 잔고
         self.positions = {}  # 모의 포지션
 
-    async def get_current_price(self, symbol: str) -> float:
+    async def _fetch_price(self, symbol: str) -> float:
         """현재가 조회 - 모의 데이터 반환"""
         await asyncio.sleep(0.01)  # API 호출 시뮬레이션
         return self.current_price
@@ -21,21 +31,21 @@ class MockKisAPI(KisAPI):
         await asyncio.sleep(0.01)  # API 호출 시뮬레이션
         return self.balance
 
-    async def buy_market(self, symbol: str, quantity: int) -> bool:
-        """시장가 매수 - 모의 거래"""
+    async def buy_stock(self, symbol: str, quantity: int, price: float, condition: str = "LIMIT") -> bool:
+        """매수 - 모의 거래"""
         await asyncio.sleep(0.01)  # API 호출 시뮬레이션
-        cost = quantity * self.current_price
+        cost = quantity * price
         if cost <= self.balance:
             self.balance -= cost
             self.positions[symbol] = self.positions.get(symbol, 0) + quantity
             return True
         return False
 
-    async def sell_market(self, symbol: str, quantity: int) -> bool:
-        """시장가 매도 - 모의 거래"""
+    async def sell_stock(self, symbol: str, quantity: int, price: float, condition: str = "LIMIT") -> bool:
+        """매도 - 모의 거래"""
         await asyncio.sleep(0.01)  # API 호출 시뮬레이션
         if symbol in self.positions and self.positions[symbol] >= quantity:
             self.positions[symbol] -= quantity
-            self.balance += quantity * self.current_price
+            self.balance += quantity * price
             return True
         return False
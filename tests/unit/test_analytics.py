@@ -0,0 +1,127 @@
+"""증분 손익 엔진 단위 테스트"""
+import random
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+import numpy as np
+
+from backend.app.main import app
+from backend.app.trading.analytics import AnalyticsEngine, PositionAnalytics
+from backend.app.trading.bot_manager import BotManager
+from backend.app.trading.config import BotConfig, TradingConfig
+from backend.app.trading.records import TradeBatch
+from notifications import format_daily_report
+from tests.mocks.mock_kis import MockKisAPI
+from tests.unit.test_records import random_trades
+
+
+class TestPositionAnalytics(unittest.TestCase):
+    """종목 지표 테스트"""
+
+    def test_matches_vectorized_pnl(self):
+        """체결마다 갱신한 실현 손익이 배열 연산 결과와 같다"""
+        trades = random_trades(2000)
+        engine = AnalyticsEngine()
+        for trade in trades:
+            engine.on_trade(trade)
+        batch = TradeBatch.from_records(trades)
+        realized = batch.realized_pnl()
+        symbols = np.array(batch.symbols)[batch.array["symbol"]]
+        for symbol in ("TQQQ", "SOXL"):
+            self.assertAlmostEqual(engine.position(symbol).realized_pnl, realized[symbols == symbol].sum(), places=4)
+            self.assertEqual(engine.position(symbol).quantity, batch.positions()[symbols == symbol][-1])
+        self.assertAlmostEqual(engine.realized_pnl, realized.sum(), places=4)
+
+    def test_drawdown_and_cycle_return(self):
+        """평가 손익, 낙폭, 사이클 수익률"""
+        position = PositionAnalytics("TQQQ")
+        position.on_fill("BUY", 10, 100.0, cycle_number=1)
+        position.on_fill("BUY", 10, 80.0)
+        self.assertEqual(position.average_price, 90.0)
+        position.on_price(110.0)
+        self.assertEqual(position.unrealized_pnl, 400.0)
+        self.assertEqual(position.peak_pnl, 400.0)
+        position.on_price(85.0)
+        self.assertEqual(position.drawdown, 500.0)
+        position.on_price(95.0)
+        self.assertEqual(position.max_drawdown, 500.0)
+        self.assertAlmostEqual(position.profit_rate, 100 / 18)
+
+        position.on_fill("SELL", 20, 99.0)
+        self.assertEqual((position.quantity, position.cost, position.unrealized_pnl), (0, 0.0, 0.0))
+        self.assertEqual(position.realized_pnl, 180.0)
+        self.assertAlmostEqual(position.cycle_return, 10.0)
+        position.on_fill("BUY", 1, 50.0, cycle_number=2)
+        self.assertEqual((position.cycle_number, position.cycle_realized, position.cycle_return), (2, 0.0, 0.0))
+
+    def test_portfolio_totals(self):
+        """합계는 종목 값의 합과 같다"""
+        rng = random.Random(3)
+        engine = AnalyticsEngine()
+        for trade in random_trades(500, seed=3):
+            engine.on_trade(trade)
+            engine.on_price(rng.choice(("TQQQ", "SOXL")), rng.uniform(20, 80))
+        positions = engine.positions
+        self.assertAlmostEqual(engine.unrealized_pnl, sum(p.unrealized_pnl for p in positions), places=6)
+        self.assertAlmostEqual(engine.exposure, sum(p.exposure for p in positions), places=6)
+        self.assertAlmostEqual(engine.realized_pnl, sum(p.realized_pnl for p in positions), places=6)
+        self.assertGreaterEqual(engine.max_drawdown, engine.summary()["drawdown"])
+
+
+class TestManagerAnalytics(unittest.IsolatedAsyncioTestCase):
+    """봇 매니저 연동 테스트"""
+
+    async def asyncSetUp(self):
+        BotManager._instance = None
+        self.manager = BotManager()
+        self.manager._api = MockKisAPI(BotConfig(), 0)
+        self.bot_config = BotConfig(log_dir=tempfile.mkdtemp(), data_dir=tempfile.mkdtemp(), market_schedule=False)
+        await self.manager.initialize_bot(self.bot_config, TradingConfig(
+            symbol="PNLT", total_divisions=40, first_buy_amount=1_000_000, pre_turn_threshold=20,
+            quarter_loss_start=39, trading_interval=0.01))
+        self.bot = self.manager._get_slot("PNLT").bot
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+        BotManager._instance = None
+
+    async def test_fills_and_ticks_feed_outputs(self):
+        """체결/시세 이벤트가 상태, 일일 리포트, 지표에 반영"""
+        await self.bot.run_once(70000.0, time.monotonic())
+        self.manager._on_price("PNLT", 71000.0, time.monotonic())
+        pnl = self.manager.analytics.snapshot("PNLT")
+        self.assertEqual(pnl["quantity"], self.bot.position_count)
+        self.assertEqual(pnl["average_price"], self.bot.average_price)
+        self.assertEqual(pnl["unrealized_pnl"], 1000.0 * self.bot.position_count)
+
+        status = self.manager.get_status()
+        self.assertEqual(status["bots"]["PNLT"]["pnl"]["unrealized_pnl"], pnl["unrealized_pnl"])
+        self.assertIn("PNLT", format_daily_report(status))
+
+        samples = {name: values for name, _, _, values in self.manager._collect_metrics()}
+        self.assertEqual(samples["infinite_bot_unrealized_pnl"], [({"symbol": "PNLT"}, pnl["unrealized_pnl"])])
+
+        self.manager._get_slot("PNLT").is_running = True
+        with patch("backend.app.routers.trading.bot_manager", self.manager):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get("/trading/status", params={"symbol": "PNLT"})
+        body = response.json()["status"]
+        self.assertEqual(body["unrealized_pnl"], pnl["unrealized_pnl"])
+        self.assertEqual(body["position_count"], self.bot.position_count)
+        self.assertEqual(body["current_price"], 71000.0)
+
+    async def test_seed_from_restored_state(self):
+        """재시작 후 복원한 포지션으로 시작"""
+        await self.bot.run_once(70000.0, time.monotonic())
+        position = self.bot.position_count
+        self.manager.analytics = AnalyticsEngine()
+        self.manager._seed_analytics(self.bot)
+        seeded = self.manager.analytics.position("PNLT")
+        self.assertEqual((seeded.quantity, seeded.cost), (position, self.bot.total_investment))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""백테스트 엔진 단위 테스트"""
+import asyncio
+import tempfile
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from backend.app.trading.backtest import (
+    run_backtest, BUY, SELL, REASON_TAKE_PROFIT, REASON_QUARTER_LOSS,
+)
+from backend.app.trading.config import BotConfig, TradingConfig
+from backend.app.trading.infinite_buying_bot import InfiniteBuyingBot
+
+
+def random_walk(n: int, seed: int = 7, start: float = 50.0) -> np.ndarray:
+    """테스트용 종가 경로 생성"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0005, 0.04, n)
+    return start * np.exp(np.cumsum(returns))
+
+
+class TestBacktest(unittest.TestCase):
+    """백테스트 테스트"""
+
+    def setUp(self):
+        self.trading_config = TradingConfig(
+            symbol="TQQQ",
+            total_divisions=40,
+            first_buy_amount=100,
+            pre_turn_threshold=20,
+            quarter_loss_start=39,
+        )
+
+    def replay_live_bot(self, closes: np.ndarray):
+        """라이브 봇의 판단 함수를 봉마다 호출"""
+        bot = InfiniteBuyingBot(BotConfig(log_dir=tempfile.mkdtemp()), self.trading_config)
+        states = []
+
+        async def run():
+            for price in closes:
+                bot.current_price = float(price)
+                await bot._execute_first_buy()
+                await bot._execute_additional_buy()
+                states.append((bot.position_count, bot.current_division, bot.average_price))
+
+        asyncio.run(run())
+        return states
+
+    def test_matches_live_decisions(self):
+        """매수 판단이 라이브 봇과 동일한지 테스트"""
+        closes = random_walk(300)
+        result = run_backtest(closes, self.trading_config, exits=False)
+        states = self.replay_live_bot(closes)
+
+        self.assertEqual(result.position_count.tolist(), [s[0] for s in states])
+        self.assertEqual(result.current_division.tolist(), [s[1] for s in states])
+        np.testing.assert_allclose(result.average_price, [s[2] for s in states])
+
+    def test_matches_live_exits(self):
+        """목표가 매도/쿼터손절을 포함한 판단이 라이브 봇과 동일한지 테스트"""
+        config = self.trading_config.model_copy(update={"total_divisions": 6, "quarter_loss_start": 5})
+        closes = random_walk(400, seed=3)
+        result = run_backtest(closes, config)
+        bot = InfiniteBuyingBot(BotConfig(log_dir=tempfile.mkdtemp()), config)
+
+        async def filled(symbol, quantity, price):
+            return True
+
+        # 주문 속도 제한 없이 즉시 체결
+        bot.kis_api.buy_stock = bot.kis_api.sell_stock = filled
+        actions = []
+        bot.on_trade = lambda trade: actions.append(trade["action"])
+        states = []
+
+        async def run():
+            for price in closes:
+                await bot.run_once(float(price))
+                states.append((bot.position_count, bot.current_division))
+
+        asyncio.run(run())
+        self.assertIn("SELL", actions)
+        self.assertEqual(list(zip(result.position_count.tolist(), result.current_division.tolist())), states)
+
+    def test_take_profit_resets_cycle(self):
+        """목표가 매도 후 사이클 리셋 테스트"""
+        closes = np.array([50.0, 45.0, 40.0, 60.0, 60.0])
+        result = run_backtest(closes, self.trading_config)
+
+        sells = result.fills[result.fills["side"] == SELL]
+        self.assertEqual(len(sells), 1)
+        self.assertEqual(sells[0]["reason"], REASON_TAKE_PROFIT)
+        self.assertEqual(result.cycles_completed, 1)
+        self.assertEqual(result.position_count[3], 0)
+        self.assertEqual(result.cycle_number[4], 2)
+        self.assertGreater(result.realized_pnl[-1], 0)
+
+    def test_quarter_loss(self):
+        """쿼터손절 회차 도달 시 1/4 매도 테스트"""
+        config = self.trading_config.model_copy(update={"total_divisions": 5, "quarter_loss_start": 4})
+        closes = np.linspace(50, 30, 10)
+        result = run_backtest(closes, config)
+
+        stops = result.fills[result.fills["reason"] == REASON_QUARTER_LOSS]
+        self.assertGreater(len(stops), 0)
+        self.assertTrue((result.current_division <= config.total_divisions).all())
+
+    def test_dataframe_input(self):
+        """DataFrame 입력 테스트"""
+        closes = random_walk(50)
+        index = pd.bdate_range("2015-01-02", periods=len(closes))
+        frame = pd.DataFrame({"Open": closes, "High": closes, "Low": closes, "Close": closes}, index=index)
+        result = run_backtest(frame, self.trading_config)
+
+        self.assertEqual(len(result.to_frame()), len(closes))
+        fills = result.fills_frame()
+        self.assertEqual(fills["side"].iloc[0], BUY)
+        self.assertEqual(fills["timestamp"].iloc[0], index[0])
+
+    def test_decade_runs_under_a_second(self):
+        """10년치 일봉 처리 시간 테스트"""
+        closes = random_walk(252 * 12)
+        started = time.perf_counter()
+        result = run_backtest(closes, self.trading_config)
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 1.0)
+        self.assertLessEqual(result.max_drawdown(), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
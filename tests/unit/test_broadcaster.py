@@ -0,0 +1,89 @@
+"""봇 상태 푸시 단위 테스트"""
+import asyncio
+import json
+import unittest
+
+from backend.app.trading.broadcaster import REMOVED_KEY, StatusBroadcaster, diff_status
+
+
+def parse(frame: bytes):
+    event, data = frame.decode().strip().split("\n")
+    return event[len("event: "):], json.loads(data[len("data: "):])
+
+
+class TestStatusBroadcaster(unittest.IsolatedAsyncioTestCase):
+    """상태 푸시 테스트"""
+
+    def setUp(self):
+        self.status = {"is_running": False, "bots": {"TQQQ": {"current_price": 50.0, "position_count": 0}}}
+        self.status_calls = 0
+
+    def status_fn(self):
+        self.status_calls += 1
+        return json.loads(json.dumps(self.status))
+
+    def test_diff_status(self):
+        """중첩 상태 차이 계산 테스트"""
+        old = {"is_running": False, "bots": {"TQQQ": {"price": 1, "count": 2}, "SOXL": {"price": 3}}}
+        new = {"is_running": True, "bots": {"TQQQ": {"price": 1, "count": 3}}}
+        self.assertEqual(diff_status(old, new),
+                         {"is_running": True, "bots": {"TQQQ": {"count": 3}, REMOVED_KEY: ["SOXL"]}})
+        self.assertEqual(diff_status(new, new), {})
+        # 값이 None으로 바뀐 키는 삭제와 구분된다
+        self.assertEqual(diff_status({"price": 1.0}, {"price": None}), {"price": None})
+
+    async def test_no_work_without_subscribers(self):
+        """구독자가 없으면 상태를 만들지 않는지 테스트"""
+        broadcaster = StatusBroadcaster(self.status_fn, min_interval=0)
+        broadcaster.notify()
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.status_calls, 0)
+
+    async def test_fan_out_serializes_once(self):
+        """변경분을 한 번만 직렬화해 모든 구독자에게 보내는지 테스트"""
+        broadcaster = StatusBroadcaster(self.status_fn, min_interval=0)
+        subscribers = [broadcaster.subscribe() for _ in range(50)]
+        self.status["bots"]["TQQQ"]["current_price"] = 51.0
+        broadcaster.notify()
+        await asyncio.sleep(0.01)
+        # 변경 없는 알림은 전송하지 않는다
+        broadcaster.notify()
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(broadcaster.serializations, 2)  # 스냅샷 1 + 변경분 1
+        for subscriber in subscribers:
+            self.assertEqual(parse(subscriber.queue.get_nowait())[0], "snapshot")
+            event, data = parse(subscriber.queue.get_nowait())
+            self.assertEqual((event, data), ("delta", {"bots": {"TQQQ": {"current_price": 51.0}}}))
+            self.assertTrue(subscriber.queue.empty())
+        for subscriber in subscribers:
+            broadcaster.unsubscribe(subscriber)
+        self.assertIsNone(broadcaster._task)
+
+    async def test_slow_subscriber_gets_snapshot(self):
+        """느린 구독자는 밀린 변경분 대신 스냅샷을 받는지 테스트"""
+        broadcaster = StatusBroadcaster(self.status_fn, min_interval=0, queue_size=3)
+        slow = broadcaster.subscribe()
+        fast = broadcaster.subscribe()
+        for price in range(1, 11):
+            self.status["bots"]["TQQQ"]["current_price"] = float(price)
+            broadcaster.publish()
+            while not fast.queue.empty():
+                fast.queue.get_nowait()
+
+        frames = []
+        async for frame in broadcaster.frames(slow):
+            frames.append(parse(frame))
+            if slow.queue.empty():
+                break
+        # 넘친 변경분은 버리고 최신 스냅샷부터 다시 이어 받는다
+        self.assertEqual([event for event, _ in frames], ["snapshot", "delta", "delta"])
+        self.assertEqual(frames[0][1]["bots"]["TQQQ"]["current_price"], 8.0)
+        self.assertEqual(frames[-1][1], {"bots": {"TQQQ": {"current_price": 10.0}}})
+        self.assertGreater(slow.dropped, 0)
+        broadcaster.unsubscribe(slow)
+        broadcaster.unsubscribe(fast)
+
+
+if __name__ == '__main__':
+    unittest.main()
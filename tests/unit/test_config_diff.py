@@ -0,0 +1,128 @@
+"""설정 변경 적용 단위 테스트"""
+import asyncio
+import tempfile
+import time
+import unittest
+
+from backend.app.trading.bot_manager import BotManager
+from backend.app.trading.config import BotConfig, TradingConfig
+from backend.app.trading.config_diff import diff_bot_config, diff_trading_config
+from tests.mocks.mock_kis import MockKisAPI
+
+
+def trading_config(**overrides) -> TradingConfig:
+    values = dict(symbol="TQQQ", total_divisions=40, first_buy_amount=1_000_000, pre_turn_threshold=20,
+                  quarter_loss_start=39, trading_interval=0.01)
+    values.update(overrides)
+    return TradingConfig(**values)
+
+
+class TestConfigDiff(unittest.TestCase):
+    """변경 분류 테스트"""
+
+    def test_trading_fields(self):
+        """사이클 변수는 사이클 진행 중이면 다음 사이클로 미룬다"""
+        old = trading_config()
+        new = trading_config(trading_interval=2.0, total_divisions=20)
+        diff = diff_trading_config(old, new, cycle_open=True)
+        self.assertEqual((diff.applied, diff.staged), (["trading_interval"], ["total_divisions"]))
+        diff = diff_trading_config(old, new, cycle_open=False)
+        self.assertEqual(sorted(diff.applied), ["total_divisions", "trading_interval"])
+        self.assertIn("symbol", diff_trading_config(old, trading_config(symbol="SOXL"), False).rejected)
+
+    def test_bot_fields(self):
+        """세션을 다시 만들어야 하는 봇 설정은 거부"""
+        diff = diff_bot_config(BotConfig(), BotConfig(is_running=True, quote_ttl=1.0, app_key="key"))
+        self.assertEqual(diff.applied, ["quote_ttl"])
+        self.assertEqual(list(diff.rejected), ["app_key"])
+
+
+class TestHotReload(unittest.IsolatedAsyncioTestCase):
+    """실행 중인 봇 설정 변경 테스트"""
+
+    async def asyncSetUp(self):
+        BotManager._instance = None
+        self.manager = BotManager()
+        self.api = MockKisAPI(BotConfig(), 0)
+        self.manager._api = self.api
+        self.bot_config = BotConfig(log_dir=tempfile.mkdtemp(), data_dir=tempfile.mkdtemp(), market_schedule=False)
+        await self.manager.initialize_bot(self.bot_config, trading_config())
+        self.bot = self.manager._get_slot("TQQQ").bot
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+        BotManager._instance = None
+
+    async def test_update_keeps_bot_and_position(self):
+        """봇을 다시 만들지 않고 포지션을 유지한 채 적용"""
+        await self.bot.run_once(70000.0, time.monotonic())
+        self.assertEqual(self.bot.position_count, 14)
+
+        started = time.perf_counter()
+        diff = await self.manager.update_config(self.bot_config, trading_config(trading_interval=5.0,
+                                                                                total_divisions=20))
+        self.assertLess(time.perf_counter() - started, 0.01)
+        self.assertIs(self.manager._get_slot("TQQQ").bot, self.bot)
+        self.assertEqual(self.bot.position_count, 14)
+        self.assertEqual(diff.applied, ["trading_interval"])
+        self.assertEqual(diff.staged, ["total_divisions"])
+        self.assertEqual(self.bot.trading_config.trading_interval, 5.0)
+        self.assertEqual(self.bot.trading_config.total_divisions, 40)
+        self.assertEqual(self.bot.cycle_ladder().total_divisions, 40)
+
+        # 사이클이 끝난 뒤 첫 매매 판단에서 미뤄둔 설정 적용
+        await self.bot.run_once(80000.0, time.monotonic())
+        self.assertEqual(self.bot.position_count, 0)
+        await self.bot.run_once(70000.0, time.monotonic())
+        self.assertEqual(self.bot.trading_config.total_divisions, 20)
+        self.assertEqual(self.bot.cycle_ladder().total_divisions, 20)
+        self.assertEqual(self.bot.staged_config, {})
+
+    async def test_update_during_tick_waits_for_boundary(self):
+        """매매 판단 중 들어온 설정은 판단이 끝난 직후 적용"""
+        entered, release = asyncio.Event(), asyncio.Event()
+        original = self.api.buy_stock
+
+        async def slow_buy(*args, **kwargs):
+            entered.set()
+            await release.wait()
+            return await original(*args, **kwargs)
+
+        self.api.buy_stock = slow_buy
+        tick = asyncio.create_task(self.bot.run_once(70000.0, time.monotonic()))
+        await entered.wait()
+        await self.manager.update_config(self.bot_config, trading_config(exits=False))
+        self.assertTrue(self.bot.trading_config.exits)
+
+        release.set()
+        await tick
+        self.assertFalse(self.bot.trading_config.exits)
+        self.assertEqual(self.bot.position_count, 14)
+
+    async def test_rejected_update_changes_nothing(self):
+        """거부된 변경이 있으면 아무것도 적용하지 않는다"""
+        new_config = self.bot_config.model_copy(update={"data_dir": tempfile.mkdtemp(), "quote_ttl": 3.0})
+        diff = await self.manager.update_config(new_config, trading_config(trading_interval=5.0))
+        self.assertFalse(diff.ok)
+        self.assertIn("data_dir", diff.rejected)
+        self.assertEqual(self.bot.trading_config.trading_interval, 0.01)
+        self.assertEqual(self.api.quote_cache.ttl, BotConfig().quote_ttl)
+
+    async def test_shared_components_updated(self):
+        """시세 캐시와 호출 한도는 공유 세션에 바로 반영"""
+        new_config = self.bot_config.model_copy(update={"quote_ttl": 2.0, "api_rate_limit": 5.0, "api_burst": 5.0})
+        diff = await self.manager.update_config(new_config, trading_config())
+        self.assertTrue(diff.ok)
+        self.assertEqual(self.api.quote_cache.ttl, 2.0)
+        self.assertEqual(self.api.scheduler.bucket.rate, 5.0)
+        self.assertLessEqual(self.api.scheduler.bucket.tokens, 5.0)
+        self.assertIs(self.bot.bot_config, new_config)
+
+    async def test_new_symbol_initializes_bot(self):
+        """등록되지 않은 종목은 새 봇 생성"""
+        await self.manager.update_config(self.bot_config, trading_config(symbol="SOXL"))
+        self.assertEqual(sorted(self.manager.symbols), ["SOXL", "TQQQ"])
+
+
+if __name__ == '__main__':
+    unittest.main()
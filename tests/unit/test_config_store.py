@@ -0,0 +1,83 @@
+"""설정 저장소 단위 테스트"""
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from backend.app.trading.config_store import ConfigStore
+
+
+class TestConfigStore(unittest.IsolatedAsyncioTestCase):
+    """debounce 및 원자적 기록 테스트"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "config.json")
+        self.store = ConfigStore(self.path, debounce=0.01, history=3)
+
+    def tearDown(self):
+        self.store.close()
+
+    def read(self):
+        with open(self.path) as f:
+            return json.load(f)
+
+    async def test_debounced_writes_off_loop(self):
+        """연속 저장은 마지막 값 한 번만 기록하고 기록은 전용 스레드에서"""
+        threads = []
+        original = self.store._write_atomic
+        self.store._write_atomic = lambda *args: (threads.append(threading.current_thread()), original(*args))
+        for i in range(100):
+            self.store.save({"value": i})
+        self.assertFalse(os.path.exists(self.path))
+
+        await asyncio.sleep(0.05)
+        await self.store.flush()
+        self.assertEqual(self.read(), {"value": 99})
+        self.assertEqual((self.store.requests, self.store.writes), (100, 1))
+        self.assertNotIn(threading.current_thread(), threads)
+
+    async def test_unchanged_config_not_rewritten(self):
+        """내용이 같으면 파일을 다시 쓰지 않는다"""
+        self.store.save({"value": 1})
+        await self.store.flush()
+        self.store.save({"value": 1})
+        await self.store.flush()
+        self.assertEqual(self.store.writes, 1)
+
+    def test_history_versions(self):
+        """바뀔 때마다 버전 사본을 남기고 history개만 보관"""
+        for i in range(5):
+            self.store.save({"value": i})
+        self.assertEqual(self.store.versions(), [3, 4, 5])
+        with open(self.store.history_path(4)) as f:
+            self.assertEqual(json.load(f), {"value": 3})
+
+        # 다시 열면 버전 번호를 이어간다
+        reopened = ConfigStore(self.path, history=3)
+        reopened.save({"value": 5})
+        self.assertEqual(reopened.version, 6)
+        reopened.close()
+
+    def test_crash_mid_write_keeps_previous(self):
+        """rename 전에 중단되면 이전 설정이 그대로 남는다"""
+        self.store.save({"value": 1})
+        with patch("backend.app.trading.config_store.os.replace", side_effect=OSError("crash")):
+            with self.assertRaises(OSError):
+                self.store.save({"value": 2})
+        self.assertEqual(self.read(), {"value": 1})
+        self.assertEqual(ConfigStore(self.path).load(), {"value": 1})
+
+    def test_corrupt_file_falls_back_to_history(self):
+        """설정 파일이 손상되면 가장 최근 버전 사본을 로드"""
+        self.store.save({"value": 1})
+        with open(self.path, "w") as f:
+            f.write('{"value": ')
+        self.assertEqual(self.store.load(), {"value": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""거래 저널 단위 테스트"""
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+
+from backend.app.trading.journal import TradeJournal
+
+
+def trade(i: int, symbol: str = "TQQQ"):
+    return {
+        "timestamp": datetime(2024, 1, 1, 9, 30, i % 60),
+        "symbol": symbol,
+        "action": "BUY",
+        "price": 50.0 + i,
+        "quantity": i,
+        "division": i,
+        "total_amount": (50.0 + i) * i,
+    }
+
+
+class TestTradeJournal(unittest.IsolatedAsyncioTestCase):
+    """거래 저널 테스트"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    async def test_batched_writes(self):
+        """여러 거래를 한 번의 fsync로 기록하는지 테스트"""
+        journal = TradeJournal(self.directory, flush_interval=0.01)
+        for i in range(50):
+            journal.append(trade(i))
+        # 기록 전에도 조회 가능
+        self.assertEqual(journal.read(limit=1, offset=49)[0]["quantity"], 49)
+        self.assertEqual(journal.metrics()["unflushed"], 50)
+
+        await journal.flush()
+        self.assertEqual(journal.metrics()["unflushed"], 0)
+        self.assertEqual(journal.fsyncs, 1)
+        await journal.close()
+
+    async def test_seek_old_trades(self):
+        """링 버퍼 밖의 거래를 여러 세그먼트에서 읽는지 테스트"""
+        journal = TradeJournal(self.directory, ring_size=10, segment_bytes=2048, flush_interval=0)
+        for i in range(200):
+            journal.append(trade(i, "SOXL" if i % 2 else "TQQQ"))
+        await journal.flush()
+        self.assertGreater(journal.metrics()["segments"], 1)
+
+        page = journal.read(limit=30, offset=100)
+        self.assertEqual([t["quantity"] for t in page], list(range(100, 130)))
+        soxl = journal.read("SOXL", limit=5, offset=10)
+        self.assertEqual([t["quantity"] for t in soxl], [21, 23, 25, 27, 29])
+        self.assertEqual([t["quantity"] for t in journal.tail(3, "TQQQ")], [194, 196, 198])
+        self.assertEqual(journal.read(limit=5, offset=500), [])
+        await journal.close()
+
+    async def test_recover_after_restart(self):
+        """재시작 후 인덱스 복원 및 잘린 레코드 제거 테스트"""
+        journal = TradeJournal(self.directory, ring_size=5, flush_interval=0)
+        for i in range(20):
+            journal.append(trade(i))
+        await journal.close()
+        # 기록 중 중단된 레코드
+        with open(journal._segments[-1], "ab") as f:
+            f.write(b'{"symbol": "TQ')
+
+        reopened = TradeJournal(self.directory, ring_size=5)
+        self.assertEqual(reopened.size(), 20)
+        self.assertEqual(reopened.size("TQQQ"), 20)
+        self.assertEqual(reopened.read(limit=2, offset=3)[1]["timestamp"], "2024-01-01T09:30:04")
+        reopened.append(trade(20))
+        await reopened.close()
+        self.assertEqual(TradeJournal(self.directory).size(), 21)
+
+    async def test_reads_during_segment_rollover(self):
+        """쓰기 스레드가 세그먼트를 바꾸는 중에도 조회 인덱스는 기록이 끝난 뒤에만 바뀌는지 테스트"""
+        journal = TradeJournal(self.directory, ring_size=1, segment_bytes=1024, flush_interval=0)
+        for i in range(20):
+            journal.append(trade(i))
+        await journal.flush()
+        segments, flushed = list(journal._segments), journal.size()
+
+        rolled, release = threading.Event(), threading.Event()
+        next_segment = journal._next_segment
+
+        def slow_next_segment():
+            next_segment()
+            rolled.set()
+            release.wait(5)
+
+        journal._next_segment = slow_next_segment
+        for i in range(20, 40):
+            journal.append(trade(i))
+        await asyncio.to_thread(rolled.wait, 5)
+        # 쓰기 스레드가 새 세그먼트로 넘어갔어도 조회 인덱스는 그대로
+        self.assertEqual(journal._segments, segments)
+        self.assertEqual([t["quantity"] for t in journal.read(limit=flushed)], list(range(flushed)))
+        release.set()
+        await journal.flush()
+        self.assertGreater(len(journal._segments), len(segments))
+        self.assertEqual([t["quantity"] for t in journal.read()], list(range(40)))
+        await journal.close()
+
+    async def test_flush_gives_up_on_write_errors(self):
+        """디스크 오류가 계속되면 flush가 제한 시간 후 오류를 내고 close는 끝나는지 테스트"""
+        journal = TradeJournal(self.directory, flush_interval=0.01)
+
+        def failing_write(lines, start):
+            raise OSError("disk full")
+
+        journal._write = failing_write
+        journal.append(trade(1))
+        with self.assertLogs("backend.app.trading.journal", "ERROR"):
+            with self.assertRaises(TimeoutError) as raised:
+                await journal.flush(timeout=0.1)
+            self.assertIsInstance(raised.exception.__cause__, OSError)
+            await asyncio.wait_for(journal.close(timeout=0.1), 1)
+
+    def test_append_without_loop(self):
+        """이벤트 루프 밖에서는 바로 기록하는지 테스트"""
+        journal = TradeJournal(self.directory)
+        journal.append(trade(1))
+        self.assertEqual(journal.metrics()["unflushed"], 0)
+        self.assertGreater(os.path.getsize(journal._segments[-1]), 0)
+        asyncio.run(journal.close())
+
+
+if __name__ == '__main__':
+    unittest.main()
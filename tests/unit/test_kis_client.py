@@ -0,0 +1,136 @@
+"""한국투자증권 REST 클라이언트 단위 테스트"""
+import asyncio
+import time
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from backend.app.trading.config import BotConfig
+from backend.app.trading.kis import KisAPI
+from backend.app.trading.kis_client import KisClient, KisAPIError
+
+
+class FakeKisServer:
+    """한국투자증권 API 모의 서버"""
+
+    def __init__(self):
+        self.token_calls = 0
+        self.token_delay = 0.0
+        self.expires_in = 86400
+        self.peers = set()
+        self.orders = []
+        app = web.Application()
+        app.router.add_post("/oauth2/tokenP", self.token)
+        app.router.add_get("/uapi/overseas-price/v1/quotations/price", self.price)
+        app.router.add_post("/uapi/overseas-stock/v1/trading/order", self.order)
+        app.router.add_get("/uapi/overseas-stock/v1/trading/inquire-ccnl", self.executions)
+        self.server = TestServer(app)
+        self.execution_pages = []
+
+    async def token(self, request):
+        self.token_calls += 1
+        await asyncio.sleep(self.token_delay)
+        return web.json_response({"access_token": f"token{self.token_calls}", "expires_in": self.expires_in})
+
+    async def price(self, request):
+        self.peers.add(request.transport.get_extra_info("peername"))
+        assert request.headers["authorization"].startswith("Bearer token")
+        return web.json_response({"rt_cd": "0", "output": {"last": "45.67"}})
+
+    async def order(self, request):
+        body = await request.json()
+        self.orders.append((request.headers["tr_id"], body))
+        if int(body["ORD_QTY"]) > 100:
+            return web.json_response({"rt_cd": "1", "msg_cd": "APBK0952", "msg1": "주문가능금액을 초과"})
+        return web.json_response({"rt_cd": "0", "output": {"ODNO": "0000001"}})
+
+    async def executions(self, request):
+        """체결 조회 (한 페이지에 2건씩, 연속 조회 키로 다음 페이지)"""
+        page = int(request.query["CTX_AREA_NK200"] or 0)
+        self.execution_pages.append((page, request.headers.get("tr_cont", "")))
+        rows = [{"odno": f"{i:04d}", "ft_ccld_qty": "1", "ft_ccld_unpr3": "45.0", "nccs_qty": "0"}
+                for i in range(page * 2, min(page * 2 + 2, 5))]
+        more = page * 2 + 2 < 5
+        return web.json_response(
+            {"rt_cd": "0", "output": rows, "ctx_area_nk200": str(page + 1), "ctx_area_fk200": "fk"},
+            headers={"tr_cont": "M" if more else "D"},
+        )
+
+
+class TestKisClient(unittest.IsolatedAsyncioTestCase):
+    """REST 클라이언트 테스트"""
+
+    async def asyncSetUp(self):
+        self.fake = FakeKisServer()
+        await self.fake.server.start_server()
+        self.bot_config = BotConfig(
+            app_key="key", app_secret="secret", account_number="12345678-01",
+            api_rate_limit=1000, api_burst=1000, quote_ttl=0,
+        )
+        self.client = KisClient(self.bot_config, base_url=str(self.fake.server.make_url("/")))
+        self.api = KisAPI(self.bot_config, client=self.client)
+
+    async def asyncTearDown(self):
+        await self.api.close()
+        await self.fake.server.close()
+
+    async def test_session_and_token_reused(self):
+        """세션 연결과 토큰 재사용 테스트"""
+        self.assertFalse(self.api.test_mode)
+        for _ in range(10):
+            self.assertEqual(await self.api.get_current_price("TQQQ"), 45.67)
+
+        self.assertEqual(self.fake.token_calls, 1)
+        self.assertEqual(len(self.fake.peers), 1)
+
+    async def test_concurrent_first_requests_issue_one_token(self):
+        """첫 동시 요청이 토큰 발급을 한 번만 하는지 테스트"""
+        await asyncio.gather(*(self.client.access_token() for _ in range(5)))
+        self.assertEqual(self.fake.token_calls, 1)
+
+    async def test_refresh_does_not_block_requests(self):
+        """만료 임박 토큰 갱신이 요청을 막지 않는지 테스트"""
+        self.fake.expires_in = 300
+        await self.client.access_token()
+        self.fake.token_delay = 0.3
+
+        started = time.monotonic()
+        token = await self.client.access_token()
+        self.assertLess(time.monotonic() - started, 0.1)
+        self.assertEqual(token, "token1")
+
+        await asyncio.sleep(0.4)
+        self.assertEqual(await self.client.access_token(), "token2")
+
+    async def test_orders(self):
+        """주문 요청 및 거부 처리 테스트"""
+        self.assertTrue(await self.api.buy_stock("TQQQ", 10, 45.5, condition="LOC"))
+        tr_id, body = self.fake.orders[0]
+        self.assertEqual(tr_id, "VTTT1002U")
+        self.assertEqual(body["CANO"], "12345678")
+        self.assertEqual(body["OVRS_EXCG_CD"], "NASD")
+        self.assertEqual(body["ORD_DVSN"], "34")
+        self.assertEqual(body["OVRS_ORD_UNPR"], "45.50")
+
+        self.assertTrue(await self.api.sell_stock("TQQQ", 5, 50.0, condition="MOC"))
+        self.assertEqual(self.fake.orders[1][1]["OVRS_ORD_UNPR"], "0")
+
+        self.assertFalse(await self.api.buy_stock("TQQQ", 1000, 45.5))
+
+    async def test_executions_follow_continuation(self):
+        """체결 조회가 연속 조회 키로 마지막 페이지까지 이어지는지 테스트"""
+        executions = await self.api.order_executions()
+        self.assertEqual(sorted(executions), [f"{i:04d}" for i in range(5)])
+        self.assertEqual(self.fake.execution_pages, [(0, ""), (1, "N"), (2, "N")])
+        self.assertFalse(executions["0004"].open)
+
+    async def test_error_response(self):
+        """오류 응답 예외 테스트"""
+        with self.assertRaises(KisAPIError):
+            await self.client.request("POST", "/uapi/overseas-stock/v1/trading/order", "VTTT1002U",
+                                      body={"ORD_QTY": "1000"})
+
+
+if __name__ == '__main__':
+    unittest.main()
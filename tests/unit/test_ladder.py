@@ -0,0 +1,54 @@
+"""LOC 주문 사다리 단위 테스트"""
+import unittest
+
+import numpy as np
+
+from backend.app.trading import strategy
+from backend.app.trading.config import TradingConfig
+from backend.app.trading.ladder import build_ladder
+
+
+class TestLocLadder(unittest.TestCase):
+    """LOC 주문 사다리 테스트"""
+
+    def setUp(self):
+        self.config = TradingConfig(
+            symbol="TQQQ",
+            total_divisions=40,
+            first_buy_amount=250,
+            pre_turn_threshold=20,
+            quarter_loss_start=39,
+        )
+        self.ladder = build_ladder(self.config)
+
+    def test_matches_strategy(self):
+        """회차별 값이 strategy 함수와 같은지 테스트"""
+        for turn in np.arange(0, self.config.total_divisions + 0.5, 0.5):
+            self.assertEqual(self.ladder.loc_percent[int(turn * 2)], strategy.loc_percent(self.config, turn))
+            self.assertEqual(self.ladder.sell_price(turn, 45.67),
+                             strategy.sell_target_price(self.config, turn, 45.67))
+            self.assertEqual(self.ladder.is_quarter_loss(turn), strategy.is_quarter_loss_turn(self.config, turn))
+        # 10 - T/2 공식
+        self.assertEqual(self.ladder.loc_percent[10], 7.5)
+
+    def test_half_turns(self):
+        """0.5 회차는 자체 값을 쓰고, 범위 밖은 양 끝 값, 0.5 단위가 아닌 회차는 거부"""
+        self.assertEqual(self.ladder.loc_percent[3], strategy.loc_percent(self.config, 1.5))
+        self.assertEqual(self.ladder.is_quarter_loss(45), True)
+        self.assertEqual(self.ladder.sell_price(1.5, 40.0), strategy.sell_target_price(self.config, 1.5, 40.0))
+        with self.assertRaises(ValueError):
+            self.ladder.sell_price(2.3, 40.0)
+
+    def test_export(self):
+        """사다리 내보내기 테스트"""
+        frame = self.ladder.to_frame()
+        self.assertEqual(len(frame), 81)
+        self.assertEqual(frame.loc[20, "loc_percent"], 0)
+        self.assertEqual(frame.loc[19.5, "sell_multiplier"], 1 + strategy.loc_percent(self.config, 19.5) / 100)
+        exported = self.ladder.to_dict()
+        self.assertEqual(exported["turns"][1]["turn"], 0.5)
+        self.assertEqual(exported["turns"][78]["quarter_loss"], True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""로그 파이프라인 단위 테스트"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import unittest
+
+from backend.app.trading import log_pipeline
+from backend.app.trading.config import BotConfig, TradingConfig
+from backend.app.trading.infinite_buying_bot import InfiniteBuyingBot
+from backend.app.trading.log_pipeline import _PipelineHandler, get_logger
+from tests.mocks.mock_kis import MockKisAPI
+
+
+def read_records(path: str):
+    """JSON 로그 레코드 목록"""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestLogPipeline(unittest.TestCase):
+    """큐 기반 로거 테스트"""
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        log_pipeline.flush()
+
+    def test_json_records_written_off_thread(self):
+        """레코드는 리스너 스레드가 JSON 한 줄로 기록"""
+        logger = get_logger("test.pipeline.json", self.log_dir, "app.log")
+        threads = []
+        handler = logger.handlers[0]
+        original = handler.enqueue
+        handler.enqueue = lambda record: (threads.append(threading.current_thread()), original(record))
+        logger.info("Order %s sent", "0001", extra={"symbol": "TQQQ"})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Order failed")
+        log_pipeline.flush()
+
+        records = read_records(os.path.join(self.log_dir, "app.log"))
+        self.assertEqual(records[0]["message"], "Order 0001 sent")
+        self.assertEqual(records[0]["symbol"], "TQQQ")
+        self.assertEqual(records[0]["level"], "INFO")
+        self.assertIn("ValueError: boom", records[1]["exception"])
+        # 호출 스레드는 큐에 넣기만 한다
+        self.assertEqual(threads, [threading.current_thread()] * 2)
+        self.assertIsNotNone(log_pipeline._listener)
+
+    def test_repeated_setup_is_idempotent(self):
+        """같은 설정으로 여러 번 호출해도 핸들러와 기록이 늘지 않는다"""
+        for _ in range(3):
+            logger = get_logger("test.pipeline.idempotent", self.log_dir, "app.log")
+        self.assertEqual(len(logger.handlers), 1)
+        logger.info("once")
+        log_pipeline.flush()
+        self.assertEqual(len(read_records(os.path.join(self.log_dir, "app.log"))), 1)
+
+    def test_switch_file_releases_previous(self):
+        """다른 파일로 바꾸면 이전 파일은 남은 레코드를 쓴 뒤 닫힌다"""
+        other = tempfile.mkdtemp()
+        logger = get_logger("test.pipeline.switch", self.log_dir, "app.log")
+        logger.info("first")
+        get_logger("test.pipeline.switch", other, "app.log")
+        logger.info("second")
+        log_pipeline.flush()
+
+        self.assertEqual([r["message"] for r in read_records(os.path.join(self.log_dir, "app.log"))], ["first"])
+        self.assertEqual([r["message"] for r in read_records(os.path.join(other, "app.log"))], ["second"])
+        self.assertNotIn(os.path.abspath(os.path.join(self.log_dir, "app.log")), log_pipeline._outputs)
+
+    def test_size_rotation(self):
+        """max_bytes를 넘으면 파일 교체"""
+        logger = get_logger("test.pipeline.rotate", self.log_dir, "app.log", max_bytes=500, backup_count=2)
+        for i in range(20):
+            logger.info(f"line {i}")
+        log_pipeline.flush()
+        self.assertTrue(os.path.exists(os.path.join(self.log_dir, "app.log.1")))
+        self.assertEqual(read_records(os.path.join(self.log_dir, "app.log"))[-1]["message"], "line 19")
+
+
+class TestBotLogging(unittest.TestCase):
+    """봇 로거 테스트"""
+
+    def test_bot_rebuild_keeps_single_handler(self):
+        """봇을 여러 번 다시 만들어도 큐 핸들러는 하나"""
+        config = BotConfig(log_dir=tempfile.mkdtemp())
+        trading_config = TradingConfig(symbol="TQQQ", total_divisions=40, first_buy_amount=500,
+                                       pre_turn_threshold=20, quarter_loss_start=39)
+        api = MockKisAPI(config, 0)
+        for _ in range(5):
+            bot = InfiniteBuyingBot(config, trading_config, kis_api=api)
+        handlers = [h for h in bot.logger.handlers if isinstance(h, _PipelineHandler)]
+        self.assertEqual(len(handlers), 1)
+        self.assertFalse(any(isinstance(h, logging.FileHandler) for h in bot.logger.handlers))
+
+        bot.logger.info("rebuilt")
+        log_pipeline.flush()
+        records = read_records(os.path.join(config.log_dir, "trading.log"))
+        self.assertEqual([r["message"] for r in records].count("rebuilt"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
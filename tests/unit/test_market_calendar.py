@@ -0,0 +1,212 @@
+"""시장 달력 및 장 일정 스케줄러 단위 테스트"""
+import asyncio
+import tempfile
+import os
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from backend.app.main import start_notifier
+
+from backend.app.trading.bot_manager import BotManager
+from backend.app.trading.config import BotConfig, TradingConfig
+from backend.app.trading.kis import KisAPI
+from backend.app.trading.market_calendar import (
+    DAILY_REPORT, ET, POST_CLOSE, WINDOW_CLOSE, WINDOW_OPEN,
+    MarketCalendar, MarketScheduler, nyse_early_closes, nyse_holidays,
+)
+
+
+class FakeClock:
+    """sleep 호출 시 시간이 흐르는 가짜 시계"""
+
+    def __init__(self, now: datetime):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += timedelta(seconds=seconds)
+        await asyncio.sleep(0)
+
+
+class TestMarketCalendar(unittest.TestCase):
+    """시장 달력 테스트"""
+
+    def test_holidays(self):
+        """NYSE 휴장일 테스트"""
+        self.assertEqual(sorted(nyse_holidays(2024)), [
+            date(2024, 1, 1), date(2024, 1, 15), date(2024, 2, 19), date(2024, 3, 29), date(2024, 5, 27),
+            date(2024, 6, 19), date(2024, 7, 4), date(2024, 9, 2), date(2024, 11, 28), date(2024, 12, 25),
+        ])
+        holidays_2022 = nyse_holidays(2022)
+        # 토요일 신정은 대체 휴장하지 않고, 일요일 공휴일은 월요일에 쉰다
+        self.assertNotIn(date(2021, 12, 31), nyse_holidays(2021) | holidays_2022)
+        self.assertIn(date(2022, 6, 20), holidays_2022)
+        self.assertIn(date(2022, 12, 26), holidays_2022)
+        self.assertNotIn(date(2021, 6, 18), nyse_holidays(2021))
+
+    def test_early_closes(self):
+        """조기 폐장일 테스트"""
+        self.assertEqual(sorted(nyse_early_closes(2024)), [date(2024, 7, 3), date(2024, 11, 29), date(2024, 12, 24)])
+        # 7월 3일이 금요일이면 대체 휴장일
+        self.assertNotIn(date(2026, 7, 3), nyse_early_closes(2026))
+        self.assertIn(date(2026, 7, 3), nyse_holidays(2026))
+
+    def test_sessions_across_dst(self):
+        """서머타임 전후 마감 시각(UTC) 테스트"""
+        calendar = MarketCalendar()
+        self.assertIsNone(calendar.session(date(2024, 3, 9)))
+        before = calendar.session(date(2024, 3, 8)).close.astimezone(timezone.utc)
+        after = calendar.session(date(2024, 3, 11)).close.astimezone(timezone.utc)
+        self.assertEqual((before.hour, after.hour), (21, 20))
+        self.assertTrue(calendar.session(date(2024, 11, 29)).early_close)
+        self.assertFalse(MarketCalendar([date(2025, 1, 9)]).is_trading_day(date(2025, 1, 9)))
+
+
+class TestMarketScheduler(unittest.IsolatedAsyncioTestCase):
+    """장 일정 스케줄러 테스트"""
+
+    def test_next_event_skips_weekend(self):
+        """금요일 리포트 이후 다음 이벤트는 월요일 주문 구간"""
+        scheduler = MarketScheduler()
+        friday_night = datetime(2024, 3, 8, 17, 0, tzinfo=ET)
+        self.assertEqual(scheduler.next_event(friday_night), (datetime(2024, 3, 11, 15, 40, tzinfo=ET), WINDOW_OPEN))
+        # 조기 폐장일은 13시 기준
+        self.assertEqual(scheduler.next_event(datetime(2024, 11, 29, 9, 0, tzinfo=ET))[0],
+                         datetime(2024, 11, 29, 12, 40, tzinfo=ET))
+
+    async def test_sleeps_between_events(self):
+        """이벤트 사이에는 잠만 자는지 테스트"""
+        clock = FakeClock(datetime(2024, 3, 8, 15, 45, tzinfo=ET))
+        scheduler = MarketScheduler(clock=clock, sleep=clock.sleep)
+        events = []
+        async for when, kind in scheduler.events():
+            events.append((when.astimezone(ET).strftime("%m-%d %H:%M"), kind))
+            if len(events) == 6:
+                break
+        self.assertEqual(events, [
+            ("03-08 15:45", WINDOW_OPEN),    # 시작 시 주문 구간 안
+            ("03-08 15:50", WINDOW_CLOSE),
+            ("03-08 16:10", POST_CLOSE),
+            ("03-08 16:30", DAILY_REPORT),
+            ("03-11 15:40", WINDOW_OPEN),
+            ("03-11 15:50", WINDOW_CLOSE),
+        ])
+        # 주말은 1시간 단위로 나눠 잔다
+        self.assertLess(len(clock.sleeps), 80)
+        self.assertLessEqual(max(clock.sleeps), 3600)
+
+
+class TestScheduledManager(unittest.IsolatedAsyncioTestCase):
+    """장 일정에 따른 BotManager 시세 피드 테스트"""
+
+    async def asyncSetUp(self):
+        BotManager._instance = None
+        self.manager = BotManager()
+        self.manager._api = KisAPI(BotConfig())
+        config = BotConfig(log_dir=tempfile.mkdtemp(), data_dir=tempfile.mkdtemp())
+        await self.manager.initialize_bot(config, TradingConfig(
+            symbol="TQQQ", total_divisions=40, first_buy_amount=500, pre_turn_threshold=20, quarter_loss_start=39,
+        ))
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+        BotManager._instance = None
+
+    async def test_feed_idle_outside_window(self):
+        """주문 구간 밖에서는 시세 피드를 돌리지 않는지 테스트"""
+        clock = FakeClock(datetime(2024, 3, 9, 12, 0, tzinfo=ET))
+        release = asyncio.Event()
+        window_open = datetime(2024, 3, 11, 15, 40, tzinfo=ET)
+        report = datetime(2024, 3, 11, 16, 30, tzinfo=ET)
+
+        async def sleep(seconds: float):
+            # 월요일 리포트 이후에는 더 진행하지 않고, 주문 구간에서는 release까지 멈춘다
+            if clock.now >= report:
+                await asyncio.Event().wait()
+            if clock.now >= window_open:
+                await release.wait()
+            await clock.sleep(seconds)
+
+        reports = []
+        self.manager._scheduler = MarketScheduler(clock=clock, sleep=sleep)
+        self.manager.on_daily_report = reports.append
+
+        await self.manager.start()
+        await self.wait_for(lambda: self.manager._price_task is not None)
+        self.assertEqual(clock.now, window_open)
+        release.set()
+        await self.wait_for(lambda: reports)
+        self.assertIsNone(self.manager._price_task)
+        self.assertEqual(set(reports[0]["bots"]), {"TQQQ"})
+
+    async def test_async_daily_report(self):
+        """코루틴 리포트 콜백은 끝날 때까지 기다린다"""
+        reports = []
+
+        async def notify(status):
+            await asyncio.sleep(0)
+            reports.append(status)
+
+        self.manager.on_daily_report = notify
+        await self.manager._daily_report()
+        self.assertEqual(set(reports[0]["bots"]), {"TQQQ"})
+
+    async def test_notifier_registered(self):
+        """텔레그램 설정이 있으면 알림의 일일 리포트를 콜백으로 등록"""
+        with patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "", "TELEGRAM_MY_ID": ""}), \
+                patch("backend.app.main.bot_manager", self.manager):
+            self.assertIsNone(await start_notifier())
+            self.assertIsNone(self.manager.on_daily_report)
+
+        with patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "token", "TELEGRAM_MY_ID": "1"}), \
+                patch("notifications.TelegramNotifier.initialize", AsyncMock()), \
+                patch("notifications.TelegramNotifier.send_notification", AsyncMock()) as send, \
+                patch("backend.app.main.bot_manager", self.manager):
+            notifier = await start_notifier()
+            self.assertEqual(self.manager.on_daily_report, notifier.notify_daily_report)
+            await self.manager._daily_report()
+        self.assertIn("TQQQ", send.await_args.args[0])
+
+    async def wait_for(self, predicate):
+        """조건이 만족될 때까지 대기"""
+        for _ in range(400):
+            if predicate():
+                return
+            await asyncio.sleep(0.005)
+        self.fail("condition not met")
+
+
+class TestScheduledBot(unittest.IsolatedAsyncioTestCase):
+    """단독 실행 봇의 주문 구간 테스트"""
+
+    async def test_run_trades_only_in_window(self):
+        """봇이 스케줄러 시계 기준으로 주문 구간이 끝나면 매매를 멈추는지 테스트"""
+        from backend.app.trading.infinite_buying_bot import InfiniteBuyingBot
+
+        clock = FakeClock(datetime(2024, 3, 11, 15, 45, tzinfo=ET))
+        scheduler = MarketScheduler(clock=clock, sleep=clock.sleep)
+        bot = InfiniteBuyingBot(BotConfig(log_dir=tempfile.mkdtemp()), TradingConfig(
+            symbol="TQQQ", total_divisions=40, first_buy_amount=500, pre_turn_threshold=20, quarter_loss_start=39,
+        ))
+        windows = []
+
+        async def trade_until(deadline, clock=None):
+            windows.append((scheduler.clock(), deadline, clock))
+            self.assertLess(clock(), deadline)
+            if len(windows) == 2:
+                bot.is_running = False
+
+        bot._trade_until = trade_until
+        await bot.run(scheduler)
+        self.assertEqual([(start.strftime("%m-%d %H:%M"), end.strftime("%H:%M")) for start, end, _ in windows],
+                         [("03-11 15:45", "15:50"), ("03-12 15:40", "15:50")])
+        self.assertIs(windows[0][2], scheduler.clock)
+
+
+if __name__ == '__main__':
+    unittest.main()
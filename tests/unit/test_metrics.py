@@ -0,0 +1,119 @@
+"""계측 모듈 단위 테스트"""
+import tempfile
+import time
+import unittest
+
+import httpx
+
+from backend.app.main import app
+from backend.app.trading.bot_manager import BotManager
+from backend.app.trading.config import BotConfig, TradingConfig
+from backend.app.trading.metrics import REGISTRY, Registry
+from tests.mocks.mock_kis import MockKisAPI
+
+
+class TestRegistry(unittest.TestCase):
+    """지표 저장소 테스트"""
+
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_counter_and_gauge(self):
+        """라벨별 카운터와 게이지 출력"""
+        counter = self.registry.counter("orders_total", "Orders", ("side",))
+        counter.labels("BUY").inc()
+        counter.labels("BUY").inc(2)
+        counter.labels("SELL").inc()
+        self.registry.gauge("position", "Shares").set(12.5)
+
+        text = self.registry.render()
+        self.assertIn("# TYPE orders_total counter", text)
+        self.assertIn('orders_total{side="BUY"} 3', text)
+        self.assertIn('orders_total{side="SELL"} 1', text)
+        self.assertIn("position 12.5", text)
+
+    def test_histogram_buckets(self):
+        """버킷은 누적 개수, 경계값은 해당 버킷에 포함"""
+        histogram = self.registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        text = self.registry.render()
+        self.assertIn('latency_seconds_bucket{le="0.1"} 2', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 3', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn("latency_seconds_sum 3.65", text)
+        self.assertIn("latency_seconds_count 4", text)
+
+    def test_register_same_name(self):
+        """같은 이름은 기존 지표를 돌려주고 종류가 다르면 거부"""
+        counter = self.registry.counter("calls_total", "Calls")
+        self.assertIs(self.registry.counter("calls_total", "Calls"), counter)
+        with self.assertRaises(ValueError):
+            self.registry.gauge("calls_total", "Calls")
+        with self.assertRaises(ValueError):
+            counter.labels("extra")
+
+    def test_collector(self):
+        """수집기 값은 내보낼 때 읽고 라벨 값은 이스케이프"""
+        state = {"value": 1}
+        self.registry.register_collector("test", lambda: [("queue_depth", "gauge", "Depth",
+                                                           [({"name": 'a"b'}, state["value"])])])
+        state["value"] = 7
+        self.assertIn('queue_depth{name="a\\"b"} 7', self.registry.render())
+        self.registry.register_collector("test", None)
+        self.assertNotIn("queue_depth", self.registry.render())
+
+    def test_observation_overhead(self):
+        """관측 한 번의 평균 비용이 1마이크로초 미만"""
+        histogram = self.registry.histogram("overhead_seconds", "Overhead", ("symbol",)).labels("TQQQ")
+        counter = self.registry.counter("overhead_total", "Overhead", ("symbol",)).labels("TQQQ")
+        count = 100_000
+        best = float("inf")
+        for _ in range(5):
+            started = time.perf_counter()
+            for _ in range(count):
+                histogram.observe(0.003)
+                counter.inc()
+            best = min(best, (time.perf_counter() - started) / count / 2)
+        self.assertLess(best, 1e-6)
+
+
+class TestMetricsEndpoint(unittest.IsolatedAsyncioTestCase):
+    """봇 계측과 /metrics 엔드포인트 테스트"""
+
+    async def asyncSetUp(self):
+        BotManager._instance = None
+        self.manager = BotManager()
+        self.manager._api = MockKisAPI(BotConfig(), 0)
+        config = BotConfig(log_dir=tempfile.mkdtemp(), data_dir=tempfile.mkdtemp(), market_schedule=False)
+        await self.manager.initialize_bot(config, TradingConfig(
+            symbol="MTRC", total_divisions=40, first_buy_amount=500, pre_turn_threshold=20,
+            quarter_loss_start=39, trading_interval=0.01,
+        ))
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+        BotManager._instance = None
+
+    async def test_metrics_endpoint(self):
+        """매매 판단 후 봇, 매니저, 브로커 지표가 엔드포인트에 노출되는지 테스트"""
+        ticks = REGISTRY.get("infinite_bot_ticks_total").labels("MTRC")
+        before = ticks.value
+        await self.manager._get_slot("MTRC").bot.run_once(70000.0, time.monotonic())
+        self.assertEqual(ticks.value, before + 1)
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        text = response.text
+        self.assertIn('infinite_bot_tick_seconds_count{symbol="MTRC"}', text)
+        self.assertIn('infinite_bot_steps_total{symbol="MTRC",step="first_buy"} ', text)
+        self.assertIn('infinite_bot_position{symbol="MTRC"} ', text)
+        self.assertIn("bot_manager_api_tokens ", text)
+        self.assertIn("# TYPE kis_call_seconds histogram", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+"""다중 종목 BotManager 단위 테스트"""
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from backend.app.trading.bot_manager import BotManager
+from backend.app.trading.config import BotConfig, TradingConfig
+from backend.app.trading.kis import KisAPI
+
+
+class FakeKisAPI(KisAPI):
+    """종목별 고정 시세를 반환하는 테스트용 API"""
+
+    def __init__(self, prices):
+        super().__init__(BotConfig(), quote_window=0)
+        self.prices = prices
+        self.price_calls = 0
+        self.orders = []
+
+    async def _fetch_prices(self, symbols):
+        self.price_calls += 1
+        return {symbol: self.prices[symbol] for symbol in symbols}
+
+    async def buy_stock(self, symbol: str, quantity: int, price: float) -> bool:
+        self.orders.append((symbol, quantity, price))
+        return True
+
+
+class TestMultiSymbolManager(unittest.IsolatedAsyncioTestCase):
+    """다중 종목 봇 관리 테스트"""
+
+    async def asyncSetUp(self):
+        BotManager._instance = None
+        self.manager = BotManager()
+        self.api = FakeKisAPI({"TQQQ": 50.0, "SOXL": 25.0, "UPRO": 60.0})
+        self.manager._api = self.api
+        self.bot_config = BotConfig(log_dir=tempfile.mkdtemp(), data_dir=tempfile.mkdtemp(), market_schedule=False)
+        for symbol in self.api.prices:
+            await self.manager.initialize_bot(self.bot_config, self.trading_config(symbol))
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+        BotManager._instance = None
+
+    def trading_config(self, symbol: str) -> TradingConfig:
+        return TradingConfig(
+            symbol=symbol,
+            total_divisions=40,
+            first_buy_amount=500,
+            pre_turn_threshold=20,
+            quarter_loss_start=39,
+            trading_interval=0.01,
+        )
+
+    async def test_bots_share_api(self):
+        """모든 봇이 하나의 API 세션을 공유하는지 테스트"""
+        self.assertEqual(sorted(self.manager.symbols), ["SOXL", "TQQQ", "UPRO"])
+        for symbol in self.manager.symbols:
+            self.assertIs(self.manager._bots[symbol].bot.kis_api, self.api)
+
+    async def test_independent_trade_history(self):
+        """종목별 거래 내역 분리 테스트"""
+        await self.manager.start()
+        await asyncio.sleep(0.05)
+        await self.manager.stop()
+
+        for symbol, price in self.api.prices.items():
+            history = await self.manager.get_trade_history(symbol)
+            self.assertEqual(len(history), 1)
+            self.assertEqual(history[0]["symbol"], symbol)
+            self.assertEqual(history[0]["quantity"], int(500 / price))
+
+        self.assertEqual(len(await self.manager.get_trade_history()), 3)
+        status = self.manager.get_status()
+        self.assertEqual(set(status["bots"]), set(self.api.prices))
+        self.assertEqual(status["bots"]["SOXL"]["position_count"], 20)
+
+    async def test_stop_single_symbol(self):
+        """한 종목만 중지 테스트"""
+        await self.manager.start()
+        await self.manager.stop("SOXL")
+
+        self.assertFalse(self.manager.is_running("SOXL"))
+        self.assertTrue(self.manager.is_running("TQQQ"))
+        self.assertTrue(self.manager.is_running())
+
+        await self.manager.stop()
+        self.assertFalse(self.manager.is_running())
+        self.assertIsNone(self.manager._price_task)
+
+    async def test_one_quote_call_per_tick(self):
+        """틱마다 전체 종목을 한 번에 조회하는지 테스트"""
+        await self.manager.start()
+        await asyncio.sleep(0.005)
+        self.assertEqual(self.api.price_calls, 1)
+        self.assertEqual(self.manager.get_status()["quotes"]["requests"], 3)
+        await self.manager.stop()
+
+    async def test_reset_stops_running_bots(self):
+        """reset 시 실행 중인 봇 태스크 정리 테스트"""
+        await self.manager.start()
+        slots = list(self.manager._bots.values())
+        await self.manager.reset()
+
+        self.assertFalse(self.manager.is_running())
+        self.assertTrue(all(slot.task is None for slot in slots))
+
+    async def test_reset_clears_history(self):
+        """reset 시 거래 내역을 보관 폴더로 옮기고 매매 상태를 지우는지 테스트"""
+        await self.manager.start()
+        await asyncio.sleep(0.05)
+        await self.manager.reset()
+
+        await self.manager.initialize_bot(self.bot_config, self.trading_config("TQQQ"))
+        self.assertEqual(await self.manager.get_trade_history(), [])
+        self.assertEqual(self.manager.get_recent_trades(), [])
+        self.assertEqual(self.manager._bots["TQQQ"].bot.position_count, 0)
+        archives = os.listdir(os.path.join(self.bot_config.data_dir, "archive"))
+        self.assertEqual(len(archives), 1)
+        self.assertIn("trades.db", os.listdir(os.path.join(self.bot_config.data_dir, "archive", archives[0])))
+
+    async def test_cycle_tracking(self):
+        """거래와 사이클 요약에 사이클 번호가 기록되는지 테스트"""
+        await self.manager.start("TQQQ")
+        await asyncio.sleep(0.05)
+        # 목표가 위로 올라 전량 매도 후 다음 사이클 첫 매수
+        self.api.prices["TQQQ"] = 60.0
+        self.api.quote_cache.ttl = 0
+        await asyncio.sleep(0.1)
+        await self.manager.stop()
+
+        history = await self.manager.get_trade_history("TQQQ")
+        self.assertEqual([(row["action"], row["cycle_number"]) for row in history][:3],
+                         [("BUY", 1), ("SELL", 1), ("BUY", 2)])
+        cycles = await self.manager.get_cycle_pnl("TQQQ")
+        self.assertEqual([(row["cycle_number"], row["status"]) for row in cycles], [(1, "closed"), (2, "open")])
+        self.assertAlmostEqual(cycles[0]["pnl"], 10.0 * 10)
+        self.assertEqual(cycles[1]["pnl"], 0)
+
+    async def test_restart_restores_open_orders(self):
+        """재시작 후 미체결 주문을 복원해 새 봇에 연결하는지 테스트"""
+        self.manager._trade_store.save_order({
+            "order_number": "0001", "symbol": "SOXL", "type": "BUY", "price": 25.0, "qty": 20,
+            "executed_qty": 0, "condition": "LIMIT", "time": datetime.now(),
+        })
+        await self.manager.close()
+
+        BotManager._instance = None
+        self.manager = BotManager()
+        self.manager._api = self.api
+        config = self.bot_config.model_copy(update={"track_orders": True})
+        await self.manager.initialize_bot(config, self.trading_config("SOXL"))
+        order = self.manager._orders.open_orders["0001"]
+        self.assertEqual(order.on_fill, self.manager._bots["SOXL"].bot._on_fill)
+
+    async def test_remove_bot_forgets_state(self):
+        """종목 봇 제거 시 저장된 매매 상태도 삭제하는지 테스트"""
+        await self.manager.start("TQQQ")
+        await asyncio.sleep(0.05)
+        await self.manager.remove_bot("TQQQ")
+        self.assertIsNone(self.manager._state_store.get("TQQQ"))
+
+    async def test_reinitialize_keeps_history(self):
+        """같은 종목 재초기화 시 거래 내역 유지 테스트"""
+        self.manager.add_trade_history({
+            "timestamp": datetime.now(), "symbol": "TQQQ", "action": "BUY",
+            "price": 50.0, "quantity": 1, "division": 1, "total_amount": 50.0,
+        })
+        await self.manager.initialize_bot(self.bot_config, self.trading_config("TQQQ"))
+        self.assertEqual(len(await self.manager.get_trade_history("TQQQ")), 1)
+
+    async def test_ladder_export(self):
+        """종목별 LOC 사다리 조회 테스트 (사이클마다 한 번 생성)"""
+        ladder = self.manager.get_ladder("TQQQ")
+        self.assertEqual(len(ladder["turns"]), 81)
+        bot = self.manager._bots["TQQQ"].bot
+        self.assertIs(bot.cycle_ladder(), bot.cycle_ladder())
+        await self.manager.initialize_bot(self.bot_config, self.trading_config("TQQQ"))
+        self.assertIsNone(self.manager._bots["TQQQ"].bot.ladder)
+
+    async def test_restart_restores_state(self):
+        """재시작 후 종목별 매매 상태 복원 테스트"""
+        await self.manager.start()
+        await asyncio.sleep(0.05)
+        await self.manager.close()
+
+        BotManager._instance = None
+        self.manager = BotManager()
+        self.manager._api = self.api
+        await self.manager.initialize_bot(self.bot_config, self.trading_config("SOXL"))
+        bot = self.manager._bots["SOXL"].bot
+        self.assertEqual(bot.position_count, 20)
+        self.assertEqual(bot.current_division, 1)
+        self.assertEqual(bot.average_price, 25.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
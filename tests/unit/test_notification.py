@@ -2,7 +2,12 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import asyncio
+import time
 import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from telegram.error import NetworkError
 from notifications import TelegramNotifier
 from decimal import Decimal
 from datetime import datetime
@@ -64,6 +69,67 @@ class TestTelegramNotifier(unittest.IsolatedAsyncioTestCase):
         await self.notifier.notify_balance(10000.00, [])
         print("빈 잔고 알림 전송 완료")
 
+class FakeBot:
+    """전송 지연/실패를 흉내내는 텔레그램 봇"""
+
+    def __init__(self, failures=0, delay=0.0):
+        self.failures = failures
+        self.delay = delay
+        self.sent = []
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise NetworkError("temporary failure")
+        self.sent.append(text)
+
+
+class TestNotificationQueue(unittest.IsolatedAsyncioTestCase):
+    """알림 큐 테스트 (실제 텔레그램 호출 없음)"""
+
+    def make_notifier(self, bot, **kwargs):
+        notifier = TelegramNotifier(min_interval=0, retry_delay=0.01, **kwargs)
+        notifier.chat_id = "1"
+        notifier.application = SimpleNamespace(bot=bot, stop=AsyncMock())
+        return notifier
+
+    async def test_send_does_not_wait_for_telegram(self):
+        """느린 전송이 호출자를 막지 않고 몰린 메시지는 하나로 묶이는지 테스트"""
+        bot = FakeBot(delay=0.2)
+        notifier = self.make_notifier(bot, batch_window=0.05)
+        started = time.monotonic()
+        for i in range(3):
+            await notifier.notify_order("매수 체결", "TQQQ", qty=Decimal(i + 1), price=50.0)
+        self.assertLess(time.monotonic() - started, 0.05)
+
+        await notifier.flush()
+        self.assertEqual(len(bot.sent), 1)
+        self.assertEqual(bot.sent[0].count("매수 체결"), 3)
+        await notifier.shutdown()
+
+    async def test_retry_with_backoff(self):
+        """일시적 실패는 재시도하고, 계속 실패하면 버리는지 테스트"""
+        bot = FakeBot(failures=2)
+        notifier = self.make_notifier(bot, batch_window=0)
+        await notifier.notify_error(Exception("first"))
+        await notifier.flush()
+        self.assertEqual(len(bot.sent), 1)
+
+        bot.failures = 10
+        await notifier.notify_error(Exception("second"))
+        await notifier.flush()
+        self.assertEqual((notifier.sent, notifier.dropped), (1, 1))
+        await notifier.shutdown()
+
+    async def test_bounded_queue(self):
+        """큐가 가득 차면 호출자를 막지 않고 버리는지 테스트"""
+        notifier = self.make_notifier(FakeBot(delay=1.0), queue_size=2)
+        for i in range(5):
+            await notifier.send_notification(f"message {i}")
+        self.assertEqual(notifier.dropped, 3)
+        await notifier.shutdown(timeout=0)
+
 def run_tests():
     print("=== 텔레그램 알림 테스트 시작 ===")
     print("환경 변수 확인:")
@@ -0,0 +1,53 @@
+"""파라미터 스윕 단위 테스트"""
+import unittest
+
+import numpy as np
+
+from backend.app.trading.config import TradingConfig
+from backend.app.trading.optimizer import grid_configs, random_configs, run_sweep
+
+
+class TestOptimizer(unittest.TestCase):
+    """파라미터 스윕 테스트"""
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.closes = 50 * np.exp(np.cumsum(rng.normal(0.0005, 0.04, 1000)))
+        self.base = TradingConfig(
+            symbol="TQQQ",
+            total_divisions=40,
+            first_buy_amount=100,
+            pre_turn_threshold=20,
+            quarter_loss_start=39,
+        )
+
+    def test_grid_configs(self):
+        """격자 조합 생성 테스트"""
+        configs = grid_configs(self.base, total_divisions=[20, 40], pre_turn_threshold=[10, 20, 30])
+        self.assertEqual(len(configs), 6)
+        self.assertEqual({c.total_divisions for c in configs}, {20, 40})
+        self.assertTrue(all(c.symbol == "TQQQ" for c in configs))
+
+    def test_random_configs(self):
+        """무작위 조합 생성 테스트"""
+        configs = random_configs(self.base, 10, seed=1, total_divisions=(10, 50), first_buy_amount=(50, 200))
+        self.assertEqual(len(configs), 10)
+        for config in configs:
+            self.assertIsInstance(config.total_divisions, int)
+            self.assertTrue(10 <= config.total_divisions <= 50)
+            self.assertTrue(50 <= config.first_buy_amount <= 200)
+
+    def test_parallel_matches_serial(self):
+        """병렬 실행 결과가 단일 프로세스 결과와 같은지 테스트"""
+        configs = grid_configs(self.base, total_divisions=[20, 30, 40], first_buy_amount=[100, 200])
+        serial = run_sweep(self.closes, configs, max_workers=1)
+        parallel = run_sweep(self.closes, configs, max_workers=2, chunk_size=2)
+
+        self.assertEqual(len(parallel), len(configs))
+        self.assertEqual(serial.to_dict("records"), parallel.to_dict("records"))
+        self.assertTrue(parallel["cagr"].is_monotonic_decreasing)
+        self.assertIn("cycles_completed", parallel.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+"""주문 추적 단위 테스트"""
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from backend.app.trading.config import BotConfig, TradingConfig
+from backend.app.trading.infinite_buying_bot import InfiniteBuyingBot
+from backend.app.trading.kis import Execution, KisAPI
+from backend.app.trading.orders import OrderTracker
+
+
+class FakeBroker(KisAPI):
+    """체결 현황을 직접 조정하는 테스트용 API"""
+
+    def __init__(self):
+        super().__init__(BotConfig(), quote_window=0)
+        self.executions = {}
+        self.execution_calls = 0
+        self.cancelled = []
+        self.modified = []
+        self.price = 48.0
+
+    async def place_order(self, side, symbol, quantity, price, condition="LIMIT"):
+        order_number = f"{len(self.executions) + 1:04d}"
+        self.executions[order_number] = (0, 0.0)
+        return order_number
+
+    async def order_executions(self, start=None):
+        self.execution_calls += 1
+        self.start = start
+        return dict(self.executions)
+
+    async def cancel_order(self, order_number, symbol, quantity):
+        self.cancelled.append((order_number, quantity))
+        return True
+
+    async def modify_order(self, order_number, symbol, quantity, price):
+        self.modified.append((order_number, quantity, price))
+        return True
+
+    async def _fetch_price(self, symbol):
+        return self.price
+
+
+class TestOrderTracker(unittest.IsolatedAsyncioTestCase):
+    """주문 추적 테스트"""
+
+    async def asyncSetUp(self):
+        self.api = FakeBroker()
+        self.events = []
+        self.tracker = OrderTracker(self.api, on_change=lambda order: None)
+
+    async def test_single_query_per_reconcile(self):
+        """주문 수와 관계없이 조회는 한 번인지 테스트"""
+        deadline = datetime.now() + timedelta(hours=1)
+        for _ in range(5):
+            await self.tracker.submit("BUY", "TQQQ", 10, 50.0, "LOC", deadline=deadline, on_fill=self.events.append)
+        self.api.executions["0001"] = (10, 50.0)
+        self.api.executions["0002"] = (4, 49.5)
+
+        await self.tracker.reconcile()
+        self.assertEqual(self.api.execution_calls, 1)
+        self.assertEqual(len(self.tracker.open_orders), 4)
+        self.assertEqual([(e.order.order_number, e.quantity, e.price) for e in self.events],
+                         [("0001", 10, 50.0), ("0002", 4, 49.5)])
+
+        # 부분 체결 주문의 추가 체결분은 평균 체결가로 역산
+        self.api.executions["0002"] = (10, 49.8)
+        await self.tracker.reconcile()
+        event = self.events[-1]
+        self.assertEqual(event.quantity, 6)
+        self.assertAlmostEqual(event.price, (49.8 * 10 - 49.5 * 4) / 6)
+        self.assertFalse(event.first_fill)
+        self.assertEqual(event.order.status, "FILLED")
+
+        # 미체결 주문이 없으면 조회하지 않는다
+        self.tracker.open_orders.clear()
+        await self.tracker.reconcile()
+        self.assertEqual(self.api.execution_calls, 2)
+
+    async def test_cancel_at_deadline(self):
+        """마감 시각이 지난 미체결 주문 취소 테스트"""
+        deadline = datetime.now() + timedelta(minutes=5)
+        order = await self.tracker.submit("BUY", "TQQQ", 10, 50.0, "LOC", deadline=deadline)
+        self.api.executions[order.order_number] = (3, 50.0)
+
+        await self.tracker.reconcile(now=deadline - timedelta(seconds=1))
+        self.assertEqual(self.api.cancelled, [])
+        await self.tracker.reconcile(now=deadline)
+        self.assertEqual(self.api.cancelled, [(order.order_number, 7)])
+        self.assertEqual(order.status, "CANCELLED")
+        self.assertFalse(self.tracker.has_open())
+
+    async def test_reprice_at_deadline(self):
+        """마감 시각에 현재가로 정정 테스트"""
+        tracker = OrderTracker(self.api, deadline_action="reprice")
+        deadline = datetime.now()
+        order = await tracker.submit("BUY", "TQQQ", 10, 50.0, "LOC", deadline=deadline)
+        await tracker.reconcile(now=deadline)
+        self.assertEqual(self.api.modified, [(order.order_number, 10, 48.0)])
+        self.assertEqual(order.price, 48.0)
+        self.assertTrue(tracker.has_open("TQQQ"))
+
+        # 정정한 주문도 대기 시간 안에 체결되지 않으면 취소
+        await tracker.reconcile(now=deadline + timedelta(seconds=299))
+        self.assertEqual(self.api.cancelled, [])
+        await tracker.reconcile(now=deadline + timedelta(seconds=300))
+        self.assertEqual(self.api.cancelled, [(order.order_number, 10)])
+        self.assertEqual(len(self.api.modified), 1)
+        self.assertFalse(tracker.has_open("TQQQ"))
+
+    async def test_fill_before_cancel_is_applied(self):
+        """마지막 조회와 취소 사이의 체결분을 반영하고 추적을 끝내는지 테스트"""
+        deadline = datetime.now()
+        order = await self.tracker.submit("BUY", "TQQQ", 10, 50.0, "LOC", deadline=deadline,
+                                          on_fill=self.events.append)
+        original = self.api.cancel_order
+
+        async def cancel_after_fill(order_number, symbol, quantity):
+            # 취소 요청 직전에 브로커에서 일부 체결
+            self.api.executions[order_number] = (4, 49.0)
+            return await original(order_number, symbol, quantity)
+
+        self.api.cancel_order = cancel_after_fill
+        events = await self.tracker.reconcile(now=deadline)
+        self.assertEqual([(e.quantity, e.price) for e in events], [(4, 49.0)])
+        self.assertEqual([e.quantity for e in self.events], [4])
+        self.assertEqual((order.executed_qty, order.status), (4, "CANCELLED"))
+        self.assertFalse(self.tracker.has_open())
+
+    async def test_bot_applies_fills(self):
+        """봇이 체결 이벤트로 상태를 갱신하는지 테스트"""
+        trading_config = TradingConfig(symbol="TQQQ", total_divisions=40, first_buy_amount=500,
+                                       pre_turn_threshold=20, quarter_loss_start=39)
+        bot = InfiniteBuyingBot(BotConfig(log_dir=tempfile.mkdtemp()), trading_config, kis_api=self.api)
+        bot.order_tracker = self.tracker
+        trades = []
+        bot.on_trade = trades.append
+
+        await bot.run_once(50.0)
+        self.assertEqual(bot.position_count, 0)
+        # 미체결 주문이 있으면 새 주문을 내지 않는다
+        await bot.run_once(49.0)
+        self.assertEqual(len(self.tracker.open_orders), 1)
+
+        self.api.executions["0001"] = (6, 50.0)
+        await self.tracker.reconcile()
+        self.api.executions["0001"] = (10, 50.0)
+        await self.tracker.reconcile()
+        self.assertEqual((bot.position_count, bot.current_division, bot.average_price), (10, 1, 50.0))
+        self.assertEqual([trade["quantity"] for trade in trades], [6, 4])
+
+    async def test_empty_quarter_loss_saves_turn(self):
+        """쿼터손절 매도 수량이 없어도 차감한 회차를 저장하는지 테스트"""
+        trading_config = TradingConfig(symbol="TQQQ", total_divisions=40, first_buy_amount=500,
+                                       pre_turn_threshold=20, quarter_loss_start=39)
+        bot = InfiniteBuyingBot(BotConfig(log_dir=tempfile.mkdtemp()), trading_config, kis_api=self.api)
+        states = []
+        bot.on_state = states.append
+        bot.position_count, bot.current_division, bot.average_price, bot.current_price = 3, 39, 50.0, 40.0
+
+        self.assertFalse(await bot._execute_exits())
+        self.assertEqual(bot.position_count, 3)
+        self.assertLess(bot.current_division, 39)
+        self.assertEqual(states[-1]["current_division"], bot.current_division)
+
+    async def test_broker_closed_orders_are_terminal(self):
+        """브로커에서 만료/취소된 미체결 주문은 마감 시각 없이도 추적을 끝내는지 테스트"""
+        order = await self.tracker.submit("BUY", "TQQQ", 10, 50.0, on_fill=self.events.append)
+        self.api.executions[order.order_number] = Execution(0, 0.0, open=True)
+        await self.tracker.reconcile()
+        self.assertTrue(self.tracker.has_open("TQQQ"))
+
+        self.api.executions[order.order_number] = Execution(2, 50.0, open=False)
+        await self.tracker.reconcile()
+        self.assertEqual(order.status, "EXPIRED")
+        self.assertEqual(order.executed_qty, 2)
+        self.assertFalse(self.tracker.has_open("TQQQ"))
+
+    async def test_close_orders_require_deadline(self):
+        """LOC/MOC 주문은 마감 시각이 필요"""
+        with self.assertRaises(ValueError):
+            await self.tracker.submit("BUY", "TQQQ", 10, 50.0, "LOC")
+        self.assertEqual(self.api.executions, {})
+
+    async def test_restore_open_orders(self):
+        """저장된 미체결 주문 복원 후 체결 반영 테스트"""
+        yesterday = datetime.now() - timedelta(days=1)
+        restored = self.tracker.restore([
+            {"order_number": "0001", "symbol": "TQQQ", "type": "BUY", "price": 50.0, "qty": 10,
+             "executed_qty": 4, "condition": "LIMIT", "time": yesterday.isoformat(), "status": "PARTIAL"},
+            {"order_number": "0002", "symbol": "TQQQ", "type": "BUY", "price": 50.0, "qty": 10,
+             "executed_qty": 10, "condition": "LIMIT", "time": yesterday.isoformat(), "status": "FILLED"},
+        ])
+        self.assertEqual(restored, 1)
+        self.tracker.attach("TQQQ", self.events.append)
+        self.api.executions["0001"] = (10, 50.0)
+        await self.tracker.reconcile()
+        # 이전 날짜 주문까지 조회
+        self.assertEqual(self.api.start, yesterday.date())
+        self.assertEqual([(e.quantity, e.first_fill) for e in self.events], [(6, False)])
+        self.assertFalse(self.tracker.has_open())
+
+    async def test_test_mode_orders(self):
+        """테스트 모드 주문은 다음 조회 때 전량 체결"""
+        api = KisAPI(BotConfig())
+        tracker = OrderTracker(api)
+        order = await tracker.submit("BUY", "TQQQ", 3, 70.0, on_fill=self.events.append)
+        await tracker.reconcile()
+        self.assertTrue(order.is_complete)
+        self.assertEqual(self.events[0].price, 70.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
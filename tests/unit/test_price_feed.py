@@ -0,0 +1,138 @@
+"""시세 피드 단위 테스트"""
+import asyncio
+import json
+import tempfile
+import time
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from backend.app.trading.config import BotConfig, TradingConfig
+from backend.app.trading.infinite_buying_bot import InfiniteBuyingBot
+from backend.app.trading.kis import KisAPI
+from backend.app.trading.kis_client import KisClient
+from backend.app.trading.price_feed import PriceFeed, parse_realtime_prices
+
+
+def realtime_message(*records):
+    """HDFSCNT0 실시간 체결가 메시지 생성"""
+    fields = []
+    for symbol, price in records:
+        record = [""] * 26
+        record[0], record[1], record[11] = f"DNAS{symbol}", symbol, str(price)
+        fields.extend(record)
+    return f"0|HDFSCNT0|{len(records):03d}|" + "^".join(fields)
+
+
+class ReplayServer:
+    """실시간 시세 재생 서버"""
+
+    def __init__(self, prices, close_after=True):
+        self.prices = prices
+        self.close_after = close_after
+        self.subscriptions = []
+        self.pongs = 0
+        app = web.Application()
+        app.router.add_post("/oauth2/Approval", self.approval)
+        app.router.add_get("/ws", self.websocket)
+        self.server = TestServer(app)
+
+    async def approval(self, request):
+        return web.json_response({"approval_key": "approval"})
+
+    async def websocket(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        msg = await ws.receive()
+        self.subscriptions.append(json.loads(msg.data)["body"]["input"]["tr_key"])
+        await ws.send_str(json.dumps({"header": {"tr_id": "PINGPONG"}}))
+        await ws.receive()
+        self.pongs += 1
+        for price in self.prices:
+            await ws.send_str(realtime_message(("TQQQ", price)))
+        if self.close_after:
+            await ws.close()
+        else:
+            await asyncio.sleep(10)
+        return ws
+
+
+class PollingKisAPI(KisAPI):
+    """폴링 시 고정 시세를 반환하는 API"""
+
+    async def _fetch_price(self, symbol: str) -> float:
+        return 1.0
+
+
+class TestPriceFeed(unittest.IsolatedAsyncioTestCase):
+    """시세 피드 테스트"""
+
+    async def start_feed(self, replay: ReplayServer):
+        await replay.server.start_server()
+        bot_config = BotConfig(app_key="key", app_secret="secret", account_number="12345678",
+                               api_rate_limit=1000, api_burst=1000, quote_ttl=0)
+        client = KisClient(bot_config, base_url=str(replay.server.make_url("/")),
+                           ws_url=str(replay.server.make_url("/ws")))
+        self.api = PollingKisAPI(bot_config, client=client)
+        self.events = []
+        feed = PriceFeed(self.api, lambda s, p, t: self.events.append((s, p)), streaming=True)
+        feed.set_symbols(["TQQQ"])
+        self.task = asyncio.create_task(feed.run(lambda: 0.01))
+        return feed
+
+    async def stop_feed(self, replay: ReplayServer):
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+        await self.api.close()
+        await replay.server.close()
+
+    def test_parse_multiple_records(self):
+        """여러 건이 묶인 실시간 메시지 파싱 테스트"""
+        message = realtime_message(("TQQQ", 45.5), ("SOXL", 30.25))
+        self.assertEqual(parse_realtime_prices(message), [("TQQQ", 45.5), ("SOXL", 30.25)])
+        self.assertEqual(parse_realtime_prices('{"header": {}}'), [])
+
+    async def test_stream_events_then_fallback(self):
+        """스트림 이벤트 수신 후 끊기면 폴링으로 대체하는지 테스트"""
+        replay = ReplayServer([45.0, 45.5, 44.9])
+        feed = await self.start_feed(replay)
+        await asyncio.sleep(0.2)
+        await self.stop_feed(replay)
+
+        self.assertEqual(replay.subscriptions, ["DNASTQQQ"])
+        self.assertEqual(replay.pongs, 1)
+        self.assertEqual(self.events[:3], [("TQQQ", 45.0), ("TQQQ", 45.5), ("TQQQ", 44.9)])
+        # 스트림 종료 후 폴링 시세
+        self.assertIn(("TQQQ", 1.0), self.events[3:])
+        self.assertGreaterEqual(feed.reconnects, 1)
+
+    async def test_streaming_mode_does_not_poll(self):
+        """스트림 연결 중에는 폴링하지 않는지 테스트"""
+        replay = ReplayServer([45.0], close_after=False)
+        feed = await self.start_feed(replay)
+        await asyncio.sleep(0.1)
+        self.assertEqual(feed.mode, "streaming")
+        self.assertEqual(self.events, [("TQQQ", 45.0)])
+        await self.stop_feed(replay)
+
+    async def test_decision_latency(self):
+        """시세 수신부터 주문 전송까지 지연 측정 테스트"""
+        trading_config = TradingConfig(symbol="TQQQ", total_divisions=40, first_buy_amount=100,
+                                       pre_turn_threshold=20, quarter_loss_start=39)
+        bot = InfiniteBuyingBot(BotConfig(log_dir=tempfile.mkdtemp()), trading_config)
+
+        async def slow_buy(symbol, quantity, price):
+            await asyncio.sleep(0.02)  # 주문 전송 시간도 지연에 포함
+            return True
+
+        bot.kis_api.buy_stock = slow_buy
+        await bot.run_once(45.0, time.monotonic() - 0.01)
+
+        latency = bot.decision_latency.to_dict()
+        self.assertEqual(latency["count"], 1)
+        self.assertGreaterEqual(latency["last_ms"], 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""시세 묶음 조회 단위 테스트"""
+import asyncio
+import unittest
+
+from backend.app.trading.kis import QuoteAggregator
+
+
+class TestQuoteAggregator(unittest.IsolatedAsyncioTestCase):
+    """시세 묶음 조회 테스트"""
+
+    async def asyncSetUp(self):
+        self.batches = []
+
+        async def fetch(symbols):
+            self.batches.append(list(symbols))
+            return {symbol: float(len(symbol)) for symbol in symbols if symbol != "MISSING"}
+
+        self.aggregator = QuoteAggregator(fetch, window=0.001)
+
+    async def test_concurrent_requests_share_one_call(self):
+        """동시 요청이 한 번의 묶음 조회로 모이는지 테스트"""
+        symbols = ["TQQQ", "SOXL", "UPRO"] * 4
+        prices = await asyncio.gather(*(self.aggregator.get(symbol) for symbol in symbols))
+
+        self.assertEqual(prices, [4.0] * len(symbols))
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual(sorted(self.batches[0]), ["SOXL", "TQQQ", "UPRO"])
+
+        metrics = self.aggregator.metrics()
+        self.assertEqual(metrics["requests"], 12)
+        self.assertEqual(metrics["batches"], 1)
+        # 종목별 요청 3건만 실제로 나간다
+        self.assertEqual(metrics["symbols_fetched"], 3)
+        self.assertAlmostEqual(metrics["reduction_rate"], 9 / 12)
+
+    async def test_separate_windows(self):
+        """시간창이 다르면 별도 호출되는지 테스트"""
+        await self.aggregator.get("TQQQ")
+        await self.aggregator.get("TQQQ")
+        self.assertEqual(len(self.batches), 2)
+
+    async def test_missing_quote_raises(self):
+        """시세가 없는 종목은 예외를 받는지 테스트"""
+        results = await asyncio.gather(
+            self.aggregator.get("TQQQ"), self.aggregator.get("MISSING"), return_exceptions=True
+        )
+        self.assertEqual(results[0], 4.0)
+        self.assertIsInstance(results[1], KeyError)
+
+    async def test_fetch_error_fans_out(self):
+        """브로커 오류가 모든 대기자에게 전달되는지 테스트"""
+        async def failing(symbols):
+            raise ConnectionError("broker down")
+
+        aggregator = QuoteAggregator(failing, window=0)
+        results = await asyncio.gather(aggregator.get("A"), aggregator.get("B"), return_exceptions=True)
+        self.assertTrue(all(isinstance(r, ConnectionError) for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
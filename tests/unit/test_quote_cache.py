@@ -0,0 +1,81 @@
+"""시세 캐시 단위 테스트"""
+import asyncio
+import unittest
+
+from backend.app.trading.config import BotConfig
+from backend.app.trading.kis import KisAPI, QuoteCache
+
+
+class CountingKisAPI(KisAPI):
+    """브로커 호출 수를 세는 테스트용 API"""
+
+    def __init__(self, bot_config: BotConfig):
+        super().__init__(bot_config, quote_window=0)
+        self.fetches = 0
+
+    async def _fetch_price(self, symbol: str) -> float:
+        self.fetches += 1
+        await asyncio.sleep(0.005)
+        return 45.67
+
+
+class TestQuoteCache(unittest.IsolatedAsyncioTestCase):
+    """시세 캐시 테스트"""
+
+    async def test_concurrent_callers_share_one_fetch(self):
+        """동시 요청이 하나의 조회를 기다리는지 테스트"""
+        api = CountingKisAPI(BotConfig(quote_ttl=1.0))
+        prices = await asyncio.gather(*(api.get_current_price("TQQQ") for _ in range(20)))
+
+        self.assertEqual(prices, [45.67] * 20)
+        self.assertEqual(api.fetches, 1)
+        metrics = api.quote_metrics()
+        self.assertEqual(metrics["cache_misses"], 1)
+        self.assertEqual(metrics["cache_coalesced"], 19)
+
+    async def test_ttl_hit_and_expiry(self):
+        """유효시간 내 적중 및 만료 후 재조회 테스트"""
+        api = CountingKisAPI(BotConfig(quote_ttl=0.02))
+        await api.get_current_price("TQQQ")
+        await api.get_current_price("TQQQ")
+        self.assertEqual(api.fetches, 1)
+        self.assertEqual(api.quote_metrics()["cache_hits"], 1)
+
+        await asyncio.sleep(0.03)
+        await api.get_current_price("TQQQ")
+        self.assertEqual(api.fetches, 2)
+
+    async def test_zero_ttl_disables_cache(self):
+        """유효시간 0이면 캐시하지 않는지 테스트"""
+        api = CountingKisAPI(BotConfig(quote_ttl=0))
+        await api.get_current_price("TQQQ")
+        await api.get_current_price("TQQQ")
+        self.assertEqual(api.fetches, 2)
+
+    async def test_error_is_not_cached(self):
+        """조회 실패는 캐시하지 않는지 테스트"""
+        calls = []
+
+        async def flaky(symbol):
+            calls.append(symbol)
+            if len(calls) == 1:
+                raise ConnectionError("timeout")
+            return 10.0
+
+        cache = QuoteCache(flaky, ttl=1.0)
+        results = await asyncio.gather(cache.get("SOXL"), cache.get("SOXL"), return_exceptions=True)
+        self.assertTrue(all(isinstance(r, ConnectionError) for r in results))
+        self.assertEqual(await cache.get("SOXL"), 10.0)
+
+    async def test_cancelled_caller_does_not_cancel_fetch(self):
+        """한 호출자 취소가 다른 대기자에 영향을 주지 않는지 테스트"""
+        api = CountingKisAPI(BotConfig(quote_ttl=1.0))
+        first = asyncio.create_task(api.get_current_price("UPRO"))
+        second = asyncio.create_task(api.get_current_price("UPRO"))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual(await second, 45.67)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""브로커 호출 한도 단위 테스트"""
+import asyncio
+import time
+import unittest
+
+from backend.app.trading.rate_limit import BrokerScheduler, Priority, TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    """토큰 버킷 테스트"""
+
+    def test_capacity_and_reserve(self):
+        """최대 토큰 수와 예약 토큰 테스트"""
+        bucket = TokenBucket(rate=1, capacity=3)
+        self.assertTrue(bucket.try_acquire(reserve=1))
+        self.assertTrue(bucket.try_acquire(reserve=1))
+        self.assertFalse(bucket.try_acquire(reserve=1))
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        self.assertGreater(bucket.wait_time(), 0)
+
+
+class TestBrokerScheduler(unittest.IsolatedAsyncioTestCase):
+    """우선순위 스케줄러 테스트"""
+
+    async def test_rate_is_enforced(self):
+        """초당 호출 한도 준수 테스트"""
+        scheduler = BrokerScheduler(rate=200, burst=5, order_reserve=0)
+        started = time.monotonic()
+        await asyncio.gather(*(scheduler.acquire(Priority.QUOTE) for _ in range(25)))
+        elapsed = time.monotonic() - started
+        # 처음 5개는 즉시, 나머지 20개는 초당 200개 속도
+        self.assertGreaterEqual(elapsed, 20 / 200 * 0.9)
+
+    async def test_orders_before_quotes_and_queries(self):
+        """대기열에서 주문이 시세/조회보다 먼저 처리되는지 테스트"""
+        scheduler = BrokerScheduler(rate=100, burst=1, order_reserve=0)
+        await scheduler.acquire(Priority.QUOTE)  # 토큰 소진
+        served = []
+
+        async def request(priority, name):
+            await scheduler.acquire(priority)
+            served.append(name)
+
+        tasks = [asyncio.create_task(request(Priority.QUERY, f"query{i}")) for i in range(3)]
+        tasks += [asyncio.create_task(request(Priority.QUOTE, f"quote{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(request(Priority.ORDER, "order")))
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(served[0], "order")
+        self.assertEqual(served[1:4], ["quote0", "quote1", "quote2"])
+        self.assertEqual(served[4:], ["query0", "query1", "query2"])
+
+    async def test_order_reserve(self):
+        """시세 요청이 몰려도 주문용 토큰이 남는지 테스트"""
+        scheduler = BrokerScheduler(rate=1, burst=3, order_reserve=1)
+        await scheduler.acquire(Priority.QUOTE)
+        await scheduler.acquire(Priority.QUOTE)
+        quote = asyncio.create_task(scheduler.acquire(Priority.QUOTE))
+        await asyncio.sleep(0)
+        self.assertFalse(quote.done())
+
+        await asyncio.wait_for(scheduler.acquire(Priority.ORDER), 0.01)
+        quote.cancel()
+        self.assertEqual(scheduler.metrics()["order_waited"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
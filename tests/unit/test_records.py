@@ -0,0 +1,130 @@
+"""거래 기록 타입 단위 테스트"""
+import dataclasses
+import random
+import tracemalloc
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from backend.app.trading.orders import TrackedOrder
+from backend.app.trading.records import TRADE_DTYPE, Trade, TradeBatch
+from models import OrderTracking, StockBalance, TradingState
+
+START = datetime(2024, 1, 2, 15, 50)
+
+
+def random_trades(count: int, seed: int = 1):
+    """무작위 거래 딕셔너리 (보유 수량 안에서만 매도)"""
+    rng = random.Random(seed)
+    positions = {"TQQQ": 0, "SOXL": 0}
+    cycles = {"TQQQ": 1, "SOXL": 1}
+    trades = []
+    for i in range(count):
+        symbol = rng.choice(list(positions))
+        price = round(rng.uniform(20, 80), 2)
+        if positions[symbol] and rng.random() < 0.3:
+            action = "SELL"
+            quantity = positions[symbol] if rng.random() < 0.3 else max(1, positions[symbol] // 4)
+        else:
+            action, quantity = "BUY", rng.randint(1, 20)
+        trades.append({"timestamp": START + timedelta(minutes=i), "symbol": symbol, "action": action,
+                       "price": price, "quantity": quantity, "division": 1, "total_amount": price * quantity,
+                       "cycle_number": cycles[symbol]})
+        positions[symbol] += quantity if action == "BUY" else -quantity
+        if positions[symbol] == 0:
+            cycles[symbol] += 1
+    return trades
+
+
+def reference_pnl(trades):
+    """봇과 같은 이동평균 단가 규칙의 체결별 실현 손익"""
+    positions, costs, realized = {}, {}, []
+    for trade in trades:
+        symbol = trade["symbol"]
+        position, cost = positions.get(symbol, 0), costs.get(symbol, 0.0)
+        if trade["action"] == "BUY":
+            positions[symbol], costs[symbol] = position + trade["quantity"], cost + trade["total_amount"]
+            realized.append(0.0)
+        else:
+            sold_cost = cost * trade["quantity"] / position
+            positions[symbol], costs[symbol] = position - trade["quantity"], cost - sold_cost
+            realized.append(trade["total_amount"] - sold_cost)
+    return np.array(realized)
+
+
+class TestSlottedModels(unittest.TestCase):
+    """슬롯 모델 테스트"""
+
+    def test_no_instance_dict(self):
+        """레코드 인스턴스에 __dict__가 없다"""
+        records = [
+            TradingState(),
+            StockBalance(10, 50.0, 55.0),
+            OrderTracking("1", "TQQQ", "BUY", 50.0, 10, 0, "LOC", START),
+            TrackedOrder("1", "TQQQ", "BUY", 50.0, 10, 0, "LOC", START),
+            Trade(START, "TQQQ", "BUY", 50.0, 10),
+        ]
+        for record in records:
+            self.assertFalse(hasattr(record, "__dict__"), type(record).__name__)
+        self.assertEqual(TradingState.from_dict(TradingState().to_dict()).cycle_number, 1)
+
+    def test_trade_frozen(self):
+        """Trade는 불변이고 딕셔너리와 상호 변환"""
+        trade = Trade.from_dict(random_trades(1)[0])
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            trade.price = 1.0
+        self.assertEqual(Trade.from_dict(trade.to_dict()), trade)
+
+
+class TestTradeBatch(unittest.TestCase):
+    """열 단위 체결 묶음 테스트"""
+
+    def setUp(self):
+        self.trades = random_trades(2000)
+        self.batch = TradeBatch.from_records(self.trades)
+
+    def test_round_trip(self):
+        """추가한 체결을 같은 값으로 돌려준다"""
+        batch = TradeBatch(capacity=1)
+        for trade in self.trades[:10]:
+            batch.append(trade)
+        self.assertEqual(len(batch), 10)
+        self.assertEqual([t.to_dict() for t in batch], self.trades[:10])
+        copy = TradeBatch.from_array(batch.array, batch.symbols)
+        self.assertTrue(np.shares_memory(copy.array, batch.array))
+        self.assertEqual(copy[3], batch[3])
+
+    def test_zero_copy_frame(self):
+        """숫자/시각 열은 배열을 복사하지 않고 DataFrame으로 넘긴다"""
+        frame = self.batch.to_frame()
+        for column in ("timestamp", "price", "quantity", "cycle_number"):
+            self.assertTrue(np.shares_memory(frame[column].to_numpy(), self.batch.array), column)
+        self.assertEqual(frame["symbol"].iloc[0], self.trades[0]["symbol"])
+        self.assertEqual(frame["action"].tolist(), [trade["action"] for trade in self.trades])
+        self.assertEqual(frame["total_amount"].tolist(), [trade["total_amount"] for trade in self.trades])
+
+    def test_vectorized_pnl_matches_sequential(self):
+        """배열 연산 실현 손익이 체결 순서대로 계산한 값과 같다"""
+        np.testing.assert_allclose(self.batch.realized_pnl(), reference_pnl(self.trades), atol=1e-6)
+        summary = self.batch.cycle_summary()
+        self.assertAlmostEqual(summary["realized_pnl"].sum(), reference_pnl(self.trades).sum(), places=4)
+        final = {symbol: self.batch.positions()[self.batch.array["symbol"] == code][-1]
+                 for code, symbol in enumerate(self.batch.symbols)}
+        self.assertEqual(final, summary.groupby(level="symbol")["quantity"].sum().to_dict())
+
+    def test_memory_per_trade(self):
+        """거래 딕셔너리 대비 메모리 10배 이상 절감"""
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        dicts = random_trades(2000, seed=2)
+        used_by_dicts = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+        tracemalloc.stop()
+
+        batch = TradeBatch.from_records(dicts)
+        self.assertEqual(batch.nbytes, 2000 * TRADE_DTYPE.itemsize)
+        self.assertGreater(used_by_dicts / batch.nbytes, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
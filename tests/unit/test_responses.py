@@ -0,0 +1,95 @@
+"""빠른 JSON 응답 단위 테스트"""
+import gzip
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import httpx
+
+from backend.app.main import app
+from backend.app.trading.bot_manager import bot_manager
+from backend.app.trading.trade_store import TradeStore
+
+
+def trade(i: int):
+    return {"timestamp": datetime(2024, 1, 1) + timedelta(minutes=i), "symbol": "TQQQ", "action": "BUY",
+            "price": 50.0, "quantity": 2, "division": i % 40 + 1, "total_amount": 100.0, "cycle_number": 1}
+
+
+class TestHistoryResponse(unittest.IsolatedAsyncioTestCase):
+    """거래 내역 응답 테스트"""
+
+    async def asyncSetUp(self):
+        self.store = TradeStore(os.path.join(tempfile.mkdtemp(), "trades.db"))
+        for i in range(50):
+            self.store.add_trade(trade(i), journal_seq=i)
+        bot_manager._trade_store = self.store
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        bot_manager._trade_store = None
+        await self.store.close()
+
+    async def test_same_body_as_model(self):
+        """모델 직렬화와 같은 필드를 돌려준다"""
+        response = await self.client.get("/trading/history", params={"limit": 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/json")
+        rows = response.json()
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(set(rows[0]), {"timestamp", "symbol", "action", "price", "quantity", "division",
+                                        "total_amount"})
+        self.assertEqual(rows[0]["timestamp"], "2024-01-01T00:00:00")
+        self.assertEqual(response.headers["X-Next-Cursor"], "10")
+
+    async def test_compression(self):
+        """허용된 경우에만 gzip 압축"""
+        response = await self.client.get("/trading/history", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(len(response.json()), 50)
+
+        raw = await self.client.get("/trading/history", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("content-encoding", raw.headers)
+        self.assertEqual(raw.json(), response.json())
+        # 작은 본문은 압축하지 않는다
+        small = await self.client.get("/trading/history", params={"limit": 1}, headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("content-encoding", small.headers)
+        self.assertLess(len(gzip.compress(raw.content)), len(raw.content))
+
+    async def test_not_modified_skips_query(self):
+        """내역이 그대로면 조회 없이 304, 거래가 추가되면 새 ETag"""
+        response = await self.client.get("/trading/history", params={"limit": 20})
+        etag = response.headers["ETag"]
+
+        with patch.object(self.store, "trades", side_effect=AssertionError("queried")):
+            cached = await self.client.get("/trading/history", params={"limit": 20},
+                                           headers={"If-None-Match": etag})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b"")
+
+        other = await self.client.get("/trading/history", params={"limit": 30}, headers={"If-None-Match": etag})
+        self.assertEqual(other.status_code, 200)
+
+        self.store.add_trade(trade(50), journal_seq=50)
+        changed = await self.client.get("/trading/history", params={"limit": 20}, headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+
+    async def test_status_shape(self):
+        """거래 상태 응답 형식 유지"""
+        response = await self.client.get("/trading/status")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["recent_trades"], [])
+        self.assertEqual(body["status"]["unrealized_pnl"], 0)
+
+        # last_updated는 매번 바뀌어도 상태가 그대로면 304
+        cached = await self.client.get("/trading/status", headers={"If-None-Match": response.headers["ETag"]})
+        self.assertEqual(cached.status_code, 304)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+"""시뮬레이션 거래소 및 모의 브로커 단위 테스트"""
+import asyncio
+import tempfile
+import time
+import unittest
+from datetime import date, datetime
+
+import pandas as pd
+
+from backend.app.trading.bot_manager import BotManager
+from backend.app.trading.config import BotConfig, TradingConfig
+from backend.app.trading.market_calendar import ET, MarketScheduler
+from backend.app.trading.orders import OrderTracker
+from backend.app.trading.simulator import PaperBroker, SimClock, SimulatedExchange, synthetic_bars
+from tests.mocks.mock_kis import MockKisAPI
+
+
+class ManualClock:
+    """직접 옮기는 시계"""
+
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def bars(*rows):
+    """(날짜, 시가, 고가, 저가, 종가) 일봉"""
+    return pd.DataFrame([row[1:] for row in rows], columns=["open", "high", "low", "close"],
+                        index=[row[0] for row in rows])
+
+
+class TestSimulatedExchange(unittest.TestCase):
+    """시뮬레이션 거래소 테스트"""
+
+    def setUp(self):
+        self.clock = ManualClock(datetime(2024, 3, 11, 15, 45, tzinfo=ET))
+        self.exchange = SimulatedExchange(
+            {"TQQQ": bars((date(2024, 3, 8), 50, 52, 49, 51), (date(2024, 3, 11), 51, 53, 47, 48))},
+            self.clock, cash=10_000,
+        )
+
+    def test_intraday_path(self):
+        """장 전 전일 종가, 장중 보간, 장 후 종가"""
+        self.clock.now = datetime(2024, 3, 11, 8, 0, tzinfo=ET)
+        self.assertEqual(self.exchange.price("TQQQ"), 51)
+        self.clock.now = datetime(2024, 3, 11, 9, 30, tzinfo=ET)
+        self.assertEqual(self.exchange.price("TQQQ"), 51)
+        self.clock.now = datetime(2024, 3, 11, 17, 0, tzinfo=ET)
+        self.assertEqual(self.exchange.price("TQQQ"), 48)
+        # 휴장일은 마지막 종가
+        self.clock.now = datetime(2024, 3, 9, 12, 0, tzinfo=ET)
+        self.assertEqual(self.exchange.price("TQQQ"), 51)
+
+    def test_close_orders(self):
+        """LOC는 종가 조건을 만족할 때만, MOC는 항상 종가에 체결"""
+        below = self.exchange.submit("BUY", "TQQQ", 10, 49.0, "LOC")
+        above = self.exchange.submit("BUY", "TQQQ", 10, 47.5, "LOC")
+        self.assertTrue(self.exchange.executions()[below].open)
+
+        self.clock.now = datetime(2024, 3, 11, 16, 0, tzinfo=ET)
+        executions = self.exchange.executions()
+        self.assertEqual(executions[below], (10, 48.0, False))
+        self.assertEqual(executions[above], (0, 0.0, False))
+        self.assertEqual(self.exchange.positions["TQQQ"], 10)
+        self.assertEqual(self.exchange.cash, 10_000 - 480)
+
+    def test_partial_fills_and_rejects(self):
+        """체결 한도에 따른 부분 체결과 주문 거부"""
+        self.exchange.liquidity = 4
+        order = self.exchange.submit("BUY", "TQQQ", 10, 60.0)
+        self.assertEqual(self.exchange.executions()[order].filled, 8)
+        self.clock.now = datetime(2024, 3, 11, 16, 0, tzinfo=ET)
+        self.assertEqual(self.exchange.executions()[order].filled, 10)
+
+        self.assertIsNone(self.exchange.submit("BUY", "TQQQ", 1, 48.0))  # 장 마감 후
+        self.clock.now = datetime(2024, 3, 11, 15, 50, tzinfo=ET)
+        self.assertIsNone(self.exchange.submit("SELL", "TQQQ", 11, 48.0))  # 보유 수량 부족
+        self.assertIsNone(self.exchange.submit("BUY", "TQQQ", 1000, 48.0))  # 예수금 부족
+        self.assertEqual(self.exchange.rejects, 3)
+
+    def test_synthetic_bars_deterministic(self):
+        """같은 seed면 같은 거래일 경로"""
+        first = synthetic_bars(date(2024, 1, 1), 30, seed=7)
+        self.assertTrue(first.equals(synthetic_bars(date(2024, 1, 1), 30, seed=7)))
+        self.assertEqual(first.index[0], date(2024, 1, 2))
+        self.assertTrue((first["high"] >= first[["open", "close"]].max(axis=1)).all())
+        self.assertTrue((first["low"] <= first[["open", "close"]].min(axis=1)).all())
+
+
+class TestPaperBroker(unittest.IsolatedAsyncioTestCase):
+    """모의 브로커 테스트"""
+
+    async def test_sim_clock_fast_forward(self):
+        """긴 sleep은 건너뛰고 짧은 sleep은 speed배속으로 흐른다"""
+        clock = SimClock(datetime(2024, 3, 8, 16, 0, tzinfo=ET), speed=1000)
+        started = time.monotonic()
+        await clock.sleep(3 * 86400)
+        await clock.sleep(60)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertGreaterEqual(clock(), datetime(2024, 3, 11, 16, 1, tzinfo=ET))
+
+    async def test_order_tracker_against_exchange(self):
+        """주문 추적기가 모의 브로커 체결을 그대로 반영하는지 테스트"""
+        clock = ManualClock(datetime(2024, 3, 11, 15, 45, tzinfo=ET))
+        exchange = SimulatedExchange({"TQQQ": bars((date(2024, 3, 11), 51, 53, 47, 48))}, clock)
+        broker = PaperBroker(BotConfig(api_rate_limit=1000, api_burst=1000), quote_window=0, market=exchange)
+        tracker = OrderTracker(broker)
+        events = []
+        await tracker.submit("BUY", "TQQQ", 5, 49.0, "LOC", deadline=datetime(2024, 3, 11, 16, 0, tzinfo=ET),
+                             on_fill=events.append)
+        self.assertEqual(await broker.get_current_price("TQQQ"), exchange.price("TQQQ"))
+
+        clock.now = datetime(2024, 3, 11, 16, 10, tzinfo=ET)
+        await tracker.reconcile(now=datetime(2024, 3, 11, 15, 59, tzinfo=ET))
+        self.assertEqual([(e.quantity, e.price) for e in events], [(5, 48.0)])
+        self.assertFalse(tracker.has_open())
+
+    async def test_mock_kis_matches_constructor(self):
+        """테스트용 API가 KisAPI 생성자와 같은 인자를 받는지 테스트"""
+        api = MockKisAPI(BotConfig(), 0)
+        self.assertEqual(await api.get_current_price("TQQQ"), 70000.0)
+        self.assertTrue(await api.buy_stock("TQQQ", 2, 70000.0))
+        self.assertEqual(api.positions, {"TQQQ": 2})
+
+
+class TestManagerSoak(unittest.IsolatedAsyncioTestCase):
+    """BotManager 전체를 가상 시간으로 여러 거래일 돌리는 테스트"""
+
+    async def asyncSetUp(self):
+        BotManager._instance = None
+        self.manager = BotManager()
+        start = datetime(2024, 3, 1, 12, 0, tzinfo=ET)
+        self.clock = SimClock(start, speed=20000)
+        self.exchange = SimulatedExchange(
+            {"TQQQ": synthetic_bars(start.date(), 40, seed=3), "SOXL": synthetic_bars(start.date(), 40, price=25, seed=4)},
+            self.clock, cash=1_000_000, liquidity=30,
+        )
+        config = BotConfig(log_dir=tempfile.mkdtemp(), data_dir=tempfile.mkdtemp(), track_orders=True,
+                           order_check_interval=0.002, quote_ttl=0, api_rate_limit=100000, api_burst=100000)
+        self.manager._api = PaperBroker(config, quote_window=0, market=self.exchange)
+        self.manager._scheduler = MarketScheduler(clock=self.clock, sleep=self.clock.sleep)
+        for symbol, amount in (("TQQQ", 500), ("SOXL", 300)):
+            await self.manager.initialize_bot(config, TradingConfig(
+                symbol=symbol, total_divisions=40, first_buy_amount=amount, pre_turn_threshold=20,
+                quarter_loss_start=39, trading_interval=0.002,
+            ))
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+        BotManager._instance = None
+
+    async def test_positions_match_exchange(self):
+        """여러 거래일 후 봇 보유 수량이 거래소 보유 수량과 같은지 테스트"""
+        reports = []
+        self.manager.on_daily_report = reports.append
+        await self.manager.start()
+        started = time.monotonic()
+        while len(reports) < 10:
+            self.assertLess(time.monotonic() - started, 30)
+            await asyncio.sleep(0.01)
+        await self.manager.stop()
+
+        self.assertGreater(len(self.exchange.fills), 0)
+        # 리포트 시점에는 장 마감 후 체결 확인이 끝나 있으므로 봇과 거래소 보유 수량이 같다
+        for symbol, bot in reports[-1]["bots"].items():
+            self.assertEqual(bot["position_count"], self.exchange.positions[symbol])
+
+
+if __name__ == '__main__':
+    unittest.main()
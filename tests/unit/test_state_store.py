@@ -0,0 +1,115 @@
+"""매매 상태 저장소 단위 테스트"""
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from backend.app.trading.state_store import LOG_FILE, StateStore
+
+
+class TestStateStore(unittest.TestCase):
+    """상태 저장소 테스트"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_replay_changes(self):
+        """변경 로그 재생으로 상태 복원 테스트"""
+        store = StateStore(self.directory)
+        store.update("TQQQ", {"current_division": 1, "position_count": 10, "average_price": 50.0})
+        store.update("TQQQ", {"current_division": 2, "position_count": 30, "average_price": 48.0})
+        store.update("SOXL", {"current_division": 1, "position_count": 4})
+        self.assertFalse(store.update("SOXL", {"current_division": 1}))
+        store.close()
+
+        reopened = StateStore(self.directory)
+        self.assertEqual(reopened.replayed, 3)
+        self.assertEqual(reopened.get("TQQQ"), {"current_division": 2, "position_count": 30, "average_price": 48.0})
+        self.assertEqual(reopened.get("SOXL")["position_count"], 4)
+        reopened.close()
+
+    def test_only_changed_fields_logged(self):
+        """바뀐 필드만 기록하는지 테스트"""
+        store = StateStore(self.directory)
+        store.update("TQQQ", {"current_division": 1, "position_count": 10})
+        store.update("TQQQ", {"current_division": 2, "position_count": 10})
+        store.close()
+        with open(os.path.join(self.directory, LOG_FILE)) as f:
+            last = f.read().splitlines()[-1]
+        self.assertIn('"changes": {"current_division": 2}', last)
+
+    def test_snapshot_compaction(self):
+        """스냅샷 저장 후 로그 비우기 테스트"""
+        store = StateStore(self.directory, compact_every=10)
+        for division in range(1, 26):
+            store.update("TQQQ", {"current_division": division})
+        store.remove("SOXL")
+        store.update("SOXL", {"current_division": 3})
+        store.remove("SOXL")
+        store.close()
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "snapshot.json.tmp")))
+
+        reopened = StateStore(self.directory)
+        self.assertLess(reopened.replayed, 10)
+        self.assertEqual(reopened.get("TQQQ"), {"current_division": 25})
+        self.assertIsNone(reopened.get("SOXL"))
+        reopened.close()
+
+    def test_recover_torn_and_stale_log(self):
+        """잘린 변경과 스냅샷에 이미 반영된 변경 처리 테스트"""
+        store = StateStore(self.directory)
+        store.update("TQQQ", {"current_division": 1})
+        store.update("TQQQ", {"current_division": 2})
+        log_path = os.path.join(self.directory, LOG_FILE)
+        with open(log_path, "rb") as f:
+            log = f.read()
+        store.snapshot()
+        store.close()
+        # 스냅샷 교체 직후, 로그를 비우기 전에 중단된 상황 + 기록 중 중단된 변경
+        with open(log_path, "wb") as f:
+            f.write(log + b'{"seq": 3, "key": "TQ')
+
+        reopened = StateStore(self.directory)
+        self.assertEqual(reopened.replayed, 0)
+        self.assertEqual(reopened.get("TQQQ"), {"current_division": 2})
+        self.assertEqual(os.path.getsize(log_path), len(log))
+        reopened.update("TQQQ", {"current_division": 3})
+        reopened.close()
+        final = StateStore(self.directory)
+        self.assertEqual(final.get("TQQQ"), {"current_division": 3})
+        final.close()
+
+
+class TestStateStoreAsync(unittest.IsolatedAsyncioTestCase):
+    """이벤트 루프 안에서의 상태 저장소 테스트"""
+
+    async def test_fsync_off_event_loop(self):
+        """이벤트 루프 스레드에서 fsync하지 않는지 테스트"""
+        directory = tempfile.mkdtemp()
+        store = StateStore(directory, compact_every=3)
+        fsync_threads = []
+        real_fsync = os.fsync
+
+        def fsync(fd):
+            fsync_threads.append(threading.current_thread().name)
+            real_fsync(fd)
+
+        with mock.patch("backend.app.trading.state_store.os.fsync", fsync):
+            for division in range(1, 5):
+                store.update("TQQQ", {"current_division": division})
+            store.remove("SOXL")
+            # 메모리 상태는 바로 반영
+            self.assertEqual(store.get("TQQQ"), {"current_division": 4})
+            await store.flush()
+        store.close()
+
+        self.assertTrue(fsync_threads)
+        self.assertTrue(all(name.startswith("state-store") for name in fsync_threads))
+        reopened = StateStore(directory)
+        self.assertEqual(reopened.get("TQQQ"), {"current_division": 4})
+        reopened.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""SQLite 거래 저장소 단위 테스트"""
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from backend.app.trading.trade_store import TradeStore
+
+
+def trade(i: int, symbol: str = "TQQQ", action: str = "BUY", cycle: int = 1):
+    return {
+        "timestamp": datetime(2024, 1, 1) + timedelta(days=i),
+        "symbol": symbol,
+        "action": action,
+        "price": 50.0,
+        "quantity": 2,
+        "division": i,
+        "total_amount": 100.0,
+        "cycle_number": cycle,
+    }
+
+
+class TestTradeStore(unittest.IsolatedAsyncioTestCase):
+    """SQLite 거래 저장소 테스트"""
+
+    async def asyncSetUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "trades.db")
+        self.store = TradeStore(self.path)
+
+    async def asyncTearDown(self):
+        await self.store.close()
+
+    async def test_single_writer_batches(self):
+        """쓰기 요청을 한 트랜잭션으로 묶는지 테스트"""
+        for i in range(100):
+            self.store.add_trade(trade(i), journal_seq=i)
+        await self.store.flush()
+        self.assertEqual(self.store.batches, 1)
+        self.assertEqual(self.store.last_journal_seq(), 99)
+        # 같은 저널 번호는 중복 저장하지 않는다
+        self.store.add_trade(trade(0), journal_seq=0)
+        self.assertEqual(len(await self.store.trades(limit=1000)), 100)
+
+    async def test_keyset_pagination(self):
+        """키셋 페이지네이션과 기간 필터 테스트"""
+        for i in range(30):
+            self.store.add_trade(trade(i, "SOXL" if i % 3 == 0 else "TQQQ"))
+
+        pages, after = [], None
+        while True:
+            page = await self.store.trades("TQQQ", after=after, limit=7)
+            if not page:
+                break
+            pages.append(page)
+            after = page[-1]["id"]
+        divisions = [row["division"] for page in pages for row in page]
+        self.assertEqual(divisions, [i for i in range(30) if i % 3])
+
+        rows = await self.store.trades(start=datetime(2024, 1, 11), end=datetime(2024, 1, 14))
+        self.assertEqual([row["division"] for row in rows], [10, 11, 12])
+        self.assertEqual(rows[0]["timestamp"], "2024-01-11T00:00:00")
+
+    async def test_cycle_pnl(self):
+        """사이클별 손익 집계 테스트"""
+        self.store.add_trade(trade(0, cycle=1))
+        self.store.add_trade(trade(1, cycle=1))
+        self.store.add_trade({**trade(2, action="SELL", cycle=1), "total_amount": 230.0})
+        self.store.add_trade(trade(3, cycle=2))
+        self.store.save_cycle({"symbol": "TQQQ", "cycle_number": 1, "started_at": datetime(2024, 1, 1),
+                               "ended_at": datetime(2024, 1, 3), "total_investment": 200.0, "realized_pnl": 30.0})
+        self.store.save_cycle({"symbol": "TQQQ", "cycle_number": 2, "started_at": datetime(2024, 1, 4),
+                               "total_investment": 100.0, "realized_pnl": 0.0})
+        rows = await self.store.cycle_pnl("TQQQ")
+        # 진행 중인 사이클의 보유분 매수 금액은 손실로 보지 않는다
+        self.assertEqual([(row["cycle_number"], row["pnl"], row["status"]) for row in rows],
+                         [(1, 30.0, "closed"), (2, 0.0, "open")])
+        self.assertEqual(len(await self.store.trades(cycle_number=2)), 1)
+
+    async def test_orders_and_cycles(self):
+        """주문 갱신과 사이클 요약 저장 테스트"""
+        order = {"order_number": "0001", "symbol": "TQQQ", "type": "BUY", "price": 50.0, "qty": 10,
+                 "executed_qty": 0, "condition": "LOC", "time": datetime(2024, 1, 1, 15, 59)}
+        self.store.save_order(order)
+        self.store.save_order({**order, "executed_qty": 10, "status": "FILLED"})
+        self.store.save_cycle({"symbol": "TQQQ", "cycle_number": 1, "started_at": datetime(2024, 1, 1),
+                               "total_investment": 200.0, "realized_pnl": 30.0})
+
+        orders = await self.store.orders("TQQQ")
+        self.assertEqual(len(orders), 1)
+        self.assertEqual((orders[0]["executed_qty"], orders[0]["status"]), (10, "FILLED"))
+        self.assertEqual(await self.store.orders(status="PENDING"), [])
+        cycles = await self.store.cycles("TQQQ")
+        self.assertEqual(cycles[0]["realized_pnl"], 30.0)
+
+    async def test_history_index_used(self):
+        """종목별 조회가 인덱스를 사용하는지 테스트"""
+        plan = self.store._query(
+            "EXPLAIN QUERY PLAN SELECT id FROM trades WHERE symbol = ? ORDER BY timestamp, id LIMIT 10",
+            ("TQQQ",),
+        )
+        self.assertIn("idx_trades_symbol_timestamp", " ".join(row["detail"] for row in plan))
+
+    async def test_unfiltered_history_avoids_sort(self):
+        """종목 필터 없는 페이지 조회도 전체 스캔/정렬 없이 인덱스를 타는지 테스트"""
+        plan = " ".join(row["detail"] for row in self.store._query(
+            "EXPLAIN QUERY PLAN SELECT id FROM trades"
+            " WHERE (timestamp, id) > (SELECT timestamp, id FROM trades WHERE id = ?)"
+            " ORDER BY timestamp, id LIMIT 10",
+            (1,),
+        ))
+        self.assertIn("idx_trades_timestamp", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,31 +4,11 @@ from datetime import datetime, time
 import pytz
 from pathlib import Path
 
+from backend.app.trading.log_pipeline import get_logger
+
 def setup_logging(log_dir: Path, name: str) -> logging.Logger:
-    """로깅 설정"""
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
-    # 로그 파일명에 날짜 추가
-    log_file = log_dir / f"{name}_{datetime.now().strftime('%Y%m%d')}.log"
-    
-    # 파일 핸들러
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
-    
-    # 콘솔 핸들러
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    
-    # 포맷터
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-    
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
+    """로깅 설정 (파일/콘솔 쓰기는 로그 파이프라인 리스너 스레드에서, 파일은 자정마다 교체)"""
+    return get_logger(name, str(log_dir), f"{name}.log", console=True, when="midnight")
 
 def get_current_time_kst() -> datetime:
     """현재 KST 시간 반환"""